@@ -3,19 +3,31 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import uvicorn
 
-from database import engine, Base
+from database import engine, Base, SessionLocal
 from models.database import *  # Import all models to register them
-from routers import users, exercises, workouts, analytics, body_metrics, templates
+from routers import (
+    users, exercises, workouts, analytics, body_metrics, templates, live_sessions, dashboard, leaderboards,
+    export
+)
 from utils.seed_exercises import seed_exercises
+from utils.migrations import run_migrations
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: Create tables and seed data
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
     seed_exercises()
+    db = SessionLocal()
+    try:
+        live_sessions.live_store.recover(db)
+    finally:
+        db.close()
+    live_sessions.live_store.start_checkpointer()
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: persist live workouts
+    live_sessions.live_store.stop_checkpointer()
 
 
 app = FastAPI(
@@ -38,9 +50,13 @@ app.add_middleware(
 app.include_router(users.router, prefix="/api/users", tags=["Users"])
 app.include_router(exercises.router, prefix="/api/exercises", tags=["Exercises"])
 app.include_router(workouts.router, prefix="/api/workouts", tags=["Workouts"])
+app.include_router(live_sessions.router, prefix="/api/workouts", tags=["Live Sessions"])
 app.include_router(body_metrics.router, prefix="/api/body-metrics", tags=["Body Metrics"])
 app.include_router(templates.router, prefix="/api/templates", tags=["Templates"])
 app.include_router(analytics.router, prefix="/api/analytics", tags=["Analytics"])
+app.include_router(dashboard.router, prefix="/api/dashboard", tags=["Dashboard"])
+app.include_router(leaderboards.router, prefix="/api/leaderboards", tags=["Leaderboards"])
+app.include_router(export.router, prefix="/api/export", tags=["Export"])
 
 
 @app.get("/api/health")
@@ -1,8 +1,8 @@
 from sqlalchemy import (
     Column, Integer, String, Float, Boolean, DateTime,
-    ForeignKey, Text, LargeBinary, JSON, Date
+    ForeignKey, Text, LargeBinary, JSON, Date, Index
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime, timezone
 import sys
 import os
@@ -18,6 +18,7 @@ class User(Base):
     profile_picture = Column(LargeBinary, nullable=True)  # Stored as BLOB
     profile_picture_mime = Column(String(50), nullable=True)
     weight_unit = Column(String(10), default="kg")  # kg or lb
+    timezone = Column(String(64), default="UTC")  # IANA name, used for calendar-day analytics
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     last_active = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
@@ -28,6 +29,12 @@ class User(Base):
     templates = relationship("WorkoutTemplate", back_populates="user", cascade="all, delete-orphan")
     personal_records = relationship("PersonalRecord", back_populates="user", cascade="all, delete-orphan")
     custom_exercises = relationship("Exercise", back_populates="created_by_user", cascade="all, delete-orphan")
+    daily_exercise_stats = relationship("DailyExerciseStat", cascade="all, delete-orphan")
+    daily_muscle_loads = relationship("DailyMuscleLoad", cascade="all, delete-orphan")
+    leaderboard_entries = relationship("LeaderboardEntry", cascade="all, delete-orphan")
+    streak = relationship("UserStreak", uselist=False, cascade="all, delete-orphan")
+    data_version = relationship("UserDataVersion", uselist=False, cascade="all, delete-orphan")
+    analytics_cache_entries = relationship("AnalyticsCacheEntry", cascade="all, delete-orphan")
 
 
 class Exercise(Base):
@@ -48,16 +55,44 @@ class Exercise(Base):
     workout_exercises = relationship("WorkoutExercise", back_populates="exercise")
     personal_records = relationship("PersonalRecord", back_populates="exercise", cascade="all, delete-orphan")
     template_exercises = relationship("TemplateExercise", back_populates="exercise")
+    muscle_group_links = relationship("ExerciseMuscleGroup", back_populates="exercise", cascade="all, delete-orphan")
+
+    @validates("muscle_groups")
+    def _sync_muscle_group_links(self, key, value):
+        """Keep the exercise_muscle_groups rows in step with the JSON list"""
+        existing = {link.muscle_group: link for link in self.muscle_group_links}
+        self.muscle_group_links = [
+            existing.get(mg) or ExerciseMuscleGroup(muscle_group=mg)
+            for mg in dict.fromkeys(value or [])
+        ]
+        return value
+
+
+class ExerciseMuscleGroup(Base):
+    __tablename__ = "exercise_muscle_groups"
+    __table_args__ = (
+        Index("ix_exercise_muscle_groups_muscle_group", "muscle_group", "exercise_id"),
+    )
+
+    exercise_id = Column(Integer, ForeignKey("exercises.id"), primary_key=True)
+    muscle_group = Column(String(50), primary_key=True)
+
+    # Relationships
+    exercise = relationship("Exercise", back_populates="muscle_group_links")
 
 
 class Workout(Base):
     __tablename__ = "workouts"
+    __table_args__ = (
+        Index("ix_workouts_user_local_date", "user_id", "local_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     name = Column(String(200), nullable=True)
     notes = Column(Text, nullable=True)
     started_at = Column(DateTime, nullable=False)
+    local_date = Column(Date, nullable=True)  # started_at as a day in the user's timezone
     completed_at = Column(DateTime, nullable=True)
     duration_seconds = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -69,10 +104,16 @@ class Workout(Base):
 
 class WorkoutExercise(Base):
     __tablename__ = "workout_exercises"
+    __table_args__ = (
+        # Per-exercise history lookups: latest session, keyset pagination
+        Index("ix_workout_exercises_exercise_user_started", "exercise_id", "user_id", "started_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    workout_id = Column(Integer, ForeignKey("workouts.id"), nullable=False)
+    workout_id = Column(Integer, ForeignKey("workouts.id"), nullable=False, index=True)
     exercise_id = Column(Integer, ForeignKey("exercises.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Copied from workout
+    started_at = Column(DateTime, nullable=True)  # Copied from workout
     order = Column(Integer, nullable=False)
     phase = Column(String(20), default="main")  # warmup, main, cooldown
     notes = Column(Text, nullable=True)
@@ -88,7 +129,7 @@ class WorkoutSet(Base):
     __tablename__ = "workout_sets"
 
     id = Column(Integer, primary_key=True, index=True)
-    workout_exercise_id = Column(Integer, ForeignKey("workout_exercises.id"), nullable=False)
+    workout_exercise_id = Column(Integer, ForeignKey("workout_exercises.id"), nullable=False, index=True)
     set_number = Column(Integer, nullable=False)
     reps = Column(Integer, nullable=True)
     weight = Column(Float, nullable=True)  # in kg or lbs based on user preference
@@ -126,6 +167,10 @@ class PersonalRecord(Base):
 
 class BodyMetric(Base):
     __tablename__ = "body_metrics"
+    __table_args__ = (
+        # As-of lookups: latest weigh-in on or before a day
+        Index("ix_body_metrics_user_date", "user_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -188,3 +233,95 @@ class TemplateExercise(Base):
     # Relationships
     template = relationship("WorkoutTemplate", back_populates="exercises")
     exercise = relationship("Exercise", back_populates="template_exercises")
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    method = Column(String(10), primary_key=True)
+    path = Column(String(500), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)  # NULL while the first request is running
+    response_body = Column(LargeBinary, nullable=True)  # zlib-compressed
+    media_type = Column(String(100), nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+
+
+class DailyExerciseStat(Base):
+    """Per-day rollup of a user's working sets for one exercise"""
+    __tablename__ = "daily_exercise_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    exercise_id = Column(Integer, ForeignKey("exercises.id"), primary_key=True)
+    local_date = Column(Date, primary_key=True)
+    max_weight = Column(Float, nullable=False)
+    total_volume = Column(Float, nullable=False)  # sum of weight * reps
+    max_reps = Column(Integer, nullable=False)
+    set_count = Column(Integer, nullable=False)
+    best_e1rm = Column(Float, nullable=False)  # Epley estimated one-rep max
+
+
+class DailyMuscleLoad(Base):
+    """Per-day training load on one muscle group, derived from daily_exercise_stats"""
+    __tablename__ = "daily_muscle_loads"
+    __table_args__ = (
+        Index("ix_daily_muscle_loads_user_date", "user_id", "local_date"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    muscle_group = Column(String(50), primary_key=True)
+    local_date = Column(Date, primary_key=True)
+    volume = Column(Float, nullable=False)  # sum of weight * reps over working sets
+    hard_sets = Column(Integer, nullable=False)  # working (non-warmup) sets
+
+
+class LeaderboardEntry(Base):
+    """A user's value on one exercise leaderboard, derived from daily_exercise_stats"""
+    __tablename__ = "leaderboard_entries"
+    __table_args__ = (
+        Index("ix_leaderboard_entries_ranking", "exercise_id", "board", "period", "value"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    exercise_id = Column(Integer, ForeignKey("exercises.id"), primary_key=True)
+    board = Column(String(20), primary_key=True)  # e1rm, weekly_volume
+    period = Column(String(10), primary_key=True)  # ISO week start for weekly boards, "all" otherwise
+    value = Column(Float, nullable=False)
+
+
+class UserStreak(Base):
+    """Workout streak state, kept up to date as workouts are added and removed"""
+    __tablename__ = "user_streaks"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_workouts = Column(Integer, nullable=False, default=0)
+    last_workout_date = Column(Date, nullable=True)
+    current_run = Column(Integer, nullable=False, default=0)  # consecutive days ending at last_workout_date
+    longest_run = Column(Integer, nullable=False, default=0)
+
+
+class UserDataVersion(Base):
+    """Counter bumped by every write that can change a user's analytics"""
+    __tablename__ = "user_data_versions"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class AnalyticsCacheEntry(Base):
+    """Shared analytics result, valid for the data version baked into its key"""
+    __tablename__ = "analytics_cache"
+
+    key = Column(String(64), primary_key=True)  # sha256 of endpoint, params and data version
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    value = Column(LargeBinary, nullable=False)  # zlib-compressed JSON
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class AppliedMigration(Base):
+    """One-off data migrations that have already run against this database"""
+    __tablename__ = "applied_migrations"
+
+    name = Column(String(100), primary_key=True)
+    applied_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
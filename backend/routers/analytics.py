@@ -1,80 +1,223 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, case, literal, null, true, union_all
 from typing import List, Optional
-from datetime import datetime, date, timedelta, timezone
+from datetime import date, timedelta
+import os
+import re
+
+import numpy as np
 
 from database import get_db
-from models.database import Workout, WorkoutExercise, WorkoutSet, Exercise, BodyMetric
-from schemas import WeeklySummary, ProgressData, StreakInfo
+from models.database import (
+    Workout, WorkoutExercise, WorkoutSet, Exercise, ExerciseMuscleGroup, BodyMetric,
+    DailyExerciseStat, DailyMuscleLoad, UserStreak, User
+)
+from schemas import (
+    WeeklySummary, ProgressData, ProgressBatchRequest, ProgressSeries, RelativeStrength, StreakInfo,
+    ActivityHeatmap, MuscleGroupLoad, TrainingLoadSeries, StrengthTrend, MeasurementSeries
+)
+from utils.admission import AdmissionGate, admission_stats
+from utils.analytics_cache import analytics_cache
+from utils import columnar
+from utils.columnar import columnar_store
+from utils import duckdb_mirror
+from utils.duckdb_mirror import analytics_mirror
+from utils.downsample import downsample_series
+from utils import strength, training_load
+from utils.forecast import fit_trends
+from utils.streaks import compute_streak
+from utils.timezones import local_today, user_timezone
 
 router = APIRouter()
 
+MAX_HEATMAP_DAYS = 366 * 10
+# Series ranges are effectively unbounded; use max_points to keep payloads small
+MAX_RANGE_DAYS = 366 * 100
+
+# "columnar" serves the heavier endpoints from per-user NumPy arrays instead of SQL,
+# "duckdb" serves the weekly series and muscle balance from an embedded DuckDB mirror
+COLUMNAR_BACKEND = os.environ.get("ANALYTICS_BACKEND", "sql") == "columnar"
+DUCKDB_BACKEND = os.environ.get("ANALYTICS_BACKEND", "sql") == "duckdb"
+
+# Long-range queries are admitted a few at a time so they cannot starve logging
+progress_gate = AdmissionGate("exercise-progress")
+balance_gate = AdmissionGate("muscle-group-balance")
+series_gate = AdmissionGate("weekly-summary-series")
+heatmap_gate = AdmissionGate("heatmap")
+forecast_gate = AdmissionGate("strength-forecast")
+
+
+def _weekly_totals(db: Session, user_id: int, first_week: date, weeks: int) -> dict:
+    """Per-week totals keyed by week start, from one grouped query"""
+    end = first_week + timedelta(days=7 * weeks)
+    week = func.date(Workout.local_date, "weekday 0", "-6 days")
+    in_range = (
+        (Workout.user_id == user_id)
+        & (Workout.local_date >= first_week)
+        & (Workout.local_date < end)
+    )
+    volume = case(
+        (WorkoutSet.weight.isnot(None) & WorkoutSet.reps.isnot(None), WorkoutSet.weight * WorkoutSet.reps),
+        else_=0
+    )
+
+    workout_totals = select(
+        week.label("week"), literal("workouts").label("kind"), null().label("key"),
+        func.count(Workout.id).label("count"),
+        func.coalesce(func.sum(Workout.duration_seconds), 0).label("amount")
+    ).where(in_range).group_by(week)
+
+    set_totals = select(
+        week, literal("sets"), null(), func.count(WorkoutSet.id), func.coalesce(func.sum(volume), 0)
+    ).select_from(Workout).join(
+        WorkoutExercise, WorkoutExercise.workout_id == Workout.id
+    ).join(
+        WorkoutSet, WorkoutSet.workout_exercise_id == WorkoutExercise.id
+    ).where(in_range).group_by(week)
+
+    muscle_totals = select(
+        week, literal("muscle_group"), ExerciseMuscleGroup.muscle_group,
+        func.count(WorkoutSet.id), literal(0)
+    ).select_from(Workout).join(
+        WorkoutExercise, WorkoutExercise.workout_id == Workout.id
+    ).join(
+        ExerciseMuscleGroup, ExerciseMuscleGroup.exercise_id == WorkoutExercise.exercise_id
+    ).outerjoin(
+        WorkoutSet, WorkoutSet.workout_exercise_id == WorkoutExercise.id
+    ).where(in_range).group_by(week, ExerciseMuscleGroup.muscle_group)
+
+    summaries = {
+        first_week + timedelta(days=7 * i): {
+            "total_workouts": 0,
+            "total_duration_seconds": 0,
+            "total_volume": 0.0,
+            "total_sets": 0,
+            "muscle_groups_worked": {}
+        }
+        for i in range(weeks)
+    }
+    for row in db.execute(union_all(workout_totals, set_totals, muscle_totals)):
+        summary = summaries.get(date.fromisoformat(row.week))
+        if summary is None:
+            continue
+        if row.kind == "workouts":
+            summary["total_workouts"] = row.count
+            summary["total_duration_seconds"] = row.amount
+        elif row.kind == "sets":
+            summary["total_sets"] = row.count
+            summary["total_volume"] = float(row.amount)
+        else:
+            summary["muscle_groups_worked"][row.key] = row.count
+    return summaries
+
+
+def weekly_summaries(db: Session, user_id: int, first_week: date, weeks: int) -> List[WeeklySummary]:
+    """Summaries for consecutive weeks starting at first_week (a Monday)"""
+    if COLUMNAR_BACKEND:
+        summaries = {
+            totals["week_start"]: totals
+            for totals in columnar.weekly_totals(db, columnar_store.columns(db, user_id), first_week, weeks)
+        }
+    elif DUCKDB_BACKEND:
+        summaries = duckdb_mirror.weekly_totals(db, user_id, first_week, weeks)
+    else:
+        summaries = _weekly_totals(db, user_id, first_week, weeks)
+
+    # Count new PRs this week (simplified - would need PR history for accurate count)
+    new_prs = 0  # TODO: Implement PR history tracking
+
+    return [
+        WeeklySummary(
+            week_start=week_start,
+            total_workouts=summary["total_workouts"],
+            total_duration_minutes=summary["total_duration_seconds"] // 60,
+            total_volume=summary["total_volume"],
+            total_sets=summary["total_sets"],
+            muscle_groups_worked=summary["muscle_groups_worked"],
+            new_prs=new_prs
+        )
+        for week_start, summary in sorted(summaries.items())
+    ]
+
 
 @router.get("/weekly-summary", response_model=WeeklySummary)
+@analytics_cache.cached("weekly-summary")
 def get_weekly_summary(
     user_id: int = Query(...),
     week_offset: int = Query(0, ge=0),
     db: Session = Depends(get_db)
 ):
     """Get summary for a specific week (0 = current week, 1 = last week, etc.)"""
-    today = date.today()
+    today = local_today(user_timezone(db, user_id))
     week_start = today - timedelta(days=today.weekday() + (week_offset * 7))
-    week_end = week_start + timedelta(days=7)
+    return weekly_summaries(db, user_id, week_start, 1)[0]
 
-    workouts = db.query(Workout).filter(
-        Workout.user_id == user_id,
-        func.date(Workout.started_at) >= week_start,
-        func.date(Workout.started_at) < week_end
-    ).all()
 
-    total_duration = 0
-    total_volume = 0.0
-    total_sets = 0
-    muscle_groups = {}
-
-    for workout in workouts:
-        if workout.duration_seconds:
-            total_duration += workout.duration_seconds
-
-        for we in workout.exercises:
-            # Get muscle groups for this exercise
-            exercise = db.query(Exercise).filter(
-                Exercise.id == we.exercise_id
-            ).first()
-            if exercise:
-                for mg in exercise.muscle_groups:
-                    muscle_groups[mg] = muscle_groups.get(mg, 0) + len(we.sets)
-
-            for s in we.sets:
-                total_sets += 1
-                if s.weight and s.reps:
-                    total_volume += s.weight * s.reps
-
-    # Count new PRs this week (simplified - would need PR history for accurate count)
-    new_prs = 0  # TODO: Implement PR history tracking
+@router.get("/weekly-summary/series", response_model=List[WeeklySummary], dependencies=[Depends(series_gate)])
+@analytics_cache.cached("weekly-summary/series")
+def get_weekly_summary_series(
+    user_id: int = Query(...),
+    weeks: int = Query(12, ge=1, le=260),
+    week_offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """Get `weeks` consecutive summaries, oldest first, ending at week_offset"""
+    today = local_today(user_timezone(db, user_id))
+    last_week = today - timedelta(days=today.weekday() + (week_offset * 7))
+    first_week = last_week - timedelta(days=7 * (weeks - 1))
+    return weekly_summaries(db, user_id, first_week, weeks)
+
+
+PROGRESS_COLUMNS = {
+    "weight": DailyExerciseStat.max_weight,  # max weight per day
+    "volume": DailyExerciseStat.total_volume,  # total volume per day
+    "reps": DailyExerciseStat.max_reps,  # max reps per day
+}
+
+
+def _progress_series(db: Session, user_id: int, exercise_ids: List[int], metric_types: List[str], cutoff_date: date) -> dict:
+    """(exercise_id, metric_type) -> (dates, values) for every pair, from one scan"""
+    series = {(e, m): ([], []) for e in exercise_ids for m in metric_types}
+
+    if COLUMNAR_BACKEND:
+        columns = columnar_store.columns(db, user_id)
+        for exercise_id, metric_type in series:
+            series[exercise_id, metric_type] = columnar.exercise_progress(
+                columns, exercise_id, metric_type, cutoff_date
+            )
+        return series
+
+    # One pre-aggregated row per exercise and training day
+    rows = db.query(
+        DailyExerciseStat.exercise_id, DailyExerciseStat.local_date,
+        *(PROGRESS_COLUMNS[m] for m in metric_types)
+    ).filter(
+        DailyExerciseStat.user_id == user_id,
+        DailyExerciseStat.exercise_id.in_(exercise_ids),
+        DailyExerciseStat.local_date >= cutoff_date
+    ).order_by(DailyExerciseStat.exercise_id, DailyExerciseStat.local_date)
 
-    return WeeklySummary(
-        week_start=week_start,
-        total_workouts=len(workouts),
-        total_duration_minutes=total_duration // 60,
-        total_volume=total_volume,
-        total_sets=total_sets,
-        muscle_groups_worked=muscle_groups,
-        new_prs=new_prs
-    )
+    for exercise_id, day, *values in rows:
+        for metric_type, value in zip(metric_types, values):
+            dates, metric_values = series[exercise_id, metric_type]
+            dates.append(day.isoformat())
+            metric_values.append(value)
+    return series
 
 
-@router.get("/exercise-progress", response_model=ProgressData)
+@router.get("/exercise-progress", response_model=ProgressData, dependencies=[Depends(progress_gate)])
+@analytics_cache.cached("exercise-progress")
 def get_exercise_progress(
     user_id: int = Query(...),
     exercise_id: int = Query(...),
     metric_type: str = Query("weight", pattern="^(weight|volume|reps)$"),
-    days: int = Query(90, ge=7, le=365),
+    days: int = Query(90, ge=7, le=MAX_RANGE_DAYS),
+    max_points: Optional[int] = Query(None, ge=3, le=5000),
     db: Session = Depends(get_db)
 ):
-    """Get progress data for a specific exercise"""
-    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+    """Get progress data for a specific exercise, optionally downsampled to max_points"""
+    cutoff_date = local_today(user_timezone(db, user_id)) - timedelta(days=days)
 
     exercise = db.query(Exercise).filter(Exercise.id == exercise_id).first()
     if not exercise:
@@ -85,42 +228,8 @@ def get_exercise_progress(
             metric_type=metric_type
         )
 
-    # Get all sets for this exercise
-    sets = db.query(WorkoutSet).join(
-        WorkoutExercise
-    ).join(
-        Workout
-    ).filter(
-        Workout.user_id == user_id,
-        WorkoutExercise.exercise_id == exercise_id,
-        WorkoutSet.completed_at >= cutoff_date,
-        WorkoutSet.is_warmup == False
-    ).order_by(WorkoutSet.completed_at).all()
-
-    # Group by date and calculate metric
-    date_values = {}
-    for s in sets:
-        if s.weight is None or s.reps is None:
-            continue
-
-        set_date = s.completed_at.date().isoformat()
-
-        if metric_type == "weight":
-            # Track max weight per day
-            if set_date not in date_values or s.weight > date_values[set_date]:
-                date_values[set_date] = s.weight
-        elif metric_type == "volume":
-            # Track total volume per day
-            volume = s.weight * s.reps
-            date_values[set_date] = date_values.get(set_date, 0) + volume
-        elif metric_type == "reps":
-            # Track max reps at max weight per day
-            if set_date not in date_values or s.reps > date_values[set_date]:
-                date_values[set_date] = s.reps
-
-    dates = sorted(date_values.keys())
-    values = [date_values[d] for d in dates]
-
+    dates, values = _progress_series(db, user_id, [exercise_id], [metric_type], cutoff_date)[exercise_id, metric_type]
+    dates, values = downsample_series(dates, values, max_points)
     return ProgressData(
         dates=dates,
         values=values,
@@ -129,14 +238,49 @@ def get_exercise_progress(
     )
 
 
+@router.post("/exercise-progress/batch", response_model=List[ProgressSeries], dependencies=[Depends(progress_gate)])
+@analytics_cache.cached("exercise-progress/batch")
+def get_exercise_progress_batch(
+    request: ProgressBatchRequest,
+    user_id: int = Query(...),
+    db: Session = Depends(get_db)
+):
+    """Get progress series for several exercises and metrics, in request order"""
+    cutoff_date = local_today(user_timezone(db, user_id)) - timedelta(days=request.days)
+    exercise_ids = list(dict.fromkeys(request.exercise_ids))
+    metric_types = list(dict.fromkeys(request.metric_types))
+
+    names = dict(db.query(Exercise.id, Exercise.name).filter(Exercise.id.in_(exercise_ids)))
+    series = _progress_series(
+        db, user_id, [e for e in exercise_ids if e in names], metric_types, cutoff_date
+    )
+
+    results = []
+    for exercise_id in exercise_ids:
+        for metric_type in metric_types:
+            dates, values = downsample_series(
+                *series.get((exercise_id, metric_type), ([], [])), request.max_points
+            )
+            results.append(ProgressSeries(
+                exercise_id=exercise_id,
+                dates=dates,
+                values=values,
+                exercise_name=names.get(exercise_id, "Unknown"),
+                metric_type=metric_type
+            ))
+    return results
+
+
 @router.get("/body-weight-progress")
+@analytics_cache.cached("body-weight-progress")
 def get_body_weight_progress(
     user_id: int = Query(...),
-    days: int = Query(90, ge=7, le=365),
+    days: int = Query(90, ge=7, le=MAX_RANGE_DAYS),
+    max_points: Optional[int] = Query(None, ge=3, le=5000),
     db: Session = Depends(get_db)
 ):
-    """Get body weight progress over time"""
-    cutoff_date = date.today() - timedelta(days=days)
+    """Get body weight progress over time, optionally downsampled to max_points"""
+    cutoff_date = local_today(user_timezone(db, user_id)) - timedelta(days=days)
 
     metrics = db.query(BodyMetric).filter(
         BodyMetric.user_id == user_id,
@@ -144,126 +288,424 @@ def get_body_weight_progress(
         BodyMetric.weight.isnot(None)
     ).order_by(BodyMetric.date).all()
 
+    dates, weights = downsample_series(
+        [m.date.isoformat() for m in metrics], [m.weight for m in metrics], max_points
+    )
     return {
-        "dates": [m.date.isoformat() for m in metrics],
-        "weights": [m.weight for m in metrics]
+        "dates": dates,
+        "weights": weights
     }
 
 
-@router.get("/streak", response_model=StreakInfo)
-def get_streak_info(
+@router.get("/relative-strength", response_model=RelativeStrength, dependencies=[Depends(progress_gate)])
+@analytics_cache.cached("relative-strength")
+def get_relative_strength(
     user_id: int = Query(...),
+    exercise_id: int = Query(...),
+    basis: str = Query("weight", pattern="^(weight|e1rm)$"),
+    sex: str = Query("male", pattern="^(male|female)$"),
+    days: int = Query(365, ge=7, le=MAX_RANGE_DAYS),
     db: Session = Depends(get_db)
 ):
-    """Get workout streak information"""
-    workouts = db.query(Workout).filter(
-        Workout.user_id == user_id
-    ).order_by(Workout.started_at.desc()).all()
-
-    if not workouts:
-        return StreakInfo(
-            current_streak=0,
-            longest_streak=0,
-            total_workouts=0,
-            last_workout_date=None
-        )
+    """Daily lift maxima joined as-of to the latest body weight, with ratio, DOTS and Wilks"""
+    exercise = db.query(Exercise).filter(Exercise.id == exercise_id).first()
+    if not exercise:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+    weight_unit = db.query(User.weight_unit).filter(User.id == user_id).scalar() or "kg"
+    cutoff_date = local_today(user_timezone(db, user_id)) - timedelta(days=days)
+
+    lift_column = DailyExerciseStat.best_e1rm if basis == "e1rm" else DailyExerciseStat.max_weight
+    lift_rows = db.query(DailyExerciseStat.local_date, lift_column).filter(
+        DailyExerciseStat.user_id == user_id,
+        DailyExerciseStat.exercise_id == exercise_id,
+        DailyExerciseStat.local_date >= cutoff_date
+    ).order_by(DailyExerciseStat.local_date).all()
+
+    # Weigh-ins from the last one before the range onwards, so the first lifts have a weight
+    has_weight = (BodyMetric.user_id == user_id) & BodyMetric.weight.isnot(None)
+    anchor = db.query(func.max(BodyMetric.date)).filter(has_weight, BodyMetric.date <= cutoff_date).scalar()
+    weigh_ins = db.query(BodyMetric.date, BodyMetric.weight).filter(
+        has_weight, BodyMetric.date >= (anchor or cutoff_date)
+    ).order_by(BodyMetric.date, BodyMetric.id).all()
+
+    lift_days = np.array([d.toordinal() for d, _ in lift_rows], dtype=np.int64)
+    lifts = np.array([v for _, v in lift_rows], dtype=np.float64)
+    weigh_days = np.array([d.toordinal() for d, _ in weigh_ins], dtype=np.int64)
+    weights = np.array([w for _, w in weigh_ins], dtype=np.float64)
+
+    idx = strength.asof_indices(weigh_days, lift_days)
+    known = idx >= 0
+    body_weights = np.where(known, weights[idx] if len(weights) else np.nan, np.nan)
+    to_kg = 1 / strength.LB_PER_KG if weight_unit == "lb" else 1.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = lifts / body_weights
+        dots = strength.dots(lifts * to_kg, body_weights * to_kg, sex)
+        wilks = strength.wilks(lifts * to_kg, body_weights * to_kg, sex)
+
+    def optional(values: np.ndarray) -> List[Optional[float]]:
+        return [round(float(v), 2) if ok else None for v, ok in zip(values, known)]
+
+    return RelativeStrength(
+        exercise_name=exercise.name,
+        basis=basis,
+        dates=[d.isoformat() for d, _ in lift_rows],
+        lifts=lifts.tolist(),
+        body_weights=[float(w) if ok else None for w, ok in zip(body_weights, known)],
+        ratios=optional(ratios),
+        dots=optional(dots),
+        wilks=optional(wilks)
+    )
 
-    # Get unique workout dates
-    workout_dates = set()
-    for w in workouts:
-        workout_dates.add(w.started_at.date())
 
-    sorted_dates = sorted(workout_dates, reverse=True)
+@router.get("/strength-forecast", response_model=List[StrengthTrend], dependencies=[Depends(forecast_gate)])
+@analytics_cache.cached("strength-forecast")
+def get_strength_forecast(
+    user_id: int = Query(...),
+    days: int = Query(180, ge=14, le=MAX_HEATMAP_DAYS),
+    horizon_weeks: int = Query(12, ge=1, le=104),
+    milestone_step: float = Query(10, gt=0),
+    db: Session = Depends(get_db)
+):
+    """Robust e1RM trend and projection for every exercise trained in the window"""
+    today = local_today(user_timezone(db, user_id))
+    rows = db.query(
+        DailyExerciseStat.exercise_id, DailyExerciseStat.local_date, DailyExerciseStat.best_e1rm
+    ).filter(
+        DailyExerciseStat.user_id == user_id,
+        DailyExerciseStat.local_date >= today - timedelta(days=days)
+    ).all()
+
+    # x in weeks relative to today, so the intercept is today's trend value
+    exercise_ids, intercepts, slopes, counts = fit_trends(
+        [exercise_id for exercise_id, _, _ in rows],
+        [(day - today).days / 7 for _, day, _ in rows],
+        [e1rm for _, _, e1rm in rows]
+    )
+    names = dict(db.query(Exercise.id, Exercise.name).filter(Exercise.id.in_(exercise_ids.tolist())))
+
+    trends = []
+    for exercise_id, current, slope, points in zip(exercise_ids.tolist(), intercepts, slopes, counts):
+        current, slope = round(float(current), 1), round(float(slope), 2)
+        milestone = (np.floor(current / milestone_step) + 1) * milestone_step
+        trends.append(StrengthTrend(
+            exercise_id=exercise_id,
+            exercise_name=names.get(exercise_id, "Unknown"),
+            points=int(points),
+            current_e1rm=current,
+            weekly_change=slope,
+            projected_e1rm=round(current + slope * horizon_weeks, 1),
+            next_milestone=float(milestone),
+            weeks_to_milestone=round(float((milestone - current) / slope), 1) if slope > 0 else None
+        ))
+    return sorted(trends, key=lambda t: -t.weekly_change)
+
+
+LOAD_COLUMNS = {
+    "volume": DailyMuscleLoad.volume,
+    "sets": DailyMuscleLoad.hard_sets,
+}
+
+
+@router.get("/training-load", response_model=List[MuscleGroupLoad])
+@analytics_cache.cached("training-load")
+def get_training_load(
+    user_id: int = Query(...),
+    metric: str = Query("volume", pattern="^(volume|sets)$"),
+    db: Session = Depends(get_db)
+):
+    """Acute:chronic load ratio per muscle group as of today, highest ratio first"""
+    today = local_today(user_timezone(db, user_id))
+    load = LOAD_COLUMNS[metric]
+    acute_start = today - timedelta(days=training_load.ACUTE_DAYS - 1)
+
+    rows = db.query(
+        DailyMuscleLoad.muscle_group,
+        func.sum(case((DailyMuscleLoad.local_date >= acute_start, load), else_=0)),
+        func.sum(load)
+    ).filter(
+        DailyMuscleLoad.user_id == user_id,
+        DailyMuscleLoad.local_date > today - timedelta(days=training_load.CHRONIC_DAYS),
+        DailyMuscleLoad.local_date <= today
+    ).group_by(DailyMuscleLoad.muscle_group).all()
+
+    loads = []
+    for muscle_group, acute, total in rows:
+        chronic = total * training_load.ACUTE_DAYS / training_load.CHRONIC_DAYS
+        ratio = training_load.acwr(acute, chronic)
+        loads.append(MuscleGroupLoad(
+            muscle_group=muscle_group,
+            acute=acute,
+            chronic=round(chronic, 2),
+            acwr=ratio,
+            zone=training_load.zone(ratio)
+        ))
+    return sorted(loads, key=lambda l: (l.acwr is None, -(l.acwr or 0), l.muscle_group))
+
+
+@router.get("/training-load/series", response_model=TrainingLoadSeries)
+@analytics_cache.cached("training-load/series")
+def get_training_load_series(
+    user_id: int = Query(...),
+    muscle_group: str = Query(...),
+    metric: str = Query("volume", pattern="^(volume|sets)$"),
+    days: int = Query(90, ge=7, le=MAX_HEATMAP_DAYS),
+    db: Session = Depends(get_db)
+):
+    """Daily acute load, chronic load and their ratio for one muscle group"""
+    end = local_today(user_timezone(db, user_id))
+    start = end - timedelta(days=days - 1)
+
+    rows = db.query(DailyMuscleLoad.local_date, LOAD_COLUMNS[metric]).filter(
+        DailyMuscleLoad.user_id == user_id,
+        DailyMuscleLoad.muscle_group == muscle_group,
+        DailyMuscleLoad.local_date > start - timedelta(days=training_load.CHRONIC_DAYS),
+        DailyMuscleLoad.local_date <= end
+    ).all()
+
+    acute, chronic = training_load.rolling_loads(
+        [day for day, _ in rows], [value for _, value in rows], start, end
+    )
+    return TrainingLoadSeries(
+        muscle_group=muscle_group,
+        metric=metric,
+        dates=[(start + timedelta(days=i)).isoformat() for i in range(days)],
+        acute=acute.tolist(),
+        chronic=chronic.round(2).tolist(),
+        acwr=training_load.ratios(acute, chronic)
+    )
+
+
+MEASUREMENT_KEY = "^[A-Za-z0-9_ -]{1,50}$"
 
-    # Calculate current streak
-    current_streak = 0
-    today = date.today()
-
-    # Check if worked out today or yesterday (streak continues)
-    if sorted_dates and (sorted_dates[0] == today or sorted_dates[0] == today - timedelta(days=1)):
-        current_streak = 1
-        for i in range(1, len(sorted_dates)):
-            if sorted_dates[i] == sorted_dates[i-1] - timedelta(days=1):
-                current_streak += 1
-            else:
-                break
-
-    # Calculate longest streak
-    longest_streak = 1
-    current_run = 1
-    sorted_dates_asc = sorted(workout_dates)
-
-    for i in range(1, len(sorted_dates_asc)):
-        if sorted_dates_asc[i] == sorted_dates_asc[i-1] + timedelta(days=1):
-            current_run += 1
-            longest_streak = max(longest_streak, current_run)
-        else:
-            current_run = 1
 
-    if len(sorted_dates_asc) == 1:
-        longest_streak = 1
+def _measurement_series(db: Session, user_id: int, keys: List[str], cutoff_date: date) -> dict:
+    """key -> (dates, values) for numeric measurements, unpacked by json_each in SQL"""
+    series = {key: ([], []) for key in keys}
+    entry = func.json_each(BodyMetric.measurements).table_valued("key", "value", "type")
+    rows = db.query(entry.c.key, BodyMetric.date, entry.c.value).select_from(BodyMetric).join(
+        entry, true()
+    ).filter(
+        BodyMetric.user_id == user_id,
+        BodyMetric.date >= cutoff_date,
+        entry.c.key.in_(keys),
+        entry.c.type.in_(["integer", "real"])
+    ).order_by(entry.c.key, BodyMetric.date, BodyMetric.id)
+
+    for key, day, value in rows:
+        dates, values = series[key]
+        if dates and dates[-1] == day.isoformat():
+            values[-1] = float(value)  # the latest entry for a day wins
+            continue
+        dates.append(day.isoformat())
+        values.append(float(value))
+    return series
+
+
+@router.get("/measurement-progress", response_model=MeasurementSeries)
+@analytics_cache.cached("measurement-progress")
+def get_measurement_progress(
+    user_id: int = Query(...),
+    key: str = Query(..., pattern=MEASUREMENT_KEY),
+    days: int = Query(90, ge=7, le=MAX_RANGE_DAYS),
+    max_points: Optional[int] = Query(None, ge=3, le=5000),
+    db: Session = Depends(get_db)
+):
+    """One body measurement over time, optionally downsampled to max_points"""
+    cutoff_date = local_today(user_timezone(db, user_id)) - timedelta(days=days)
+    dates, values = _measurement_series(db, user_id, [key], cutoff_date)[key]
+    dates, values = downsample_series(dates, values, max_points)
+    return MeasurementSeries(key=key, dates=dates, values=values)
+
+
+@router.get("/measurement-progress/batch", response_model=List[MeasurementSeries])
+@analytics_cache.cached("measurement-progress/batch")
+def get_measurement_progress_batch(
+    user_id: int = Query(...),
+    keys: List[str] = Query(..., min_length=1, max_length=20),
+    days: int = Query(90, ge=7, le=MAX_RANGE_DAYS),
+    max_points: Optional[int] = Query(None, ge=3, le=5000),
+    db: Session = Depends(get_db)
+):
+    """Several body measurements from one scan, in request order"""
+    keys = list(dict.fromkeys(keys))
+    for key in keys:
+        if not re.match(MEASUREMENT_KEY, key):
+            raise HTTPException(status_code=422, detail=f"Invalid measurement key: {key}")
+    cutoff_date = local_today(user_timezone(db, user_id)) - timedelta(days=days)
+    series = _measurement_series(db, user_id, keys, cutoff_date)
+
+    results = []
+    for key in keys:
+        dates, values = downsample_series(*series[key], max_points)
+        results.append(MeasurementSeries(key=key, dates=dates, values=values))
+    return results
+
+
+def streak_info(db: Session, user_id: int, today: date) -> StreakInfo:
+    """Streak as of the user's local today, read from user_streaks"""
+    streak = db.get(UserStreak, user_id)
+    if streak is None:
+        # Not stored yet (no workouts, or not migrated); computed without writing from a read
+        streak = compute_streak(db, user_id)
+
+    # The run only counts as current if it reaches today or yesterday
+    current_streak = 0
+    if streak.last_workout_date and streak.last_workout_date >= today - timedelta(days=1):
+        current_streak = streak.current_run
 
     return StreakInfo(
         current_streak=current_streak,
-        longest_streak=longest_streak,
-        total_workouts=len(workouts),
-        last_workout_date=sorted_dates[0] if sorted_dates else None
+        longest_streak=streak.longest_run,
+        total_workouts=streak.total_workouts,
+        last_workout_date=streak.last_workout_date
     )
 
 
-@router.get("/muscle-group-balance")
-def get_muscle_group_balance(
+@router.get("/streak", response_model=StreakInfo)
+@analytics_cache.cached("streak")
+def get_streak_info(
     user_id: int = Query(...),
-    days: int = Query(30, ge=7, le=90),
     db: Session = Depends(get_db)
 ):
-    """Get muscle group distribution over recent period"""
-    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+    """Get workout streak information"""
+    return streak_info(db, user_id, local_today(user_timezone(db, user_id)))
 
-    workout_exercises = db.query(WorkoutExercise).join(
-        Workout
+
+def _muscle_group_balance(db: Session, user_id: int, since: date) -> dict:
+    """Set counts per muscle group since a day, from SQLite"""
+    rows = db.query(
+        ExerciseMuscleGroup.muscle_group, func.count(WorkoutSet.id)
+    ).select_from(Workout).join(
+        WorkoutExercise, WorkoutExercise.workout_id == Workout.id
+    ).join(
+        ExerciseMuscleGroup, ExerciseMuscleGroup.exercise_id == WorkoutExercise.exercise_id
+    ).outerjoin(
+        WorkoutSet, WorkoutSet.workout_exercise_id == WorkoutExercise.id
     ).filter(
         Workout.user_id == user_id,
-        Workout.started_at >= cutoff_date
-    ).all()
+        Workout.local_date >= since
+    ).group_by(ExerciseMuscleGroup.muscle_group).all()
+    return {mg: count for mg, count in rows}
+
 
-    muscle_groups = {}
-    for we in workout_exercises:
-        exercise = db.query(Exercise).filter(
-            Exercise.id == we.exercise_id
-        ).first()
-        if exercise:
-            sets_count = len(we.sets)
-            for mg in exercise.muscle_groups:
-                muscle_groups[mg] = muscle_groups.get(mg, 0) + sets_count
+@router.get("/muscle-group-balance", dependencies=[Depends(balance_gate)])
+@analytics_cache.cached("muscle-group-balance")
+def get_muscle_group_balance(
+    user_id: int = Query(...),
+    days: int = Query(30, ge=7, le=90),
+    db: Session = Depends(get_db)
+):
+    """Get muscle group distribution over recent period"""
+    cutoff_date = local_today(user_timezone(db, user_id)) - timedelta(days=days)
+
+    if COLUMNAR_BACKEND:
+        return {
+            "muscle_groups": columnar.muscle_group_balance(db, columnar_store.columns(db, user_id), cutoff_date),
+            "period_days": days
+        }
+    if DUCKDB_BACKEND:
+        return {
+            "muscle_groups": duckdb_mirror.muscle_group_balance(db, user_id, cutoff_date),
+            "period_days": days
+        }
 
     return {
-        "muscle_groups": muscle_groups,
+        "muscle_groups": _muscle_group_balance(db, user_id, cutoff_date),
         "period_days": days
     }
 
 
 @router.get("/workout-frequency")
+@analytics_cache.cached("workout-frequency")
 def get_workout_frequency(
     user_id: int = Query(...),
     days: int = Query(30, ge=7, le=365),
     db: Session = Depends(get_db)
 ):
     """Get workout frequency data for calendar view"""
-    cutoff_date = date.today() - timedelta(days=days)
+    cutoff_date = local_today(user_timezone(db, user_id)) - timedelta(days=days)
 
-    workouts = db.query(Workout).filter(
-        Workout.user_id == user_id,
-        func.date(Workout.started_at) >= cutoff_date
-    ).all()
+    if COLUMNAR_BACKEND:
+        return {
+            "dates": columnar.workout_frequency(columnar_store.columns(db, user_id), cutoff_date),
+            "period_days": days
+        }
 
-    # Group by date
-    date_counts = {}
-    for w in workouts:
-        d = w.started_at.date().isoformat()
-        date_counts[d] = date_counts.get(d, 0) + 1
+    rows = db.query(Workout.local_date, func.count(Workout.id)).filter(
+        Workout.user_id == user_id,
+        Workout.local_date >= cutoff_date
+    ).group_by(Workout.local_date).all()
 
     return {
-        "dates": date_counts,
+        "dates": {d.isoformat(): count for d, count in rows},
         "period_days": days
     }
+
+
+@router.get("/cache-stats")
+def get_cache_stats():
+    """Hit, miss and eviction counters for this worker's analytics cache"""
+    return analytics_cache.stats()
+
+
+@router.get("/columnar-stats")
+def get_columnar_stats():
+    """Size and load counters for this worker's columnar store"""
+    return {"enabled": COLUMNAR_BACKEND, **columnar_store.stats()}
+
+
+@router.get("/duckdb-stats")
+def get_duckdb_stats():
+    """Row counts and sync counters for this worker's DuckDB mirror"""
+    return {"enabled": DUCKDB_BACKEND, **analytics_mirror.stats()}
+
+
+@router.get("/admission-stats")
+def get_admission_stats():
+    """Concurrency, queue depth and wait times for each gated endpoint"""
+    return admission_stats()
+
+
+@router.get("/heatmap", response_model=ActivityHeatmap, dependencies=[Depends(heatmap_gate)])
+@analytics_cache.cached("heatmap")
+def get_activity_heatmap(
+    user_id: int = Query(...),
+    start: Optional[date] = Query(None),
+    end: Optional[date] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """Get dense per-day workout counts and volume for a calendar heatmap (defaults to the last year)"""
+    end = end or local_today(user_timezone(db, user_id))
+    start = start or end - timedelta(days=364)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    span = (end - start).days + 1
+    if span > MAX_HEATMAP_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_HEATMAP_DAYS} days")
+
+    volume = case(
+        (WorkoutSet.weight.isnot(None) & WorkoutSet.reps.isnot(None), WorkoutSet.weight * WorkoutSet.reps),
+        else_=0
+    )
+    rows = db.query(
+        Workout.local_date,
+        func.count(func.distinct(Workout.id)),
+        func.coalesce(func.sum(volume), 0)
+    ).outerjoin(
+        WorkoutExercise, WorkoutExercise.workout_id == Workout.id
+    ).outerjoin(
+        WorkoutSet, WorkoutSet.workout_exercise_id == WorkoutExercise.id
+    ).filter(
+        Workout.user_id == user_id,
+        Workout.local_date >= start,
+        Workout.local_date <= end
+    ).group_by(Workout.local_date).all()
+
+    counts = [0] * span
+    volumes = [0.0] * span
+    for day, count, day_volume in rows:
+        offset = (day - start).days
+        counts[offset] = count
+        volumes[offset] = round(float(day_volume), 1)
+
+    return ActivityHeatmap(start_date=start, end_date=end, counts=counts, volumes=volumes)
@@ -10,8 +10,10 @@ from schemas import (
     BodyMetricCreate, BodyMetricResponse,
     ProgressPhotoCreate, ProgressPhotoResponse
 )
+from utils.analytics_cache import bump_data_version
+from utils.idempotency import IdempotentRoute
 
-router = APIRouter()
+router = APIRouter(route_class=IdempotentRoute)
 
 
 # Body Metrics
@@ -49,6 +51,7 @@ def create_body_metric(
             existing.measurements = metric.measurements
         if metric.notes is not None:
             existing.notes = metric.notes
+        bump_data_version(db, user_id)
         db.commit()
         db.refresh(existing)
         return existing
@@ -62,6 +65,7 @@ def create_body_metric(
         notes=metric.notes
     )
     db.add(db_metric)
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(db_metric)
     return db_metric
@@ -72,6 +76,7 @@ def delete_body_metric(metric_id: int, db: Session = Depends(get_db)):
     metric = db.query(BodyMetric).filter(BodyMetric.id == metric_id).first()
     if not metric:
         raise HTTPException(status_code=404, detail="Body metric not found")
+    bump_data_version(db, metric.user_id)
     db.delete(metric)
     db.commit()
     return {"message": "Body metric deleted successfully"}
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+from contextlib import contextmanager
+import time
+
+from database import get_db
+from schemas import DashboardData, WorkoutTemplateResponse
+from routers.analytics import get_weekly_summary, get_streak_info
+from routers.workouts import workout_summaries
+from routers.templates import user_templates
+
+router = APIRouter()
+
+RECENT_WORKOUTS = 5
+
+
+@router.get("", response_model=DashboardData)
+def get_dashboard(
+    response: Response,
+    user_id: int = Query(...),
+    timing: bool = Query(False, description="Report per-section timings in Server-Timing"),
+    db: Session = Depends(get_db)
+):
+    """Everything the dashboard shows on first paint, in one request.
+
+    The weekly summary and streak go through the analytics endpoints' cache,
+    so the dashboard and those endpoints share results.
+    """
+    timings = []
+
+    @contextmanager
+    def timed(section: str):
+        started = time.perf_counter()
+        yield
+        timings.append(f"{section};dur={(time.perf_counter() - started) * 1000:.1f}")
+
+    with timed("weekly_summary"):
+        weekly_summary = get_weekly_summary(user_id=user_id, week_offset=0, db=db)
+    with timed("streak"):
+        streak = get_streak_info(user_id=user_id, db=db)
+    with timed("recent_workouts"):
+        recent_workouts = workout_summaries(db, user_id, RECENT_WORKOUTS)
+    with timed("templates"):
+        templates = [
+            WorkoutTemplateResponse.model_validate(template)
+            for template in user_templates(db, user_id)
+        ]
+
+    if timing:
+        response.headers["Server-Timing"] = ", ".join(timings)
+    return DashboardData(
+        weekly_summary=weekly_summary,
+        streak=streak,
+        recent_workouts=recent_workouts,
+        templates=templates
+    )
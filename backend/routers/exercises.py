@@ -1,14 +1,83 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from sqlalchemy import or_, and_
 from typing import List, Optional
+from datetime import datetime
+import base64
 
 from database import get_db
-from models.database import Exercise
-from schemas import ExerciseCreate, ExerciseResponse
+from models.database import Exercise, ExerciseMuscleGroup, Workout, WorkoutExercise, WorkoutSet
+from schemas import ExerciseCreate, ExerciseResponse, ExerciseSession, ExerciseHistoryPage
+from utils.analytics_cache import bump_data_version
+from utils.rollups import refresh_muscle_loads
 
 router = APIRouter()
 
 
+def _encode_cursor(started_at: datetime, workout_exercise_id: int) -> str:
+    raw = f"{started_at.isoformat()}|{workout_exercise_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    try:
+        started_at, workout_exercise_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(started_at), int(workout_exercise_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _build_sessions(db: Session, workout_exercise_ids: List[int]) -> List[ExerciseSession]:
+    """Load sessions with their sets, keeping the order of the given ids"""
+    if not workout_exercise_ids:
+        return []
+
+    rows = db.query(WorkoutExercise, Workout.name).join(
+        Workout, Workout.id == WorkoutExercise.workout_id
+    ).filter(WorkoutExercise.id.in_(workout_exercise_ids)).all()
+
+    sets_by_exercise = {}
+    sets = db.query(WorkoutSet).filter(
+        WorkoutSet.workout_exercise_id.in_(workout_exercise_ids)
+    ).order_by(WorkoutSet.set_number, WorkoutSet.id).all()
+    for s in sets:
+        sets_by_exercise.setdefault(s.workout_exercise_id, []).append(s)
+
+    sessions = {}
+    for we, workout_name in rows:
+        sessions[we.id] = ExerciseSession(
+            exercise_id=we.exercise_id,
+            workout_id=we.workout_id,
+            workout_exercise_id=we.id,
+            workout_name=workout_name,
+            started_at=we.started_at,
+            sets=sets_by_exercise.get(we.id, [])
+        )
+    return [sessions[i] for i in workout_exercise_ids if i in sessions]
+
+
+def _last_sessions(
+    db: Session,
+    user_id: int,
+    exercise_ids: List[int],
+    exclude_workout_id: Optional[int] = None
+) -> List[ExerciseSession]:
+    """Most recent session per exercise, one index seek each"""
+    latest = db.query(WorkoutExercise.id).filter(
+        WorkoutExercise.exercise_id == Exercise.id,
+        WorkoutExercise.user_id == user_id
+    )
+    if exclude_workout_id is not None:
+        latest = latest.filter(WorkoutExercise.workout_id != exclude_workout_id)
+    latest = latest.order_by(
+        WorkoutExercise.started_at.desc(), WorkoutExercise.id.desc()
+    ).limit(1).correlate(Exercise).scalar_subquery()
+
+    rows = db.query(Exercise.id, latest).filter(Exercise.id.in_(exercise_ids)).all()
+    latest_ids = {exercise_id: we_id for exercise_id, we_id in rows if we_id is not None}
+    return _build_sessions(db, [latest_ids[i] for i in exercise_ids if i in latest_ids])
+
+
 @router.get("/", response_model=List[ExerciseResponse])
 def get_exercises(
     category: Optional[str] = None,
@@ -24,10 +93,11 @@ def get_exercises(
     if category:
         query = query.filter(Exercise.category == category)
 
-    # Filter by muscle group (JSON contains)
+    # Filter by muscle group (indexed association table)
     if muscle_group:
-        # SQLite JSON support - check if muscle_group is in the list
-        query = query.filter(Exercise.muscle_groups.contains(muscle_group))
+        query = query.join(
+            ExerciseMuscleGroup, ExerciseMuscleGroup.exercise_id == Exercise.id
+        ).filter(ExerciseMuscleGroup.muscle_group == muscle_group)
 
     # Search by name
     if search:
@@ -61,6 +131,69 @@ def get_muscle_groups():
     ]
 
 
+@router.get("/last-performance", response_model=List[ExerciseSession])
+def get_last_performances(
+    user_id: int = Query(...),
+    exercise_ids: List[int] = Query(...),
+    exclude_workout_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Most recent session for each exercise; exercises never done are omitted"""
+    return _last_sessions(db, user_id, exercise_ids, exclude_workout_id)
+
+
+@router.get("/{exercise_id}/last-performance", response_model=Optional[ExerciseSession])
+def get_last_performance(
+    exercise_id: int,
+    user_id: int = Query(...),
+    exclude_workout_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """What the user did the last time they trained this exercise"""
+    sessions = _last_sessions(db, user_id, [exercise_id], exclude_workout_id)
+    return sessions[0] if sessions else None
+
+
+@router.get("/{exercise_id}/history", response_model=ExerciseHistoryPage)
+def get_exercise_history(
+    exercise_id: int,
+    user_id: int = Query(...),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Every session of an exercise with its sets, newest first, one page at a time"""
+    query = db.query(WorkoutExercise.id, WorkoutExercise.started_at).filter(
+        WorkoutExercise.exercise_id == exercise_id,
+        WorkoutExercise.user_id == user_id
+    )
+
+    if cursor:
+        started_at, workout_exercise_id = _decode_cursor(cursor)
+        query = query.filter(or_(
+            WorkoutExercise.started_at < started_at,
+            and_(
+                WorkoutExercise.started_at == started_at,
+                WorkoutExercise.id < workout_exercise_id
+            )
+        ))
+
+    rows = query.order_by(
+        WorkoutExercise.started_at.desc(), WorkoutExercise.id.desc()
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].started_at, rows[-1].id)
+
+    return ExerciseHistoryPage(
+        exercise_id=exercise_id,
+        sessions=_build_sessions(db, [row.id for row in rows]),
+        next_cursor=next_cursor
+    )
+
+
 @router.get("/{exercise_id}", response_model=ExerciseResponse)
 def get_exercise(exercise_id: int, db: Session = Depends(get_db)):
     exercise = db.query(Exercise).filter(Exercise.id == exercise_id).first()
@@ -111,6 +244,9 @@ def update_exercise(
     exercise.muscle_groups = exercise_update.muscle_groups
     exercise.equipment = exercise_update.equipment
 
+    # Names and muscle groups show up in the user's analytics
+    refresh_muscle_loads(db, user_id)
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(exercise)
     return exercise
@@ -131,5 +267,7 @@ def delete_exercise(
         raise HTTPException(status_code=403, detail="Cannot delete this exercise")
 
     db.delete(exercise)
+    refresh_muscle_loads(db, user_id)
+    bump_data_version(db, user_id)
     db.commit()
     return {"message": "Exercise deleted successfully"}
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from database import get_db
+from models.database import User
+from utils import export
+
+router = APIRouter()
+
+
+@router.get("/sets")
+def export_sets(
+    user_id: Optional[int] = Query(None),
+    fmt: str = Query("parquet", alias="format", pattern="^(parquet|arrow)$"),
+    db: Session = Depends(get_db)
+):
+    """Every set (one user's, or everyone's without user_id) as a Parquet or Arrow IPC file"""
+    if not export.available():
+        raise HTTPException(status_code=501, detail="Export requires the pyarrow package")
+    if user_id is not None and db.get(User, user_id) is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    filename = f"sets-{user_id if user_id is not None else 'all'}.{fmt}"
+    return StreamingResponse(
+        export.stream_sets(db, fmt, user_id),
+        media_type=export.FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
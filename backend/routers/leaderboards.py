@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import timedelta
+
+from database import get_db
+from models.database import Exercise, LeaderboardEntry, User, UserStreak
+from schemas import Leaderboard, LeaderboardRow
+from utils.leaderboards import ALL_TIME, week_start
+from utils.timezones import local_today, user_timezone
+
+router = APIRouter()
+
+
+def _ranked(rows) -> List[LeaderboardRow]:
+    """(user_id, user_name, value) rows, highest value first, into competition ranks"""
+    ranked = []
+    for position, (user_id, user_name, value) in enumerate(rows, start=1):
+        rank = ranked[-1].rank if ranked and ranked[-1].value == value else position
+        ranked.append(LeaderboardRow(rank=rank, user_id=user_id, user_name=user_name, value=value))
+    return ranked
+
+
+@router.get("/streak", response_model=Leaderboard)
+def get_streak_leaderboard(
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Current workout streaks across all profiles"""
+    rows = []
+    for streak, name, timezone_name in db.query(UserStreak, User.name, User.timezone).join(
+        User, User.id == UserStreak.user_id
+    ).filter(UserStreak.current_run > 0):
+        # Same rule as /analytics/streak: the run must reach the user's today or yesterday
+        today = local_today(timezone_name or "UTC")
+        if streak.last_workout_date >= today - timedelta(days=1):
+            rows.append((streak.user_id, name, float(streak.current_run)))
+
+    rows.sort(key=lambda row: (-row[2], row[1]))
+    return Leaderboard(board="streak", entries=_ranked(rows[:limit]))
+
+
+@router.get("/exercises/{exercise_id}", response_model=Leaderboard)
+def get_exercise_leaderboard(
+    exercise_id: int,
+    board: str = Query("e1rm", pattern="^(e1rm|weekly_volume)$"),
+    week_offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    user_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """Best e1RM (all time) or volume for one week on an exercise, across all profiles.
+
+    The week is the requesting profile's (user_id) local week; UTC without one.
+    """
+    exercise = db.query(Exercise).filter(Exercise.id == exercise_id).first()
+    if not exercise:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+
+    period = ALL_TIME
+    if board == "weekly_volume":
+        today = local_today(user_timezone(db, user_id) if user_id is not None else "UTC")
+        period = (week_start(today) - timedelta(weeks=week_offset)).isoformat()
+
+    rows = db.query(LeaderboardEntry.user_id, User.name, LeaderboardEntry.value).join(
+        User, User.id == LeaderboardEntry.user_id
+    ).filter(
+        LeaderboardEntry.exercise_id == exercise_id,
+        LeaderboardEntry.board == board,
+        LeaderboardEntry.period == period
+    ).order_by(LeaderboardEntry.value.desc(), User.name).limit(limit).all()
+
+    return Leaderboard(
+        board=board,
+        exercise_id=exercise.id,
+        exercise_name=exercise.name,
+        period=None if period == ALL_TIME else period,
+        entries=_ranked(rows)
+    )
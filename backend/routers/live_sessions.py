@@ -0,0 +1,101 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session, joinedload
+
+from database import get_db
+from models.database import Workout, WorkoutExercise
+from schemas import (
+    WorkoutResponse, WorkoutUpdate, WorkoutSetCreate, WorkoutSetUpdate,
+    WorkoutSetResponse
+)
+from routers.workouts import on_sets_changed
+from utils.analytics_cache import bump_data_version
+from utils.live_sessions import live_store, LiveSessionError
+from utils.idempotency import IdempotentRoute
+
+router = APIRouter(route_class=IdempotentRoute)
+
+live_store.on_exercise_flushed = on_sets_changed
+
+
+@router.post("/{workout_id}/live", response_model=WorkoutResponse)
+def start_live_session(workout_id: int, db: Session = Depends(get_db)):
+    """Hold a workout in memory while it is being logged"""
+    try:
+        return live_store.start(db, workout_id)
+    except LiveSessionError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/{workout_id}/live", response_model=WorkoutResponse)
+def get_live_session(workout_id: int):
+    try:
+        return live_store.get(workout_id)
+    except LiveSessionError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/{workout_id}/live/exercises/{workout_exercise_id}/sets", response_model=WorkoutSetResponse)
+def add_live_set(workout_id: int, workout_exercise_id: int, set_data: WorkoutSetCreate):
+    try:
+        return live_store.add_set(workout_id, workout_exercise_id, set_data.model_dump())
+    except LiveSessionError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.put("/{workout_id}/live/sets/{set_id}", response_model=WorkoutSetResponse)
+def update_live_set(workout_id: int, set_id: int, set_update: WorkoutSetUpdate):
+    try:
+        return live_store.update_set(workout_id, set_id, set_update.model_dump(exclude_unset=True))
+    except LiveSessionError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.delete("/{workout_id}/live/sets/{set_id}")
+def delete_live_set(workout_id: int, set_id: int):
+    try:
+        live_store.delete_set(workout_id, set_id)
+    except LiveSessionError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"message": "Set deleted successfully"}
+
+
+@router.post("/{workout_id}/live/checkpoint")
+def checkpoint_live_session(workout_id: int):
+    """Persist pending edits now instead of waiting for the next checkpoint"""
+    try:
+        live_store.checkpoint(workout_id)
+    except LiveSessionError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"message": "Live session saved"}
+
+
+@router.post("/{workout_id}/live/finish", response_model=WorkoutResponse)
+def finish_live_session(
+    workout_id: int,
+    workout_update: WorkoutUpdate,
+    db: Session = Depends(get_db)
+):
+    """Persist all edits, apply the final workout details and leave live mode"""
+    try:
+        live_store.finish(workout_id)
+    except LiveSessionError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    workout = db.query(Workout).filter(Workout.id == workout_id).first()
+    if not workout:
+        raise HTTPException(status_code=404, detail="Workout not found")
+
+    for field, value in workout_update.model_dump(exclude_unset=True).items():
+        if value is not None:
+            setattr(workout, field, value)
+    bump_data_version(db, workout.user_id)
+    db.commit()
+
+    workout = db.query(Workout).options(
+        joinedload(Workout.exercises)
+        .joinedload(WorkoutExercise.exercise),
+        joinedload(Workout.exercises)
+        .joinedload(WorkoutExercise.sets)
+    ).filter(Workout.id == workout_id).first()
+
+    return workout
@@ -8,22 +8,31 @@ from models.database import WorkoutTemplate, TemplateExercise, Workout, WorkoutE
 from schemas import (
     WorkoutTemplateCreate, WorkoutTemplateResponse, WorkoutResponse
 )
+from utils.analytics_cache import bump_data_version
+from utils.idempotency import IdempotentRoute
+from utils.rollups import refresh_workout_stats
+from utils.streaks import record_workout_day
+from utils.timezones import local_date_for, user_timezone
 
-router = APIRouter()
+router = APIRouter(route_class=IdempotentRoute)
 
 
-@router.get("/", response_model=List[WorkoutTemplateResponse])
-def get_templates(
-    user_id: int = Query(...),
-    db: Session = Depends(get_db)
-):
-    templates = db.query(WorkoutTemplate).options(
+def user_templates(db: Session, user_id: int) -> List[WorkoutTemplate]:
+    """A user's templates, most recently used first"""
+    return db.query(WorkoutTemplate).options(
         joinedload(WorkoutTemplate.exercises)
         .joinedload(TemplateExercise.exercise)
     ).filter(
         WorkoutTemplate.user_id == user_id
     ).order_by(WorkoutTemplate.last_used.desc().nullslast()).all()
-    return templates
+
+
+@router.get("/", response_model=List[WorkoutTemplateResponse])
+def get_templates(
+    user_id: int = Query(...),
+    db: Session = Depends(get_db)
+):
+    return user_templates(db, user_id)
 
 
 @router.get("/{template_id}", response_model=WorkoutTemplateResponse)
@@ -150,10 +159,12 @@ def start_workout_from_template(
         raise HTTPException(status_code=404, detail="Template not found")
 
     # Create the workout
+    now = datetime.now(timezone.utc)
     db_workout = Workout(
         user_id=user_id,
         name=template.name,
-        started_at=datetime.now(timezone.utc)
+        started_at=now,
+        local_date=local_date_for(now, user_timezone(db, user_id))
     )
     db.add(db_workout)
     db.flush()
@@ -163,6 +174,8 @@ def start_workout_from_template(
         db_exercise = WorkoutExercise(
             workout_id=db_workout.id,
             exercise_id=template_ex.exercise_id,
+            user_id=user_id,
+            started_at=db_workout.started_at,
             order=template_ex.order,
             notes=template_ex.notes
         )
@@ -180,6 +193,10 @@ def start_workout_from_template(
                 )
                 db.add(db_set)
 
+    refresh_workout_stats(db, db_workout, [ex.exercise_id for ex in template.exercises])
+    record_workout_day(db, user_id, db_workout.local_date)
+    bump_data_version(db, user_id)
+
     # Update template last used
     template.last_used = datetime.now(timezone.utc)
 
@@ -6,8 +6,12 @@ from datetime import datetime, timezone
 import base64
 
 from database import get_db
-from models.database import User
+from models.database import User, Workout
 from schemas import UserCreate, UserUpdate, UserResponse
+from utils.analytics_cache import bump_data_version
+from utils.rollups import backfill_daily_stats
+from utils.streaks import rebuild_streak
+from utils.timezones import is_valid_timezone, local_date_for
 
 router = APIRouter()
 
@@ -22,6 +26,7 @@ def get_users(db: Session = Depends(get_db)):
             "name": user.name,
             "created_at": user.created_at,
             "last_active": user.last_active,
+            "timezone": user.timezone or "UTC",
             "has_profile_picture": user.profile_picture is not None
         }
         result.append(UserResponse(**user_dict))
@@ -39,6 +44,7 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
         name=db_user.name,
         created_at=db_user.created_at,
         last_active=db_user.last_active,
+        timezone=db_user.timezone or "UTC",
         has_profile_picture=False
     )
 
@@ -58,6 +64,7 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
         name=user.name,
         created_at=user.created_at,
         last_active=user.last_active,
+        timezone=user.timezone or "UTC",
         has_profile_picture=user.profile_picture is not None
     )
 
@@ -71,6 +78,17 @@ def update_user(user_id: int, user_update: UserUpdate, db: Session = Depends(get
     if user_update.name:
         user.name = user_update.name
 
+    if user_update.timezone and user_update.timezone != user.timezone:
+        if not is_valid_timezone(user_update.timezone):
+            raise HTTPException(status_code=400, detail="Unknown timezone")
+        user.timezone = user_update.timezone
+        # Re-bucket every workout into the new calendar
+        for workout in db.query(Workout).filter(Workout.user_id == user_id):
+            workout.local_date = local_date_for(workout.started_at, user.timezone)
+        backfill_daily_stats(db, user_id)
+        rebuild_streak(db, user_id)
+        bump_data_version(db, user_id)
+
     user.last_active = datetime.now(timezone.utc)
     db.commit()
     db.refresh(user)
@@ -80,6 +98,7 @@ def update_user(user_id: int, user_update: UserUpdate, db: Session = Depends(get
         name=user.name,
         created_at=user.created_at,
         last_active=user.last_active,
+        timezone=user.timezone or "UTC",
         has_profile_picture=user.profile_picture is not None
     )
 
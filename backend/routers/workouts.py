@@ -1,19 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, insert, select, cast, case, String, false, literal
 from typing import List, Optional
 from datetime import datetime, timezone, timedelta
 
 from database import get_db
 from models.database import (
-    Workout, WorkoutExercise, WorkoutSet, Exercise, PersonalRecord
+    Workout, WorkoutExercise, WorkoutSet, Exercise, PersonalRecord,
+    WorkoutTemplate, TemplateExercise
 )
 from schemas import (
     WorkoutCreate, WorkoutUpdate, WorkoutResponse, WorkoutSummary,
     WorkoutExerciseCreate, WorkoutSetCreate, WorkoutSetUpdate,
-    WorkoutSetResponse, PersonalRecordResponse
+    WorkoutSetResponse, PersonalRecordResponse, WorkoutTemplateResponse
 )
+from utils.analytics_cache import bump_data_version
+from utils.idempotency import IdempotentRoute
+from utils.live_sessions import live_store
+from utils.rollups import refresh_workout_stats, refresh_daily_stats, workout_day
+from utils.streaks import record_workout_day, forget_workout_day
+from utils.timezones import local_date_for, user_timezone
 
-router = APIRouter()
+router = APIRouter(route_class=IdempotentRoute)
 
 
 def check_and_update_prs(db: Session, user_id: int, workout_exercise: WorkoutExercise):
@@ -74,27 +82,48 @@ def check_and_update_prs(db: Session, user_id: int, workout_exercise: WorkoutExe
                 db.add(new_pr)
 
 
-@router.get("/", response_model=List[WorkoutSummary])
-def get_workouts(
-    user_id: int = Query(...),
-    limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db)
-):
+def on_sets_changed(db: Session, user_id: int, workout_exercise: WorkoutExercise):
+    """Bring PRs, daily rollups and cached analytics up to date after an exercise's sets changed"""
+    check_and_update_prs(db, user_id, workout_exercise)
+    refresh_workout_stats(db, workout_exercise.workout, [workout_exercise.exercise_id])
+    bump_data_version(db, user_id)
+
+
+def _reject_if_live(workout_id: int):
+    """Sets of a live workout are edited through its live session only"""
+    if live_store.is_live(workout_id):
+        raise HTTPException(status_code=409, detail="Workout is being logged live")
+
+
+def workout_summaries(db: Session, user_id: int, limit: int, offset: int = 0) -> List[WorkoutSummary]:
+    """Most recent workouts first, with set counts and volume totalled in SQL"""
     workouts = db.query(Workout).filter(
         Workout.user_id == user_id
     ).order_by(Workout.started_at.desc()).offset(offset).limit(limit).all()
+    if not workouts:
+        return []
+
+    volume = case(
+        (WorkoutSet.weight.isnot(None) & WorkoutSet.reps.isnot(None), WorkoutSet.weight * WorkoutSet.reps),
+        else_=0
+    )
+    totals = {
+        workout_id: (exercise_count, total_sets, float(total_volume))
+        for workout_id, exercise_count, total_sets, total_volume in db.query(
+            WorkoutExercise.workout_id,
+            func.count(func.distinct(WorkoutExercise.id)),
+            func.count(WorkoutSet.id),
+            func.coalesce(func.sum(volume), 0)
+        ).outerjoin(
+            WorkoutSet, WorkoutSet.workout_exercise_id == WorkoutExercise.id
+        ).filter(
+            WorkoutExercise.workout_id.in_([w.id for w in workouts])
+        ).group_by(WorkoutExercise.workout_id)
+    }
 
     summaries = []
     for workout in workouts:
-        total_sets = 0
-        total_volume = 0.0
-        for we in workout.exercises:
-            for s in we.sets:
-                total_sets += 1
-                if s.weight and s.reps:
-                    total_volume += s.weight * s.reps
-
+        exercise_count, total_sets, total_volume = totals.get(workout.id, (0, 0, 0.0))
         summaries.append(WorkoutSummary(
             id=workout.id,
             user_id=workout.user_id,
@@ -102,7 +131,7 @@ def get_workouts(
             started_at=workout.started_at,
             completed_at=workout.completed_at,
             duration_seconds=workout.duration_seconds,
-            exercise_count=len(workout.exercises),
+            exercise_count=exercise_count,
             total_sets=total_sets,
             total_volume=total_volume
         ))
@@ -110,6 +139,16 @@ def get_workouts(
     return summaries
 
 
+@router.get("/", response_model=List[WorkoutSummary])
+def get_workouts(
+    user_id: int = Query(...),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    return workout_summaries(db, user_id, limit, offset)
+
+
 @router.get("/{workout_id}", response_model=WorkoutResponse)
 def get_workout(workout_id: int, db: Session = Depends(get_db)):
     workout = db.query(Workout).options(
@@ -135,7 +174,8 @@ def create_workout(
         user_id=user_id,
         name=workout.name,
         notes=workout.notes,
-        started_at=workout.started_at
+        started_at=workout.started_at,
+        local_date=local_date_for(workout.started_at, user_timezone(db, user_id))
     )
     db.add(db_workout)
     db.flush()
@@ -145,6 +185,8 @@ def create_workout(
         db_exercise = WorkoutExercise(
             workout_id=db_workout.id,
             exercise_id=ex_data.exercise_id,
+            user_id=user_id,
+            started_at=db_workout.started_at,
             order=ex_data.order,
             notes=ex_data.notes
         )
@@ -171,6 +213,9 @@ def create_workout(
         db.flush()
         check_and_update_prs(db, user_id, db_exercise)
 
+    refresh_workout_stats(db, db_workout, [ex.exercise_id for ex in workout.exercises])
+    record_workout_day(db, user_id, db_workout.local_date)
+    bump_data_version(db, user_id)
     db.commit()
 
     # Reload with relationships
@@ -203,7 +248,9 @@ def update_workout(
     if workout_update.duration_seconds is not None:
         workout.duration_seconds = workout_update.duration_seconds
 
+    bump_data_version(db, workout.user_id)
     db.commit()
+    live_store.refresh(db, workout_id)
 
     # Reload with relationships
     workout = db.query(Workout).options(
@@ -222,11 +269,177 @@ def delete_workout(workout_id: int, db: Session = Depends(get_db)):
     if not workout:
         raise HTTPException(status_code=404, detail="Workout not found")
 
+    live_store.discard(workout_id)
+    user_id, day = workout.user_id, workout_day(workout)
+    exercise_ids = [we.exercise_id for we in workout.exercises]
     db.delete(workout)
+    refresh_daily_stats(db, user_id, exercise_ids, [day])
+    forget_workout_day(db, user_id, day)
+    bump_data_version(db, user_id)
     db.commit()
     return {"message": "Workout deleted successfully"}
 
 
+def _ranked_exercises(workout_id: int):
+    """Workout exercises of a workout numbered in insertion order"""
+    return select(
+        WorkoutExercise.id,
+        func.row_number().over(order_by=WorkoutExercise.id).label("rn")
+    ).where(WorkoutExercise.workout_id == workout_id).subquery()
+
+
+@router.post("/{workout_id}/repeat", response_model=WorkoutResponse)
+def repeat_workout(
+    workout_id: int,
+    include_sets: bool = Query(True),
+    db: Session = Depends(get_db)
+):
+    """Start a new workout for the same user with the same exercises (and set targets) as a past one"""
+    source = db.query(Workout).filter(Workout.id == workout_id).first()
+    if not source:
+        raise HTTPException(status_code=404, detail="Workout not found")
+
+    now = datetime.now(timezone.utc)
+    user_id = source.user_id
+    db_workout = Workout(
+        user_id=user_id,
+        name=source.name,
+        started_at=now,
+        local_date=local_date_for(now, user_timezone(db, user_id))
+    )
+    db.add(db_workout)
+    db.flush()
+
+    db.execute(
+        insert(WorkoutExercise).from_select(
+            [
+                "workout_id", "exercise_id", "user_id", "started_at",
+                "order", "phase", "notes", "created_at"
+            ],
+            select(
+                literal(db_workout.id), WorkoutExercise.exercise_id,
+                literal(db_workout.user_id), literal(now),
+                WorkoutExercise.order, WorkoutExercise.phase,
+                WorkoutExercise.notes, literal(now)
+            ).where(
+                WorkoutExercise.workout_id == workout_id
+            ).order_by(WorkoutExercise.id)
+        )
+    )
+
+    if include_sets:
+        old = _ranked_exercises(workout_id)
+        new = _ranked_exercises(db_workout.id)
+        db.execute(
+            insert(WorkoutSet).from_select(
+                [
+                    "workout_exercise_id", "set_number", "reps", "weight",
+                    "duration_seconds", "distance", "is_warmup", "is_dropset",
+                    "is_failure", "is_completed", "rest_seconds", "completed_at"
+                ],
+                select(
+                    new.c.id, WorkoutSet.set_number, WorkoutSet.reps, WorkoutSet.weight,
+                    WorkoutSet.duration_seconds, WorkoutSet.distance, WorkoutSet.is_warmup,
+                    WorkoutSet.is_dropset, WorkoutSet.is_failure, false(),
+                    WorkoutSet.rest_seconds, literal(now)
+                ).join(
+                    old, WorkoutSet.workout_exercise_id == old.c.id
+                ).join(
+                    new, new.c.rn == old.c.rn
+                ).order_by(old.c.rn, WorkoutSet.set_number, WorkoutSet.id)
+            )
+        )
+        refresh_workout_stats(db, db_workout, [
+            exercise_id for (exercise_id,) in db.query(WorkoutExercise.exercise_id).filter(
+                WorkoutExercise.workout_id == db_workout.id
+            )
+        ])
+
+    record_workout_day(db, user_id, db_workout.local_date)
+    bump_data_version(db, user_id)
+    db.commit()
+
+    # Reload with relationships
+    workout = db.query(Workout).options(
+        joinedload(Workout.exercises)
+        .joinedload(WorkoutExercise.exercise),
+        joinedload(Workout.exercises)
+        .joinedload(WorkoutExercise.sets)
+    ).filter(Workout.id == db_workout.id).first()
+
+    return workout
+
+
+@router.post("/{workout_id}/to-template", response_model=WorkoutTemplateResponse)
+def save_workout_as_template(
+    workout_id: int,
+    name: Optional[str] = Query(None, min_length=1, max_length=200),
+    category: Optional[str] = None,
+    include_targets: bool = Query(True),
+    db: Session = Depends(get_db)
+):
+    """Create a template from a workout, deriving targets from its working sets"""
+    source = db.query(Workout).filter(Workout.id == workout_id).first()
+    if not source:
+        raise HTTPException(status_code=404, detail="Workout not found")
+
+    db_template = WorkoutTemplate(
+        user_id=source.user_id,
+        name=name or source.name or "Workout",
+        category=category
+    )
+    db.add(db_template)
+    db.flush()
+
+    columns = [WorkoutExercise.exercise_id, WorkoutExercise.order]
+    if include_targets:
+        working_sets = WorkoutSet.__table__.alias("working_sets")
+        targets = select(
+            literal(db_template.id), *columns,
+            func.nullif(func.count(working_sets.c.id), 0),
+            cast(func.max(working_sets.c.reps), String),
+            func.max(working_sets.c.weight),
+            func.max(working_sets.c.rest_seconds),
+            WorkoutExercise.notes
+        ).outerjoin(
+            working_sets,
+            (working_sets.c.workout_exercise_id == WorkoutExercise.id)
+            & (working_sets.c.is_warmup == false())
+        ).where(
+            WorkoutExercise.workout_id == workout_id
+        ).group_by(WorkoutExercise.id).order_by(WorkoutExercise.id)
+        db.execute(
+            insert(TemplateExercise).from_select(
+                [
+                    "template_id", "exercise_id", "order", "target_sets",
+                    "target_reps", "target_weight", "rest_seconds", "notes"
+                ],
+                targets
+            )
+        )
+    else:
+        db.execute(
+            insert(TemplateExercise).from_select(
+                ["template_id", "exercise_id", "order", "notes"],
+                select(
+                    literal(db_template.id), *columns, WorkoutExercise.notes
+                ).where(
+                    WorkoutExercise.workout_id == workout_id
+                ).order_by(WorkoutExercise.id)
+            )
+        )
+
+    db.commit()
+
+    # Reload with relationships
+    template = db.query(WorkoutTemplate).options(
+        joinedload(WorkoutTemplate.exercises)
+        .joinedload(TemplateExercise.exercise)
+    ).filter(WorkoutTemplate.id == db_template.id).first()
+
+    return template
+
+
 # Exercise management within workouts
 @router.post("/{workout_id}/exercises", response_model=WorkoutResponse)
 def add_exercise_to_workout(
@@ -241,6 +454,8 @@ def add_exercise_to_workout(
     db_exercise = WorkoutExercise(
         workout_id=workout_id,
         exercise_id=exercise_data.exercise_id,
+        user_id=workout.user_id,
+        started_at=workout.started_at,
         order=exercise_data.order,
         notes=exercise_data.notes
     )
@@ -265,8 +480,10 @@ def add_exercise_to_workout(
         db.add(db_set)
 
     db.flush()
-    check_and_update_prs(db, workout.user_id, db_exercise)
+    on_sets_changed(db, workout.user_id, db_exercise)
     db.commit()
+    # A live session keeps logging into the new exercise
+    live_store.refresh(db, workout_id)
 
     # Reload with relationships
     workout = db.query(Workout).options(
@@ -291,6 +508,7 @@ def add_set(
     ).first()
     if not we:
         raise HTTPException(status_code=404, detail="Workout exercise not found")
+    _reject_if_live(we.workout_id)
 
     db_set = WorkoutSet(
         workout_exercise_id=workout_exercise_id,
@@ -314,7 +532,7 @@ def add_set(
     we_full = db.query(WorkoutExercise).options(
         joinedload(WorkoutExercise.sets)
     ).filter(WorkoutExercise.id == workout_exercise_id).first()
-    check_and_update_prs(db, workout.user_id, we_full)
+    on_sets_changed(db, workout.user_id, we_full)
 
     db.commit()
     db.refresh(db_set)
@@ -330,6 +548,7 @@ def update_set(
     db_set = db.query(WorkoutSet).filter(WorkoutSet.id == set_id).first()
     if not db_set:
         raise HTTPException(status_code=404, detail="Set not found")
+    _reject_if_live(db_set.workout_exercise.workout_id)
 
     for field, value in set_update.model_dump(exclude_unset=True).items():
         setattr(db_set, field, value)
@@ -342,7 +561,7 @@ def update_set(
         joinedload(WorkoutExercise.sets)
     ).filter(WorkoutExercise.id == db_set.workout_exercise_id).first()
     workout = db.query(Workout).filter(Workout.id == we.workout_id).first()
-    check_and_update_prs(db, workout.user_id, we)
+    on_sets_changed(db, workout.user_id, we)
     db.commit()
 
     return db_set
@@ -354,7 +573,11 @@ def delete_set(set_id: int, db: Session = Depends(get_db)):
     if not db_set:
         raise HTTPException(status_code=404, detail="Set not found")
 
+    we = db_set.workout_exercise
+    _reject_if_live(we.workout_id)
     db.delete(db_set)
+    refresh_workout_stats(db, we.workout, [we.exercise_id])
+    bump_data_version(db, we.workout.user_id)
     db.commit()
     return {"message": "Set deleted successfully"}
 
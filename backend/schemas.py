@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime, date
-from typing import Optional, List
+from typing import Optional, List, Literal
 
 
 # User schemas
@@ -15,11 +15,13 @@ class UserCreate(UserBase):
 class UserUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     weight_unit: Optional[str] = Field(None, pattern="^(kg|lb)$")
+    timezone: Optional[str] = Field(None, min_length=1, max_length=64)  # IANA name, e.g. "Europe/Berlin"
 
 
 class UserResponse(UserBase):
     id: int
     weight_unit: str = "kg"
+    timezone: str = "UTC"
     created_at: datetime
     last_active: datetime
     has_profile_picture: bool = False
@@ -163,6 +165,22 @@ class WorkoutSummary(BaseModel):
         from_attributes = True
 
 
+# Exercise history schemas
+class ExerciseSession(BaseModel):
+    exercise_id: int
+    workout_id: int
+    workout_exercise_id: int
+    workout_name: Optional[str] = None
+    started_at: datetime
+    sets: List[WorkoutSetResponse] = []
+
+
+class ExerciseHistoryPage(BaseModel):
+    exercise_id: int
+    sessions: List[ExerciseSession] = []
+    next_cursor: Optional[str] = None  # Pass back to fetch the next (older) page
+
+
 # Personal Record schemas
 class PersonalRecordResponse(BaseModel):
     id: int
@@ -282,8 +300,96 @@ class ProgressData(BaseModel):
     metric_type: str  # "weight", "volume", "reps"
 
 
+class ProgressBatchRequest(BaseModel):
+    exercise_ids: List[int] = Field(..., min_length=1, max_length=50)
+    metric_types: List[Literal["weight", "volume", "reps"]] = Field(["weight"], min_length=1, max_length=3)
+    days: int = Field(90, ge=7, le=366 * 100)
+    max_points: Optional[int] = Field(None, ge=3, le=5000)
+
+
+class ProgressSeries(ProgressData):
+    exercise_id: int
+
+
+class MeasurementSeries(BaseModel):
+    key: str  # key in BodyMetric.measurements, e.g. "waist"
+    dates: List[str]
+    values: List[float]
+
+
+class RelativeStrength(BaseModel):
+    exercise_name: str
+    basis: str  # "weight" (heaviest set) or "e1rm"
+    dates: List[str]
+    lifts: List[float]
+    # As-of the latest weigh-in on or before each date; None before the first one
+    body_weights: List[Optional[float]]
+    ratios: List[Optional[float]]
+    dots: List[Optional[float]]
+    wilks: List[Optional[float]]
+
+
+class MuscleGroupLoad(BaseModel):
+    muscle_group: str
+    acute: float  # last 7 days
+    chronic: float  # weekly average over the last 28 days
+    acwr: Optional[float]
+    zone: Optional[str]  # "low", "optimal", "elevated", "high"
+
+
+class TrainingLoadSeries(BaseModel):
+    muscle_group: str
+    metric: str  # "volume" or "sets"
+    dates: List[str]
+    acute: List[float]
+    chronic: List[float]
+    acwr: List[Optional[float]]
+
+
+class StrengthTrend(BaseModel):
+    exercise_id: int
+    exercise_name: str
+    points: int  # training days in the fit
+    current_e1rm: float  # trend value today
+    weekly_change: float
+    projected_e1rm: float  # trend value horizon_weeks from today
+    next_milestone: float  # next multiple of milestone_step above current_e1rm
+    weeks_to_milestone: Optional[float]  # None unless the trend is rising
+
+
+class ActivityHeatmap(BaseModel):
+    start_date: date
+    end_date: date
+    counts: List[int]  # workouts per day, one entry per day from start_date
+    volumes: List[float]  # weight x reps per day, aligned with counts
+
+
 class StreakInfo(BaseModel):
     current_streak: int
     longest_streak: int
     total_workouts: int
     last_workout_date: Optional[date] = None
+
+
+# Leaderboard schemas
+class LeaderboardRow(BaseModel):
+    rank: int  # ties share a rank, the next rank is skipped
+    user_id: int
+    user_name: str
+    value: float
+
+
+class Leaderboard(BaseModel):
+    board: str  # "e1rm", "weekly_volume", "streak"
+    exercise_id: Optional[int] = None
+    exercise_name: Optional[str] = None
+    period: Optional[str] = None  # week start for weekly boards
+    entries: List[LeaderboardRow]
+
+
+# Dashboard schemas
+class DashboardData(BaseModel):
+    weekly_summary: WeeklySummary
+    streak: StreakInfo
+    recent_workouts: List[WorkoutSummary]
+    templates: List[WorkoutTemplateResponse]
@@ -12,6 +12,9 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database import Base, get_db
 from main import app
 from utils.seed_exercises import seed_exercises
+from utils.analytics_cache import analytics_cache
+from utils.columnar import columnar_store
+from utils.duckdb_mirror import analytics_mirror
 
 
 # Create test database in memory
@@ -83,6 +86,11 @@ def client(db_session):
         db.commit()
     db.close()
 
+    # Versions restart with the database, so cached results must go too
+    analytics_cache.clear()
+    columnar_store.clear()
+    analytics_mirror.clear()
+
     with TestClient(app) as test_client:
         yield test_client
 
@@ -0,0 +1,122 @@
+import pytest
+import asyncio
+from fastapi import HTTPException
+
+from utils.admission import AdmissionGate, GATES
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def make_gate():
+    """Create gates for a test and drop them from the global registry afterwards."""
+    created = []
+
+    def make(name, **kwargs):
+        created.append(name)
+        return AdmissionGate(name, **kwargs)
+
+    yield make
+    for name in created:
+        GATES.pop(name, None)
+
+
+class TestAdmissionGate:
+    """Test concurrency limits and queueing for expensive endpoints."""
+
+    # Positive test cases
+    def test_waiters_are_admitted_in_order(self, make_gate):
+        """Test a released slot goes to the oldest queued request."""
+        gate = make_gate("test-order", max_concurrent=1, max_queue=4, queue_timeout=5)
+        order = []
+
+        async def request(name):
+            await gate.acquire()
+            order.append(name)
+            await asyncio.sleep(0.01)
+            gate.release()
+
+        async def main():
+            await asyncio.gather(*(request(name) for name in ["a", "b", "c"]))
+
+        _run(main())
+        stats = gate.stats()
+        assert order == ["a", "b", "c"]
+        assert stats["active"] == 0
+        assert stats["admitted"] == 3
+        assert stats["peak_queue_depth"] == 2
+
+    def test_gated_endpoint_releases_slot(self, client, sample_user):
+        """Test a gated endpoint frees its slot once the request is done."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        before = client.get("/api/analytics/admission-stats").json()["exercise-progress"]["admitted"]
+        response = client.get(
+            f"/api/analytics/exercise-progress?user_id={sample_user['id']}&exercise_id={exercise_id}"
+        )
+        assert response.status_code == 200
+
+        stats = client.get("/api/analytics/admission-stats").json()["exercise-progress"]
+        assert stats["admitted"] == before + 1
+        assert stats["active"] == 0
+        assert stats["queue_depth"] == 0
+
+    # Negative test cases
+    def test_full_queue_rejects_with_429(self, make_gate):
+        """Test requests beyond the queue bound are refused immediately."""
+        gate = make_gate("test-full", max_concurrent=1, max_queue=1, queue_timeout=5)
+
+        async def main():
+            await gate.acquire()
+            queued = asyncio.ensure_future(gate.acquire())
+            await asyncio.sleep(0)
+            with pytest.raises(HTTPException) as exc:
+                await gate.acquire()
+            gate.release()
+            await queued
+            gate.release()
+            return exc.value
+
+        error = _run(main())
+        assert error.status_code == 429
+        assert "Retry-After" in error.headers
+        assert gate.stats()["rejected"] == 1
+        assert gate.stats()["active"] == 0
+
+    def test_queue_timeout_returns_503(self, make_gate):
+        """Test a request that waits too long is turned away."""
+        gate = make_gate("test-timeout", max_concurrent=1, max_queue=4, queue_timeout=0.05)
+
+        async def main():
+            await gate.acquire()
+            with pytest.raises(HTTPException) as exc:
+                await gate.acquire()
+            gate.release()
+            return exc.value
+
+        error = _run(main())
+        assert error.status_code == 503
+        assert "Retry-After" in error.headers
+        stats = gate.stats()
+        assert stats["timed_out"] == 1
+        assert stats["queue_depth"] == 0
+        assert stats["active"] == 0
+
+    def test_cancelled_waiter_leaves_the_queue(self, make_gate):
+        """Test a queued request that is cancelled neither stays queued nor takes a slot."""
+        gate = make_gate("test-cancel", max_concurrent=1, max_queue=4, queue_timeout=5)
+
+        async def main():
+            await gate.acquire()
+            queued = asyncio.ensure_future(gate.acquire())
+            await asyncio.sleep(0)
+            queued.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+            assert gate.stats()["queue_depth"] == 0
+            gate.release()
+
+        _run(main())
+        assert gate.stats()["active"] == 0
+
@@ -206,6 +206,7 @@ class TestAnalyticsAPI:
         muscle_groups = data["muscle_groups"]
         # Should have sets counted for each muscle group
         assert len(muscle_groups) > 0
+        assert muscle_groups == {mg: 2 for mg in exercise["muscle_groups"]}
 
     def test_get_workout_frequency_no_workouts(self, client, sample_user):
         """Test workout frequency with no workouts."""
@@ -248,6 +249,472 @@ class TestAnalyticsAPI:
         data = response.json()
         assert data["period_days"] == 60
 
+    def test_weekly_summary_muscle_groups(self, client, sample_user):
+        """Test weekly summary counts sets per muscle group."""
+        exercise = client.get("/api/exercises/").json()[0]  # Bench Press: chest, triceps
+        client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "exercises": [
+                    {
+                        "exercise_id": exercise["id"],
+                        "order": 1,
+                        "sets": [
+                            {"set_number": 1, "reps": 10, "weight": 50},
+                            {"set_number": 2, "reps": 10, "weight": 50}
+                        ]
+                    }
+                ]
+            }
+        )
+
+        data = client.get(f"/api/analytics/weekly-summary?user_id={sample_user['id']}").json()
+        assert data["muscle_groups_worked"] == {mg: 2 for mg in exercise["muscle_groups"]}
+        assert data["total_volume"] == 1000
+
+    def test_weekly_summary_series(self, client, sample_user):
+        """Test the series returns consecutive weeks oldest first."""
+        client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={"started_at": datetime.now(timezone.utc).isoformat(), "exercises": []}
+        )
+
+        response = client.get(
+            f"/api/analytics/weekly-summary/series?user_id={sample_user['id']}&weeks=4"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 4
+        week_starts = [date.fromisoformat(w["week_start"]) for w in data]
+        assert all(b - a == timedelta(days=7) for a, b in zip(week_starts, week_starts[1:]))
+        assert [w["total_workouts"] for w in data] == [0, 0, 0, 1]
+
+        single = client.get(f"/api/analytics/weekly-summary?user_id={sample_user['id']}").json()
+        assert data[-1] == single
+
+    def test_exercise_progress_follows_set_changes(self, client, sample_user):
+        """Test progress is updated when sets are edited or deleted."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        workout = client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "exercises": [
+                    {
+                        "exercise_id": exercise_id,
+                        "order": 1,
+                        "sets": [
+                            {"set_number": 1, "reps": 5, "weight": 100},
+                            {"set_number": 2, "reps": 5, "weight": 110}
+                        ]
+                    }
+                ]
+            }
+        ).json()
+        url = f"/api/analytics/exercise-progress?user_id={sample_user['id']}&exercise_id={exercise_id}"
+        sets = sorted(workout["exercises"][0]["sets"], key=lambda s: s["set_number"])
+
+        assert client.get(url).json()["values"] == [110]
+
+        client.put(f"/api/workouts/sets/{sets[1]['id']}", json={"weight": 120})
+        assert client.get(url).json()["values"] == [120]
+        assert client.get(url + "&metric_type=volume").json()["values"] == [1100]
+
+        client.delete(f"/api/workouts/sets/{sets[1]['id']}")
+        assert client.get(url).json()["values"] == [100]
+
+        client.delete(f"/api/workouts/{workout['id']}")
+        assert client.get(url).json()["dates"] == []
+
+    def test_exercise_progress_uses_workout_date(self, client, sample_user):
+        """Test back-dated workouts are plotted on the day they happened."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        started_at = datetime.now(timezone.utc) - timedelta(days=10)
+        client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "started_at": started_at.isoformat(),
+                "exercises": [
+                    {"exercise_id": exercise_id, "order": 1, "sets": [{"set_number": 1, "reps": 5, "weight": 100}]}
+                ]
+            }
+        )
+
+        data = client.get(
+            f"/api/analytics/exercise-progress?user_id={sample_user['id']}&exercise_id={exercise_id}"
+        ).json()
+        assert data["dates"] == [started_at.date().isoformat()]
+
+    def test_workouts_bucketed_by_user_local_date(self, client, sample_user):
+        """Test late-evening workouts land on the user's calendar day."""
+        client.put(f"/api/users/{sample_user['id']}", json={"timezone": "America/New_York"})
+        started_at = (datetime.now(timezone.utc) - timedelta(days=3)).replace(hour=2, minute=0)
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "started_at": started_at.isoformat(),
+                "exercises": [
+                    {"exercise_id": exercise_id, "order": 1, "sets": [{"set_number": 1, "reps": 5, "weight": 100}]}
+                ]
+            }
+        )
+        local_day = (started_at.date() - timedelta(days=1)).isoformat()
+
+        frequency = client.get(f"/api/analytics/workout-frequency?user_id={sample_user['id']}").json()
+        assert frequency["dates"] == {local_day: 1}
+        progress = client.get(
+            f"/api/analytics/exercise-progress?user_id={sample_user['id']}&exercise_id={exercise_id}"
+        ).json()
+        assert progress["dates"] == [local_day]
+
+        # Switching timezone re-buckets existing workouts
+        client.put(f"/api/users/{sample_user['id']}", json={"timezone": "UTC"})
+        frequency = client.get(f"/api/analytics/workout-frequency?user_id={sample_user['id']}").json()
+        assert frequency["dates"] == {started_at.date().isoformat(): 1}
+        progress = client.get(
+            f"/api/analytics/exercise-progress?user_id={sample_user['id']}&exercise_id={exercise_id}"
+        ).json()
+        assert progress["dates"] == [started_at.date().isoformat()]
+
+    def test_activity_heatmap_dense_arrays(self, client, sample_user):
+        """Test the heatmap returns one count and volume per day of the range."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        now = datetime.now(timezone.utc).replace(hour=12)
+        for days_ago, weight in [(0, 100), (0, 50), (3, 80)]:
+            client.post(
+                f"/api/workouts/?user_id={sample_user['id']}",
+                json={
+                    "started_at": (now - timedelta(days=days_ago)).isoformat(),
+                    "exercises": [
+                        {
+                            "exercise_id": exercise_id,
+                            "order": 1,
+                            "sets": [
+                                {"set_number": 1, "reps": 5, "weight": weight},
+                                {"set_number": 2, "reps": 5, "weight": weight}
+                            ]
+                        }
+                    ]
+                }
+            )
+
+        start = (now - timedelta(days=4)).date()
+        response = client.get(
+            f"/api/analytics/heatmap?user_id={sample_user['id']}&start={start.isoformat()}&end={now.date().isoformat()}"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["start_date"] == start.isoformat()
+        assert data["counts"] == [0, 1, 0, 0, 2]
+        assert data["volumes"] == [0, 800, 0, 0, 1500]
+
+    def test_activity_heatmap_multi_year(self, client, sample_user):
+        """Test a five-year range is returned in full."""
+        end = date.today()
+        start = end - timedelta(days=5 * 365)
+        response = client.get(
+            f"/api/analytics/heatmap?user_id={sample_user['id']}&start={start.isoformat()}&end={end.isoformat()}"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["counts"]) == 5 * 365 + 1
+        assert sum(data["counts"]) == 0
+
+    def test_activity_heatmap_defaults_to_last_year(self, client, sample_user):
+        """Test the heatmap defaults to the year ending today."""
+        data = client.get(f"/api/analytics/heatmap?user_id={sample_user['id']}").json()
+        assert len(data["counts"]) == 365
+        assert len(data["volumes"]) == 365
+
+    def test_exercise_progress_batch_matches_single(self, client, sample_user):
+        """Test the batch endpoint returns the same series as single calls."""
+        exercises = client.get("/api/exercises/").json()
+        for days_ago in [1, 5]:
+            client.post(
+                f"/api/workouts/?user_id={sample_user['id']}",
+                json={
+                    "started_at": (datetime.now(timezone.utc) - timedelta(days=days_ago)).isoformat(),
+                    "exercises": [
+                        {"exercise_id": exercises[0]["id"], "order": 1, "sets": [{"set_number": 1, "reps": 5, "weight": 100 + days_ago}]},
+                        {"exercise_id": exercises[1]["id"], "order": 2, "sets": [{"set_number": 1, "reps": 8, "weight": 60}]}
+                    ]
+                }
+            )
+        exercise_ids = [exercises[1]["id"], exercises[0]["id"], exercises[2]["id"]]
+        metric_types = ["volume", "weight"]
+
+        response = client.post(
+            f"/api/analytics/exercise-progress/batch?user_id={sample_user['id']}",
+            json={"exercise_ids": exercise_ids, "metric_types": metric_types, "days": 30}
+        )
+        assert response.status_code == 200
+        series = response.json()
+        assert [(s["exercise_id"], s["metric_type"]) for s in series] == [
+            (e, m) for e in exercise_ids for m in metric_types
+        ]
+        for s in series:
+            single = client.get(
+                f"/api/analytics/exercise-progress?user_id={sample_user['id']}"
+                f"&exercise_id={s['exercise_id']}&metric_type={s['metric_type']}&days=30"
+            ).json()
+            assert {k: s[k] for k in single} == single
+        assert series[-1]["dates"] == []
+
+    def test_exercise_progress_batch_unknown_exercise(self, client, sample_user):
+        """Test unknown exercises come back as empty series."""
+        response = client.post(
+            f"/api/analytics/exercise-progress/batch?user_id={sample_user['id']}",
+            json={"exercise_ids": [99999]}
+        )
+        assert response.status_code == 200
+        assert response.json() == [{
+            "exercise_id": 99999, "dates": [], "values": [],
+            "exercise_name": "Unknown", "metric_type": "weight"
+        }]
+
+    def test_body_weight_progress_downsampled(self, client, sample_user):
+        """Test a multi-year series is reduced to max_points keeping its endpoints and peak."""
+        today = date.today()
+        for i in range(0, 3 * 365, 7):
+            day = today - timedelta(days=i)
+            client.post(
+                f"/api/body-metrics/?user_id={sample_user['id']}",
+                json={"date": day.isoformat(), "weight": 90.0 if i == 700 else 75.0}
+            )
+
+        full = client.get(
+            f"/api/analytics/body-weight-progress?user_id={sample_user['id']}&days={4 * 365}"
+        ).json()
+        response = client.get(
+            f"/api/analytics/body-weight-progress?user_id={sample_user['id']}&days={4 * 365}&max_points=20"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert len(full["dates"]) == 157
+        assert len(data["dates"]) == 20
+        assert data["dates"][0] == full["dates"][0]
+        assert data["dates"][-1] == full["dates"][-1]
+        assert (today - timedelta(days=700)).isoformat() in data["dates"]
+        assert max(data["weights"]) == 90.0
+
+    def test_exercise_progress_max_points_above_length(self, client, sample_user):
+        """Test short series are returned unchanged."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "exercises": [{"exercise_id": exercise_id, "order": 1, "sets": [{"set_number": 1, "reps": 5, "weight": 100}]}]
+            }
+        )
+        url = f"/api/analytics/exercise-progress?user_id={sample_user['id']}&exercise_id={exercise_id}&days=3650"
+        assert client.get(url + "&max_points=100").json() == client.get(url).json()
+
+    def test_relative_strength_asof_body_weight(self, client, sample_user):
+        """Test each lift day uses the latest weigh-in on or before it."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        now = datetime.now(timezone.utc)
+        for days_ago, weight in [(20, 100), (10, 110), (2, 120)]:
+            client.post(
+                f"/api/workouts/?user_id={sample_user['id']}",
+                json={
+                    "started_at": (now - timedelta(days=days_ago)).isoformat(),
+                    "exercises": [{"exercise_id": exercise_id, "order": 1, "sets": [{"set_number": 1, "reps": 5, "weight": weight}]}]
+                }
+            )
+        for days_ago, body_weight in [(15, 80.0), (5, 100.0)]:
+            client.post(
+                f"/api/body-metrics/?user_id={sample_user['id']}",
+                json={"date": (now - timedelta(days=days_ago)).date().isoformat(), "weight": body_weight}
+            )
+
+        response = client.get(
+            f"/api/analytics/relative-strength?user_id={sample_user['id']}&exercise_id={exercise_id}&days=30"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["lifts"] == [100, 110, 120]
+        assert data["body_weights"] == [None, 80.0, 100.0]
+        assert data["ratios"] == [None, 1.38, 1.2]
+        assert data["dots"][0] is None
+        assert data["dots"][2] == 73.86
+        assert data["wilks"][2] == 73.03
+
+    def test_relative_strength_weigh_in_before_range(self, client, sample_user):
+        """Test a weigh-in older than the range still applies to the first lifts."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        now = datetime.now(timezone.utc)
+        client.post(
+            f"/api/body-metrics/?user_id={sample_user['id']}",
+            json={"date": (now - timedelta(days=100)).date().isoformat(), "weight": 90.0}
+        )
+        client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "started_at": now.isoformat(),
+                "exercises": [{"exercise_id": exercise_id, "order": 1, "sets": [{"set_number": 1, "reps": 1, "weight": 180}]}]
+            }
+        )
+        data = client.get(
+            f"/api/analytics/relative-strength?user_id={sample_user['id']}&exercise_id={exercise_id}&days=30"
+        ).json()
+        assert data["body_weights"] == [90.0]
+        assert data["ratios"] == [2.0]
+
+    def _log_bench(self, client, sample_user, exercise_id, days_ago, weight):
+        client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "started_at": (datetime.now(timezone.utc) - timedelta(days=days_ago)).isoformat(),
+                "exercises": [{"exercise_id": exercise_id, "order": 1, "sets": [
+                    {"set_number": 1, "reps": 10, "weight": weight},
+                    {"set_number": 2, "reps": 10, "weight": weight}
+                ]}]
+            }
+        )
+
+    def test_training_load_acwr(self, client, sample_user):
+        """Test a heavy week against a lighter month raises the ratio."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]  # chest, triceps
+        for days_ago in [8, 15, 22]:
+            self._log_bench(client, sample_user, exercise_id, days_ago, 50)
+        self._log_bench(client, sample_user, exercise_id, 1, 150)
+
+        response = client.get(f"/api/analytics/training-load?user_id={sample_user['id']}")
+        assert response.status_code == 200
+        loads = response.json()
+        assert [l["muscle_group"] for l in loads] == ["chest", "triceps"]
+        # Acute 3000; chronic (3 * 1000 + 3000) / 4 weeks
+        assert loads[0] == {
+            "muscle_group": "chest", "acute": 3000, "chronic": 1500, "acwr": 2.0, "zone": "high"
+        }
+
+        sets = client.get(f"/api/analytics/training-load?user_id={sample_user['id']}&metric=sets").json()
+        assert sets[0]["acute"] == 2
+        assert sets[0]["acwr"] == 1.0
+
+    def test_training_load_series(self, client, sample_user):
+        """Test the daily series ends today and matches the current ratio."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        for days_ago in [3, 10, 40]:
+            self._log_bench(client, sample_user, exercise_id, days_ago, 50)
+
+        response = client.get(
+            f"/api/analytics/training-load/series?user_id={sample_user['id']}&muscle_group=chest&days=30"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["dates"]) == 30
+        assert data["dates"][-1] == date.today().isoformat()
+        current = client.get(f"/api/analytics/training-load?user_id={sample_user['id']}").json()[0]
+        assert (data["acute"][-1], data["chronic"][-1], data["acwr"][-1]) == (
+            current["acute"], current["chronic"], current["acwr"]
+        )
+        # The workout 40 days ago still counts towards the chronic load 30 days ago
+        assert data["chronic"][0] == 250
+
+    def test_training_load_no_workouts(self, client, sample_user):
+        """Test users without workouts have no muscle loads."""
+        response = client.get(f"/api/analytics/training-load?user_id={sample_user['id']}")
+        assert response.status_code == 200
+        assert response.json() == []
+
+    def test_strength_forecast_linear_progress(self, client, sample_user):
+        """Test a steady weekly gain is projected to the next milestone."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        for week in range(6):
+            client.post(
+                f"/api/workouts/?user_id={sample_user['id']}",
+                json={
+                    "started_at": (datetime.now(timezone.utc) - timedelta(weeks=5 - week)).isoformat(),
+                    "exercises": [{"exercise_id": exercise_id, "order": 1, "sets": [
+                        {"set_number": 1, "reps": 1, "weight": 80 + 2 * week}
+                    ]}]
+                }
+            )
+
+        response = client.get(f"/api/analytics/strength-forecast?user_id={sample_user['id']}&horizon_weeks=4")
+        assert response.status_code == 200
+        assert response.json() == [{
+            "exercise_id": exercise_id, "exercise_name": "Bench Press",
+            "points": 6, "current_e1rm": 90.0, "weekly_change": 2.0, "projected_e1rm": 98.0,
+            "next_milestone": 100.0, "weeks_to_milestone": 5.0
+        }]
+
+    def test_strength_forecast_refreshes_on_new_sets(self, client, sample_user):
+        """Test cached forecasts are recomputed once new sets arrive."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        url = f"/api/analytics/strength-forecast?user_id={sample_user['id']}"
+        for days_ago, weight in [(14, 100), (7, 100)]:
+            client.post(
+                f"/api/workouts/?user_id={sample_user['id']}",
+                json={
+                    "started_at": (datetime.now(timezone.utc) - timedelta(days=days_ago)).isoformat(),
+                    "exercises": [{"exercise_id": exercise_id, "order": 1, "sets": [{"set_number": 1, "reps": 1, "weight": weight}]}]
+                }
+            )
+        assert client.get(url).json() == []
+
+        client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "exercises": [{"exercise_id": exercise_id, "order": 1, "sets": [{"set_number": 1, "reps": 1, "weight": 100}]}]
+            }
+        )
+        trends = client.get(url).json()
+        assert len(trends) == 1
+        assert trends[0]["weekly_change"] == 0
+        assert trends[0]["weeks_to_milestone"] is None
+
+    def _log_measurements(self, client, sample_user, days_ago, measurements):
+        client.post(
+            f"/api/body-metrics/?user_id={sample_user['id']}",
+            json={"date": (date.today() - timedelta(days=days_ago)).isoformat(), "measurements": measurements}
+        )
+
+    def test_measurement_progress(self, client, sample_user):
+        """Test one measurement is extracted from the JSON, oldest first."""
+        self._log_measurements(client, sample_user, 20, {"waist": 84, "chest": 100})
+        self._log_measurements(client, sample_user, 10, {"chest": 101})
+        self._log_measurements(client, sample_user, 1, {"waist": 82.5, "notes": "after holiday"})
+
+        response = client.get(f"/api/analytics/measurement-progress?user_id={sample_user['id']}&key=waist")
+        assert response.status_code == 200
+        assert response.json() == {
+            "key": "waist",
+            "dates": [(date.today() - timedelta(days=d)).isoformat() for d in [20, 1]],
+            "values": [84, 82.5]
+        }
+
+    def test_measurement_progress_batch(self, client, sample_user):
+        """Test several measurements come back in request order, unknown keys empty."""
+        self._log_measurements(client, sample_user, 20, {"waist": 84, "chest": 100})
+        self._log_measurements(client, sample_user, 10, {"chest": 101, "arms": "n/a"})
+
+        response = client.get(
+            f"/api/analytics/measurement-progress/batch?user_id={sample_user['id']}"
+            "&keys=chest&keys=waist&keys=arms"
+        )
+        assert response.status_code == 200
+        assert [(s["key"], s["values"]) for s in response.json()] == [
+            ("chest", [100, 101]), ("waist", [84]), ("arms", [])
+        ]
+
+    def test_measurement_progress_downsampled(self, client, sample_user):
+        """Test long measurement histories are reduced to max_points."""
+        for days_ago in range(0, 400, 10):
+            self._log_measurements(client, sample_user, days_ago, {"waist": 90 - days_ago / 100})
+
+        data = client.get(
+            f"/api/analytics/measurement-progress?user_id={sample_user['id']}&key=waist&days=730&max_points=10"
+        ).json()
+        assert len(data["dates"]) == 10
+        assert data["dates"][-1] == date.today().isoformat()
+        assert data["values"][0] == 86.1
+
     # Negative test cases
     def test_weekly_summary_invalid_week_offset(self, client, sample_user):
         """Test weekly summary with negative week offset."""
@@ -279,7 +746,7 @@ class TestAnalyticsAPI:
 
         # Days too large
         response = client.get(
-            f"/api/analytics/exercise-progress?user_id={sample_user['id']}&exercise_id={exercise_id}&days=500"
+            f"/api/analytics/exercise-progress?user_id={sample_user['id']}&exercise_id={exercise_id}&days=40000"
         )
         assert response.status_code == 422
 
@@ -320,3 +787,84 @@ class TestAnalyticsAPI:
         data = response.json()
         assert data["exercise_name"] == "Unknown"
         assert data["dates"] == []
+
+    def test_weekly_summary_series_invalid_weeks(self, client, sample_user):
+        """Test the series rejects a zero week count."""
+        response = client.get(
+            f"/api/analytics/weekly-summary/series?user_id={sample_user['id']}&weeks=0"
+        )
+        assert response.status_code == 422
+
+    def test_activity_heatmap_start_after_end(self, client, sample_user):
+        """Test an inverted range is rejected."""
+        response = client.get(
+            f"/api/analytics/heatmap?user_id={sample_user['id']}&start=2024-02-01&end=2024-01-01"
+        )
+        assert response.status_code == 400
+
+    def test_activity_heatmap_range_too_long(self, client, sample_user):
+        """Test ranges beyond the limit are rejected."""
+        response = client.get(
+            f"/api/analytics/heatmap?user_id={sample_user['id']}&start=1990-01-01&end=2024-01-01"
+        )
+        assert response.status_code == 400
+
+    def test_exercise_progress_batch_invalid_metric(self, client, sample_user):
+        """Test unknown metrics are rejected."""
+        response = client.post(
+            f"/api/analytics/exercise-progress/batch?user_id={sample_user['id']}",
+            json={"exercise_ids": [1], "metric_types": ["speed"]}
+        )
+        assert response.status_code == 422
+
+    def test_exercise_progress_batch_empty(self, client, sample_user):
+        """Test at least one exercise is required."""
+        response = client.post(
+            f"/api/analytics/exercise-progress/batch?user_id={sample_user['id']}",
+            json={"exercise_ids": []}
+        )
+        assert response.status_code == 422
+
+    def test_progress_max_points_too_small(self, client, sample_user):
+        """Test max_points below three is rejected."""
+        response = client.get(
+            f"/api/analytics/body-weight-progress?user_id={sample_user['id']}&max_points=2"
+        )
+        assert response.status_code == 422
+
+    def test_relative_strength_nonexistent_exercise(self, client, sample_user):
+        """Test relative strength for an unknown exercise."""
+        response = client.get(
+            f"/api/analytics/relative-strength?user_id={sample_user['id']}&exercise_id=99999"
+        )
+        assert response.status_code == 404
+
+    def test_relative_strength_invalid_sex(self, client, sample_user):
+        """Test only male and female coefficient tables are accepted."""
+        response = client.get(
+            f"/api/analytics/relative-strength?user_id={sample_user['id']}&exercise_id=1&sex=other"
+        )
+        assert response.status_code == 422
+
+    def test_training_load_invalid_metric(self, client, sample_user):
+        """Test unknown load metrics are rejected."""
+        response = client.get(f"/api/analytics/training-load?user_id={sample_user['id']}&metric=reps")
+        assert response.status_code == 422
+
+    def test_strength_forecast_invalid_horizon(self, client, sample_user):
+        """Test the projection horizon is bounded."""
+        response = client.get(
+            f"/api/analytics/strength-forecast?user_id={sample_user['id']}&horizon_weeks=0"
+        )
+        assert response.status_code == 422
+
+    def test_measurement_progress_invalid_key(self, client, sample_user):
+        """Test measurement keys are restricted to simple names."""
+        response = client.get(
+            f"/api/analytics/measurement-progress?user_id={sample_user['id']}&key=$.waist"
+        )
+        assert response.status_code == 422
+        response = client.get(
+            f"/api/analytics/measurement-progress/batch?user_id={sample_user['id']}&keys=waist&keys=$.chest"
+        )
+        assert response.status_code == 422
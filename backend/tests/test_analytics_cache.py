@@ -0,0 +1,210 @@
+import pytest
+import threading
+import time
+from datetime import datetime, timezone, timedelta, date
+
+import utils.analytics_cache as cache_module
+from models.database import AnalyticsCacheEntry
+from utils.analytics_cache import AnalyticsCache, analytics_cache
+
+
+class TestAnalyticsCache:
+    """Test caching of analytics results and invalidation on writes."""
+
+    def _log_set(self, client, user_id, weight):
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        return client.post(
+            f"/api/workouts/?user_id={user_id}",
+            json={
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "exercises": [
+                    {"exercise_id": exercise_id, "order": 1, "sets": [{"set_number": 1, "reps": 5, "weight": weight}]}
+                ]
+            }
+        ).json()
+
+    def _stats(self, client):
+        return client.get("/api/analytics/cache-stats").json()
+
+    # Positive test cases
+    def test_repeat_request_is_a_hit(self, client, sample_user):
+        """Test the same request is served from the cache."""
+        url = f"/api/analytics/weekly-summary?user_id={sample_user['id']}"
+        first = client.get(url).json()
+        second = client.get(url).json()
+
+        assert second == first
+        stats = self._stats(client)
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    def test_params_are_part_of_the_key(self, client, sample_user):
+        """Test different query parameters are cached separately."""
+        client.get(f"/api/analytics/workout-frequency?user_id={sample_user['id']}&days=30")
+        client.get(f"/api/analytics/workout-frequency?user_id={sample_user['id']}&days=60")
+        assert self._stats(client)["misses"] == 2
+
+    def test_workout_write_invalidates(self, client, sample_user):
+        """Test logging a workout bumps the version so stale results are not served."""
+        url = f"/api/analytics/weekly-summary?user_id={sample_user['id']}"
+        assert client.get(url).json()["total_workouts"] == 0
+
+        workout = self._log_set(client, sample_user["id"], 100)
+        assert client.get(url).json()["total_volume"] == 500
+
+        client.put(f"/api/workouts/sets/{workout['exercises'][0]['sets'][0]['id']}", json={"weight": 120})
+        assert client.get(url).json()["total_volume"] == 600
+
+        client.delete(f"/api/workouts/{workout['id']}")
+        assert client.get(url).json()["total_workouts"] == 0
+
+    def test_body_metric_write_invalidates(self, client, sample_user):
+        """Test body metric writes invalidate body weight progress."""
+        url = f"/api/analytics/body-weight-progress?user_id={sample_user['id']}"
+        assert client.get(url).json()["weights"] == []
+
+        client.post(
+            f"/api/body-metrics/?user_id={sample_user['id']}",
+            json={"date": date.today().isoformat(), "weight": 80}
+        )
+        assert client.get(url).json()["weights"] == [80]
+
+    def test_other_users_stay_cached(self, client, sample_user):
+        """Test one user's writes do not invalidate another user's results."""
+        other = client.post("/api/users/", json={"name": "Other"}).json()
+        url = f"/api/analytics/streak?user_id={other['id']}"
+        client.get(url)
+
+        self._log_set(client, sample_user["id"], 100)
+        client.get(url)
+        assert self._stats(client)["hits"] == 1
+
+    def test_shared_tier_serves_other_workers(self, client, sample_user, db_session, monkeypatch):
+        """Test results written to the shared table are reused after a local miss."""
+        monkeypatch.setattr(analytics_cache, "shared", True)
+        monkeypatch.setattr(cache_module, "SHARED_TIER", True)
+        url = f"/api/analytics/muscle-group-balance?user_id={sample_user['id']}"
+        first = client.get(url).json()
+
+        # A fresh worker has an empty LRU
+        analytics_cache._entries.clear()
+        assert client.get(url).json() == first
+        assert self._stats(client)["shared_hits"] == 1
+
+        # Writes drop the user's shared entries
+        self._log_set(client, sample_user["id"], 100)
+        db_session.expire_all()
+        assert db_session.query(AnalyticsCacheEntry).count() == 0
+
+    def test_shared_tier_prunes_expired_rows(self, client, sample_user, db_session):
+        """Test a shared write drops rows older than the TTL."""
+        cache = AnalyticsCache(max_entries=0, shared=True)
+        cache.put(db_session, "old", sample_user["id"], {"total": 1})
+        db_session.query(AnalyticsCacheEntry).update(
+            {"created_at": datetime.now(timezone.utc) - timedelta(days=2)}
+        )
+        db_session.commit()
+
+        cache._pruned_at = None
+        cache.put(db_session, "new", sample_user["id"], {"total": 2})
+        db_session.expire_all()
+        assert [e.key for e in db_session.query(AnalyticsCacheEntry)] == ["new"]
+
+    def test_lru_evicts_oldest_entry(self, db_session):
+        """Test the least recently used entry is evicted when full."""
+        cache = AnalyticsCache(max_entries=2, shared=False)
+        cache.put(db_session, "a", 1, 1)
+        cache.put(db_session, "b", 1, 2)
+        cache.get(db_session, "a")
+        cache.put(db_session, "c", 1, 3)
+
+        assert cache.get(db_session, "b") == (False, None)
+        assert cache.get(db_session, "a") == (True, 1)
+        assert cache.stats()["evictions"] == 1
+
+    def test_concurrent_misses_share_one_computation(self):
+        """Test identical concurrent calls wait on the first one's result."""
+        cache = AnalyticsCache(max_entries=0, shared=False)
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return {"total": 42}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.single_flight("k", compute)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        while cache.stats()["coalesced"] < 3:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{"total": 42}] * 4
+        assert cache.stats()["in_flight"] == 0
+
+    def test_sequential_calls_are_not_coalesced(self):
+        """Test a finished computation is not reused by single-flight alone."""
+        cache = AnalyticsCache(max_entries=0, shared=False)
+        assert cache.single_flight("k", lambda: 1) == 1
+        assert cache.single_flight("k", lambda: 2) == 2
+        assert cache.stats()["coalesced"] == 0
+
+    # Negative test cases
+    def test_waiters_receive_the_leaders_error(self):
+        """Test an error in the shared computation reaches every waiter."""
+        cache = AnalyticsCache(max_entries=0, shared=False)
+        release = threading.Event()
+        errors = []
+
+        def compute():
+            release.wait(5)
+            raise ValueError("boom")
+
+        def call():
+            try:
+                cache.single_flight("k", compute)
+            except ValueError as e:
+                errors.append(str(e))
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        while cache.stats()["coalesced"] < 2:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert errors == ["boom"] * 3
+        assert cache.stats()["in_flight"] == 0
+
+    def test_template_writes_keep_the_cache(self, client, sample_user):
+        """Test template writes, which no analytics read, do not invalidate cached results."""
+        url = f"/api/analytics/weekly-summary?user_id={sample_user['id']}"
+        client.get(url)
+
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        template = client.post(
+            f"/api/templates/?user_id={sample_user['id']}",
+            json={"name": "Push", "exercises": [{"exercise_id": exercise_id, "order": 1}]}
+        ).json()
+        client.put(f"/api/templates/{template['id']}", json={"name": "Push B", "exercises": []})
+        client.delete(f"/api/templates/{template['id']}")
+
+        client.get(url)
+        assert self._stats(client)["hits"] == 1
+
+    def test_disabled_cache_stores_nothing(self, db_session):
+        """Test a zero-size cache never stores results."""
+        cache = AnalyticsCache(max_entries=0, shared=False)
+        cache.put(db_session, "a", 1, 1)
+        assert cache.get(db_session, "a") == (False, None)
+        assert cache.stats()["size"] == 0
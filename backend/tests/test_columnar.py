@@ -0,0 +1,142 @@
+import pytest
+from datetime import datetime, timezone, timedelta
+
+import routers.analytics as analytics
+from utils.analytics_cache import analytics_cache
+from utils.columnar import ColumnarStore, UserColumns, columnar_store
+
+
+class TestColumnarAnalytics:
+    """Test the NumPy analytics backend against the SQL one."""
+
+    def _seed(self, client, user_id):
+        exercises = client.get("/api/exercises/").json()
+        now = datetime.now(timezone.utc).replace(hour=12)
+        for days_ago in [0, 1, 3, 9, 10, 40]:
+            workout = client.post(
+                f"/api/workouts/?user_id={user_id}",
+                json={
+                    "started_at": (now - timedelta(days=days_ago)).isoformat(),
+                    "exercises": [
+                        {
+                            "exercise_id": exercises[0]["id"],
+                            "order": 1,
+                            "sets": [
+                                {"set_number": 1, "reps": 10, "weight": 40, "is_warmup": True},
+                                {"set_number": 2, "reps": 5, "weight": 100 + days_ago},
+                                {"set_number": 3, "reps": 8, "weight": 90, "rpe": 8}
+                            ]
+                        },
+                        {"exercise_id": exercises[1]["id"], "order": 2, "sets": [{"set_number": 1, "reps": 12}]},
+                        {"exercise_id": exercises[2]["id"], "order": 3, "sets": []}
+                    ]
+                }
+            ).json()
+            client.put(f"/api/workouts/{workout['id']}", json={"duration_seconds": 3600 + days_ago})
+        # A workout with no exercises still counts towards frequency
+        client.post(
+            f"/api/workouts/?user_id={user_id}",
+            json={"started_at": (now - timedelta(days=2)).isoformat(), "exercises": []}
+        )
+        return exercises
+
+    def _urls(self, user_id, exercise_id):
+        urls = [
+            f"/api/analytics/weekly-summary?user_id={user_id}",
+            f"/api/analytics/weekly-summary/series?user_id={user_id}&weeks=8",
+            f"/api/analytics/muscle-group-balance?user_id={user_id}&days=60",
+            f"/api/analytics/workout-frequency?user_id={user_id}&days=60",
+        ]
+        urls += [
+            f"/api/analytics/exercise-progress?user_id={user_id}&exercise_id={exercise_id}&metric_type={metric}"
+            for metric in ["weight", "volume", "reps"]
+        ]
+        return urls
+
+    def _both(self, client, monkeypatch, url):
+        results = []
+        for columnar in [False, True]:
+            monkeypatch.setattr(analytics, "COLUMNAR_BACKEND", columnar)
+            analytics_cache.clear()
+            response = client.get(url)
+            assert response.status_code == 200
+            results.append(response.json())
+        return results
+
+    # Positive test cases
+    def test_columnar_matches_sql(self, client, sample_user, monkeypatch):
+        """Test every vectorized endpoint returns the SQL result."""
+        exercises = self._seed(client, sample_user["id"])
+        for url in self._urls(sample_user["id"], exercises[0]["id"]):
+            sql, columnar = self._both(client, monkeypatch, url)
+            assert columnar == sql, url
+
+    def test_writes_reload_only_dirty_days(self, client, sample_user, monkeypatch):
+        """Test set changes splice in the touched day instead of reloading everything."""
+        exercises = self._seed(client, sample_user["id"])
+        url = self._urls(sample_user["id"], exercises[0]["id"])[4]
+        self._both(client, monkeypatch, url)
+        assert columnar_store.stats()["full_loads"] == 1
+
+        workouts = client.get(f"/api/workouts/?user_id={sample_user['id']}").json()
+        workout = client.get(f"/api/workouts/{workouts[0]['id']}").json()
+        client.post(
+            f"/api/workouts/exercises/{workout['exercises'][0]['id']}/sets",
+            json={"set_number": 4, "reps": 3, "weight": 150}
+        )
+
+        sql, columnar = self._both(client, monkeypatch, url)
+        assert columnar == sql
+        assert max(columnar["values"]) == 150
+        stats = columnar_store.stats()
+        assert stats["full_loads"] == 1
+        assert stats["partial_loads"] == 1
+
+    def test_write_without_dirty_days_forces_full_reload(self, client, sample_user, monkeypatch):
+        """Test a duration edit is not lost when another day's set change is spliced in."""
+        exercises = self._seed(client, sample_user["id"])
+        url = self._urls(sample_user["id"], exercises[0]["id"])[1]
+        self._both(client, monkeypatch, url)
+
+        workouts = client.get(f"/api/workouts/?user_id={sample_user['id']}").json()
+        client.put(f"/api/workouts/{workouts[1]['id']}", json={"duration_seconds": 7200})
+        workout = client.get(f"/api/workouts/{workouts[0]['id']}").json()
+        client.post(
+            f"/api/workouts/exercises/{workout['exercises'][0]['id']}/sets",
+            json={"set_number": 4, "reps": 3, "weight": 150}
+        )
+
+        sql, columnar = self._both(client, monkeypatch, url)
+        assert columnar == sql
+        assert columnar_store.stats()["full_loads"] == 2
+
+    def test_deleted_workout_disappears(self, client, sample_user, monkeypatch):
+        """Test deleting a workout removes its rows from the arrays."""
+        exercises = self._seed(client, sample_user["id"])
+        url = f"/api/analytics/workout-frequency?user_id={sample_user['id']}&days=60"
+        self._both(client, monkeypatch, url)
+
+        workouts = client.get(f"/api/workouts/?user_id={sample_user['id']}").json()
+        client.delete(f"/api/workouts/{workouts[0]['id']}")
+        sql, columnar = self._both(client, monkeypatch, url)
+        assert columnar == sql
+
+    def test_cold_users_are_evicted(self, client, sample_user, db_session):
+        """Test the least recently used user is dropped past the memory bound."""
+        self._seed(client, sample_user["id"])
+        other = client.post("/api/users/", json={"name": "Other"}).json()
+        self._seed(client, other["id"])
+
+        store = ColumnarStore(max_bytes=1)
+        store.columns(db_session, sample_user["id"])
+        store.columns(db_session, other["id"])
+        stats = store.stats()
+        assert stats["users"] == 1
+        assert stats["evictions"] == 1
+
+    # Negative test cases
+    def test_user_without_data(self, client, sample_user, db_session):
+        """Test a user with no workouts gets empty arrays."""
+        columns = UserColumns.load(db_session, sample_user["id"])
+        assert len(columns.sets["day"]) == 0
+        assert len(columns.workouts["day"]) == 0
@@ -0,0 +1,71 @@
+import pytest
+from datetime import datetime, timezone, timedelta
+
+
+class TestDashboardAPI:
+    """Test the composite dashboard endpoint."""
+
+    # Positive test cases
+    def test_dashboard_matches_individual_endpoints(self, client, sample_user):
+        """Test each section equals the endpoint it replaces."""
+        user_id = sample_user["id"]
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        for days_ago in range(7):
+            client.post(
+                f"/api/workouts/?user_id={user_id}",
+                json={
+                    "name": f"Day {days_ago}",
+                    "started_at": (datetime.now(timezone.utc) - timedelta(days=days_ago)).isoformat(),
+                    "exercises": [
+                        {"exercise_id": exercise_id, "order": 1, "sets": [{"set_number": 1, "reps": 5, "weight": 100}]}
+                    ]
+                }
+            )
+        client.post(
+            f"/api/templates/?user_id={user_id}",
+            json={"name": "Push", "exercises": [{"exercise_id": exercise_id, "order": 1}]}
+        )
+
+        response = client.get(f"/api/dashboard?user_id={user_id}")
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["weekly_summary"] == client.get(f"/api/analytics/weekly-summary?user_id={user_id}").json()
+        assert data["streak"] == client.get(f"/api/analytics/streak?user_id={user_id}").json()
+        assert data["recent_workouts"] == client.get(f"/api/workouts/?user_id={user_id}&limit=5").json()
+        assert data["templates"] == client.get(f"/api/templates/?user_id={user_id}").json()
+        assert len(data["recent_workouts"]) == 5
+        assert data["recent_workouts"][0]["total_volume"] == 500
+
+    def test_dashboard_server_timing_header(self, client, sample_user):
+        """Test per-section timings are reported in Server-Timing when asked for."""
+        response = client.get(f"/api/dashboard?user_id={sample_user['id']}&timing=true")
+        sections = [part.split(";")[0] for part in response.headers["Server-Timing"].split(", ")]
+        assert sections == ["weekly_summary", "streak", "recent_workouts", "templates"]
+
+        response = client.get(f"/api/dashboard?user_id={sample_user['id']}")
+        assert "Server-Timing" not in response.headers
+
+    def test_dashboard_shares_analytics_cache(self, client, sample_user):
+        """Test the dashboard reuses results the analytics endpoints cached."""
+        user_id = sample_user["id"]
+        client.get(f"/api/analytics/weekly-summary?user_id={user_id}")
+        client.get(f"/api/analytics/streak?user_id={user_id}")
+        hits = client.get("/api/analytics/cache-stats").json()["hits"]
+
+        client.get(f"/api/dashboard?user_id={user_id}")
+        assert client.get("/api/analytics/cache-stats").json()["hits"] == hits + 2
+
+    def test_dashboard_new_user(self, client, sample_user):
+        """Test a user without data gets empty sections."""
+        data = client.get(f"/api/dashboard?user_id={sample_user['id']}").json()
+        assert data["weekly_summary"]["total_workouts"] == 0
+        assert data["streak"]["current_streak"] == 0
+        assert data["recent_workouts"] == []
+        assert data["templates"] == []
+
+    # Negative test cases
+    def test_dashboard_missing_user_id(self, client):
+        """Test user_id is required."""
+        response = client.get("/api/dashboard")
+        assert response.status_code == 422
@@ -0,0 +1,46 @@
+import math
+
+from utils.downsample import lttb, downsample_series
+
+
+class TestDownsample:
+    """Test cases for LTTB downsampling"""
+
+    # Positive test cases
+    def test_keeps_first_and_last(self):
+        """Test the endpoints always survive."""
+        xs = list(range(1000))
+        ys = [math.sin(x / 20) for x in xs]
+        kept = lttb(xs, ys, 50)
+        assert len(kept) == 50
+        assert kept[0] == 0
+        assert kept[-1] == 999
+        assert kept == sorted(set(kept))
+
+    def test_keeps_spike(self):
+        """Test an isolated outlier is selected."""
+        xs = list(range(500))
+        ys = [0.0] * 500
+        ys[321] = 10.0
+        assert 321 in lttb(xs, ys, 10)
+
+    def test_short_series_unchanged(self):
+        """Test a series at or below max_points is returned whole."""
+        dates = ["2024-01-01", "2024-01-02", "2024-01-03"]
+        assert downsample_series(dates, [1, 2, 3], 3) == (dates, [1, 2, 3])
+        assert downsample_series(dates, [1, 2, 3], None) == (dates, [1, 2, 3])
+
+    def test_downsample_series_dates(self):
+        """Test ISO dates are used as the x axis."""
+        dates = [f"2024-01-{d:02d}" for d in range(1, 32)]
+        values = [1.0] * 31
+        values[14] = 5.0
+        kept_dates, kept_values = downsample_series(dates, values, 5)
+        assert len(kept_dates) == 5
+        assert "2024-01-15" in kept_dates
+        assert kept_values[kept_dates.index("2024-01-15")] == 5.0
+
+    # Negative test cases
+    def test_max_points_below_three(self):
+        """Test too few points to bucket returns every index."""
+        assert lttb([0, 1, 2, 3], [0, 1, 2, 3], 2) == [0, 1, 2, 3]
@@ -0,0 +1,152 @@
+import pytest
+import threading
+from datetime import datetime, timezone, timedelta
+
+import routers.analytics as analytics
+from utils.analytics_cache import analytics_cache
+from utils.duckdb_mirror import analytics_mirror
+
+pytest.importorskip("duckdb")
+
+
+class TestDuckDBMirror:
+    """Test the DuckDB analytics backend against the SQL one."""
+
+    def _seed(self, client, user_id):
+        exercises = client.get("/api/exercises/").json()
+        now = datetime.now(timezone.utc).replace(hour=12)
+        for days_ago in [0, 1, 3, 9, 10, 40]:
+            workout = client.post(
+                f"/api/workouts/?user_id={user_id}",
+                json={
+                    "started_at": (now - timedelta(days=days_ago)).isoformat(),
+                    "exercises": [
+                        {
+                            "exercise_id": exercises[0]["id"],
+                            "order": 1,
+                            "sets": [
+                                {"set_number": 1, "reps": 10, "weight": 40, "is_warmup": True},
+                                {"set_number": 2, "reps": 5, "weight": 100 + days_ago}
+                            ]
+                        },
+                        {"exercise_id": exercises[1]["id"], "order": 2, "sets": [{"set_number": 1, "reps": 12}]},
+                        {"exercise_id": exercises[2]["id"], "order": 3, "sets": []}
+                    ]
+                }
+            ).json()
+            client.put(f"/api/workouts/{workout['id']}", json={"duration_seconds": 3600 + days_ago})
+        client.post(
+            f"/api/workouts/?user_id={user_id}",
+            json={"started_at": (now - timedelta(days=2)).isoformat(), "exercises": []}
+        )
+        return exercises
+
+    def _urls(self, user_id):
+        return [
+            f"/api/analytics/weekly-summary?user_id={user_id}",
+            f"/api/analytics/weekly-summary/series?user_id={user_id}&weeks=8",
+            f"/api/analytics/muscle-group-balance?user_id={user_id}&days=60",
+        ]
+
+    def _both(self, client, monkeypatch, url):
+        results = []
+        for mirrored in [False, True]:
+            monkeypatch.setattr(analytics, "DUCKDB_BACKEND", mirrored)
+            analytics_cache.clear()
+            response = client.get(url)
+            assert response.status_code == 200
+            results.append(response.json())
+        return results
+
+    # Positive test cases
+    def test_mirror_matches_sql(self, client, sample_user, monkeypatch):
+        """Test every mirrored endpoint returns the SQL result."""
+        self._seed(client, sample_user["id"])
+        for url in self._urls(sample_user["id"]):
+            sql, mirrored = self._both(client, monkeypatch, url)
+            assert mirrored == sql, url
+        assert analytics_mirror.stats()["full_syncs"] == 1
+
+    def test_writes_reingest_only_dirty_days(self, client, sample_user, monkeypatch):
+        """Test set changes re-ingest the touched day and stay in parity."""
+        self._seed(client, sample_user["id"])
+        url = self._urls(sample_user["id"])[1]
+        self._both(client, monkeypatch, url)
+
+        workouts = client.get(f"/api/workouts/?user_id={sample_user['id']}").json()
+        workout = client.get(f"/api/workouts/{workouts[0]['id']}").json()
+        client.post(
+            f"/api/workouts/exercises/{workout['exercises'][0]['id']}/sets",
+            json={"set_number": 3, "reps": 3, "weight": 150}
+        )
+        client.delete(f"/api/workouts/{workouts[-1]['id']}")
+
+        sql, mirrored = self._both(client, monkeypatch, url)
+        assert mirrored == sql
+        stats = analytics_mirror.stats()
+        assert stats["full_syncs"] == 1
+        assert stats["partial_syncs"] == 1
+
+    def test_write_without_dirty_days_forces_full_sync(self, client, sample_user, monkeypatch):
+        """Test a duration edit is not lost when another day's set change is re-ingested."""
+        self._seed(client, sample_user["id"])
+        url = self._urls(sample_user["id"])[1]
+        self._both(client, monkeypatch, url)
+
+        workouts = client.get(f"/api/workouts/?user_id={sample_user['id']}").json()
+        client.put(f"/api/workouts/{workouts[1]['id']}", json={"duration_seconds": 7200})
+        workout = client.get(f"/api/workouts/{workouts[0]['id']}").json()
+        client.post(
+            f"/api/workouts/exercises/{workout['exercises'][0]['id']}/sets",
+            json={"set_number": 3, "reps": 3, "weight": 150}
+        )
+
+        sql, mirrored = self._both(client, monkeypatch, url)
+        assert mirrored == sql
+        assert analytics_mirror.stats()["full_syncs"] == 2
+
+    def test_users_are_isolated(self, client, sample_user, monkeypatch):
+        """Test one user's rows never leak into another's aggregates."""
+        self._seed(client, sample_user["id"])
+        other = client.post("/api/users/", json={"name": "Other"}).json()
+        for url in self._urls(other["id"]):
+            sql, mirrored = self._both(client, monkeypatch, url)
+            assert mirrored == sql
+
+    def test_sync_does_not_block_other_users(self, client, sample_user, monkeypatch):
+        """Test a slow re-ingest for one user does not hold up another user's query."""
+        self._seed(client, sample_user["id"])
+        other = client.post("/api/users/", json={"name": "Other"}).json()
+        self._seed(client, other["id"])
+        monkeypatch.setattr(analytics, "DUCKDB_BACKEND", True)
+        client.get(self._urls(other["id"])[2])
+
+        entered, release = threading.Event(), threading.Event()
+        ingest = analytics_mirror._ingest
+
+        def slow_ingest(cursor, db, user_id, days):
+            if user_id == sample_user["id"]:
+                entered.set()
+                release.wait(5)
+            ingest(cursor, db, user_id, days)
+
+        monkeypatch.setattr(analytics_mirror, "_ingest", slow_ingest)
+        slow = threading.Thread(target=client.get, args=(self._urls(sample_user["id"])[2],))
+        slow.start()
+        try:
+            assert entered.wait(5)
+            analytics_cache.clear()
+            response = client.get(self._urls(other["id"])[2])
+            assert response.status_code == 200
+            assert sum(response.json()["muscle_groups"].values()) > 0
+            assert slow.is_alive()
+        finally:
+            release.set()
+            slow.join()
+
+    # Negative test cases
+    def test_stats_report_backend_disabled(self, client):
+        """Test the stats endpoint reports the flag is off by default."""
+        response = client.get("/api/analytics/duckdb-stats")
+        assert response.status_code == 200
+        assert response.json()["enabled"] is False
@@ -1,4 +1,5 @@
 import pytest
+from datetime import datetime, timezone, timedelta
 
 
 class TestExercisesAPI:
@@ -152,6 +153,192 @@ class TestExercisesAPI:
         assert len(custom_exercises) == 1
         assert custom_exercises[0]["created_by"] == sample_user["id"]
 
+    def test_last_performance(self, client, sample_user):
+        """Test last performance returns the most recent session's sets."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        for days_ago, weight in [(14, 90), (7, 100)]:
+            client.post(
+                f"/api/workouts/?user_id={sample_user['id']}",
+                json={
+                    "name": f"Session {days_ago}",
+                    "started_at": (datetime.now(timezone.utc) - timedelta(days=days_ago)).isoformat(),
+                    "exercises": [
+                        {
+                            "exercise_id": exercise_id,
+                            "order": 1,
+                            "sets": [
+                                {"set_number": 1, "reps": 5, "weight": weight},
+                                {"set_number": 2, "reps": 5, "weight": weight}
+                            ]
+                        }
+                    ]
+                }
+            )
+
+        response = client.get(
+            f"/api/exercises/{exercise_id}/last-performance?user_id={sample_user['id']}"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["workout_name"] == "Session 7"
+        assert [s["weight"] for s in data["sets"]] == [100, 100]
+
+    def test_last_performance_excludes_current_workout(self, client, sample_user):
+        """Test the in-progress workout can be excluded from the lookup."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        previous = client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "started_at": (datetime.now(timezone.utc) - timedelta(days=3)).isoformat(),
+                "exercises": [
+                    {"exercise_id": exercise_id, "order": 1, "sets": [{"set_number": 1, "reps": 5, "weight": 80}]}
+                ]
+            }
+        ).json()
+        current = client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "exercises": [{"exercise_id": exercise_id, "order": 1, "sets": []}]
+            }
+        ).json()
+
+        response = client.get(
+            f"/api/exercises/{exercise_id}/last-performance"
+            f"?user_id={sample_user['id']}&exclude_workout_id={current['id']}"
+        )
+        assert response.json()["workout_id"] == previous["id"]
+
+    def test_last_performance_batch(self, client, sample_user):
+        """Test looking up several exercises at once."""
+        exercises = client.get("/api/exercises/").json()
+        client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "exercises": [
+                    {"exercise_id": exercises[0]["id"], "order": 1, "sets": [{"set_number": 1, "reps": 5, "weight": 80}]},
+                    {"exercise_id": exercises[1]["id"], "order": 2, "sets": [{"set_number": 1, "reps": 8, "weight": 40}]}
+                ]
+            }
+        )
+
+        response = client.get(
+            f"/api/exercises/last-performance?user_id={sample_user['id']}"
+            f"&exercise_ids={exercises[1]['id']}&exercise_ids={exercises[0]['id']}"
+            f"&exercise_ids={exercises[2]['id']}"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert [s["exercise_id"] for s in data] == [exercises[1]["id"], exercises[0]["id"]]
+
+    def test_last_performance_no_history(self, client, sample_user):
+        """Test last performance for an exercise never done."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        response = client.get(
+            f"/api/exercises/{exercise_id}/last-performance?user_id={sample_user['id']}"
+        )
+        assert response.status_code == 200
+        assert response.json() is None
+
+    def test_exercise_history_pagination(self, client, sample_user):
+        """Test history pages through every session newest first."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        for days_ago in range(5):
+            client.post(
+                f"/api/workouts/?user_id={sample_user['id']}",
+                json={
+                    "name": f"Day {days_ago}",
+                    "started_at": (datetime.now(timezone.utc) - timedelta(days=days_ago)).isoformat(),
+                    "exercises": [
+                        {
+                            "exercise_id": exercise_id,
+                            "order": 1,
+                            "sets": [{"set_number": 1, "reps": 5, "weight": 100 - days_ago}]
+                        }
+                    ]
+                }
+            )
+
+        names = []
+        cursor = None
+        for _ in range(3):
+            url = f"/api/exercises/{exercise_id}/history?user_id={sample_user['id']}&limit=2"
+            if cursor:
+                url += f"&cursor={cursor}"
+            response = client.get(url)
+            assert response.status_code == 200
+            page = response.json()
+            names.extend(s["workout_name"] for s in page["sessions"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert names == ["Day 0", "Day 1", "Day 2", "Day 3", "Day 4"]
+        assert cursor is None
+
+    def test_exercise_history_includes_sets(self, client, sample_user):
+        """Test each history session carries its sets."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "exercises": [
+                    {
+                        "exercise_id": exercise_id,
+                        "order": 1,
+                        "sets": [
+                            {"set_number": 1, "reps": 5, "weight": 100},
+                            {"set_number": 2, "reps": 3, "weight": 110}
+                        ]
+                    }
+                ]
+            }
+        )
+
+        data = client.get(
+            f"/api/exercises/{exercise_id}/history?user_id={sample_user['id']}"
+        ).json()
+        assert len(data["sessions"]) == 1
+        assert [s["reps"] for s in data["sessions"][0]["sets"]] == [5, 3]
+        assert data["next_cursor"] is None
+
+    def test_filter_exercises_by_muscle_group(self, client):
+        """Test filtering by muscle group returns exact matches only."""
+        response = client.get("/api/exercises/?muscle_group=back")
+        assert response.status_code == 200
+        names = {e["name"] for e in response.json()}
+        assert names == {"Deadlift", "Pull-Ups"}
+
+    def test_muscle_group_filter_does_not_match_substrings(self, client, sample_user):
+        """Test a muscle group that contains another's name is not matched."""
+        client.post(
+            f"/api/exercises/?user_id={sample_user['id']}",
+            json={"name": "Back Extension", "category": "pull", "muscle_groups": ["lower_back"]}
+        )
+
+        names = {e["name"] for e in client.get("/api/exercises/?muscle_group=back").json()}
+        assert "Back Extension" not in names
+        names = {e["name"] for e in client.get("/api/exercises/?muscle_group=lower_back").json()}
+        assert names == {"Back Extension"}
+
+    def test_muscle_group_filter_follows_updates(self, client, sample_user):
+        """Test updating an exercise's muscle groups updates the filter."""
+        exercise = client.post(
+            f"/api/exercises/?user_id={sample_user['id']}",
+            json={"name": "Custom Row", "category": "pull", "muscle_groups": ["back", "biceps"]}
+        ).json()
+        client.put(
+            f"/api/exercises/{exercise['id']}?user_id={sample_user['id']}",
+            json={"name": "Custom Row", "category": "pull", "muscle_groups": ["biceps", "forearms"]}
+        )
+
+        back = {e["id"] for e in client.get("/api/exercises/?muscle_group=back").json()}
+        forearms = {e["id"] for e in client.get("/api/exercises/?muscle_group=forearms").json()}
+        assert exercise["id"] not in back
+        assert exercise["id"] in forearms
+
     # Negative test cases
     def test_get_nonexistent_exercise(self, client):
         """Test getting exercise that doesn't exist."""
@@ -289,3 +476,15 @@ class TestExercisesAPI:
         response = client.get("/api/exercises/?search=XYZ123NOTFOUND")
         assert response.status_code == 200
         assert response.json() == []
+
+    def test_last_performance_missing_user_id(self, client):
+        """Test last performance requires a user."""
+        response = client.get("/api/exercises/1/last-performance")
+        assert response.status_code == 422
+
+    def test_exercise_history_invalid_cursor(self, client, sample_user):
+        """Test history rejects a malformed cursor."""
+        response = client.get(
+            f"/api/exercises/1/history?user_id={sample_user['id']}&cursor=not-a-cursor"
+        )
+        assert response.status_code == 400
@@ -0,0 +1,96 @@
+import io
+import pytest
+from datetime import datetime, timezone, timedelta
+
+from utils.export import export_sets, stream_sets
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+class TestExportAPI:
+    """Test the Parquet/Arrow training history export."""
+
+    def _seed(self, client, user_id):
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        now = datetime.now(timezone.utc)
+        client.post(
+            f"/api/body-metrics/?user_id={user_id}",
+            json={"date": (now - timedelta(days=5)).date().isoformat(), "weight": 80.0, "body_fat_percentage": 15.0}
+        )
+        for days_ago in [10, 2]:
+            client.post(
+                f"/api/workouts/?user_id={user_id}",
+                json={
+                    "started_at": (now - timedelta(days=days_ago)).isoformat(),
+                    "exercises": [{"exercise_id": exercise_id, "order": 1, "sets": [
+                        {"set_number": 1, "reps": 5, "weight": 100},
+                        {"set_number": 2, "reps": 5, "weight": 105, "rpe": 9}
+                    ]}]
+                }
+            )
+
+    # Positive test cases
+    def test_export_user_parquet(self, client, sample_user):
+        """Test one user's sets come back joined with workout, exercise and body weight."""
+        self._seed(client, sample_user["id"])
+        response = client.get(f"/api/export/sets?user_id={sample_user['id']}")
+        assert response.status_code == 200
+        assert response.headers["content-disposition"] == f'attachment; filename="sets-{sample_user["id"]}.parquet"'
+
+        rows = pq.read_table(io.BytesIO(response.content)).to_pylist()
+        assert len(rows) == 4
+        assert rows[0]["exercise_name"] == "Bench Press"
+        assert rows[0]["muscle_groups"] == ["chest", "triceps"]
+        assert [r["weight"] for r in rows] == [100, 105, 100, 105]
+        assert rows[1]["rpe"] == 9
+        # Weigh-in happened between the two workouts
+        assert [r["body_weight"] for r in rows] == [None, None, 80.0, 80.0]
+        assert rows[3]["body_fat_percentage"] == 15.0
+
+    def test_export_all_users_arrow(self, client, sample_user):
+        """Test the whole database exports as an Arrow IPC file."""
+        self._seed(client, sample_user["id"])
+        other = client.post("/api/users/", json={"name": "Other"}).json()
+        self._seed(client, other["id"])
+
+        response = client.get("/api/export/sets?format=arrow")
+        assert response.status_code == 200
+        table = pa.ipc.open_file(pa.py_buffer(response.content)).read_all()
+        assert table.num_rows == 8
+        assert sorted(set(table.column("user_name").to_pylist())) == ["Other", "Test User"]
+
+    def test_export_written_in_chunks(self, client, sample_user, db_session):
+        """Test rows are written one bounded batch at a time."""
+        self._seed(client, sample_user["id"])
+        sink = io.BytesIO()
+        assert export_sets(db_session, sink, "parquet", sample_user["id"], chunk_rows=3) == 4
+        assert pq.ParquetFile(io.BytesIO(sink.getvalue())).num_row_groups == 2
+
+    def test_export_streams_each_batch(self, client, sample_user, db_session):
+        """Test each batch's bytes are handed out before the next batch is read."""
+        self._seed(client, sample_user["id"])
+        chunks = list(stream_sets(db_session, "arrow", sample_user["id"], chunk_rows=1))
+        # Header and first batch, three more batches, then the footer
+        assert len(chunks) == 5
+        assert all(chunks[:4])
+        table = pa.ipc.open_file(pa.py_buffer(b"".join(chunks))).read_all()
+        assert table.column("body_weight").to_pylist() == [None, None, 80.0, 80.0]
+
+    def test_export_user_without_sets(self, client, sample_user):
+        """Test an empty history is still a valid file with the full schema."""
+        response = client.get(f"/api/export/sets?user_id={sample_user['id']}")
+        table = pq.read_table(io.BytesIO(response.content))
+        assert table.num_rows == 0
+        assert "body_weight" in table.column_names
+
+    # Negative test cases
+    def test_export_unknown_user(self, client):
+        """Test exporting a user that does not exist."""
+        response = client.get("/api/export/sets?user_id=99999")
+        assert response.status_code == 404
+
+    def test_export_invalid_format(self, client, sample_user):
+        """Test unsupported formats are rejected."""
+        response = client.get(f"/api/export/sets?user_id={sample_user['id']}&format=csv")
+        assert response.status_code == 422
@@ -0,0 +1,40 @@
+import numpy as np
+
+from utils.forecast import fit_trends
+
+
+class TestForecast:
+    """Test cases for batched robust trend fitting"""
+
+    # Positive test cases
+    def test_fits_each_group(self):
+        """Test every group gets its own line from one batched fit."""
+        ids, intercepts, slopes, counts = fit_trends(
+            [7, 7, 7, 3, 3, 3, 3],
+            [0, 1, 2, 0, 1, 2, 3],
+            [10, 12, 14, 50, 49, 48, 47]
+        )
+        assert ids.tolist() == [3, 7]
+        assert np.allclose(intercepts, [50, 10])
+        assert np.allclose(slopes, [-1, 2])
+        assert counts.tolist() == [4, 3]
+
+    def test_outlier_downweighted(self):
+        """Test a single bad day barely moves the trend."""
+        x = list(range(10))
+        y = [100 + xi for xi in x]
+        y[7] = 160
+        _, intercepts, slopes, _ = fit_trends([1] * 10, x, y)
+        assert abs(slopes[0] - 1) < 0.1
+        assert abs(intercepts[0] - 100) < 0.5
+
+    # Negative test cases
+    def test_too_few_points_skipped(self):
+        """Test groups with fewer than three points or a single x are dropped."""
+        ids, _, _, _ = fit_trends([1, 1, 2, 2, 2], [0, 1, 5, 5, 5], [1, 2, 3, 4, 5])
+        assert ids.tolist() == []
+
+    def test_empty_input(self):
+        """Test no rows gives no fits."""
+        ids, intercepts, slopes, counts = fit_trends([], [], [])
+        assert len(ids) == len(intercepts) == len(slopes) == len(counts) == 0
@@ -0,0 +1,150 @@
+import pytest
+from datetime import datetime, timezone, timedelta, date
+
+from models.database import IdempotencyKey
+
+
+class TestIdempotencyKeys:
+    """Test Idempotency-Key handling on write endpoints."""
+
+    def _workout_with_exercise(self, client, user_id):
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        workout = client.post(
+            f"/api/workouts/?user_id={user_id}",
+            json={
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "exercises": [{"exercise_id": exercise_id, "order": 1, "sets": []}]
+            }
+        ).json()
+        return workout["id"], workout["exercises"][0]["id"]
+
+    # Positive test cases
+    def test_retry_add_set_does_not_duplicate(self, client, sample_user):
+        """Test retrying a set with the same key returns the stored result."""
+        workout_id, we_id = self._workout_with_exercise(client, sample_user["id"])
+        headers = {"Idempotency-Key": "set-1"}
+
+        first = client.post(
+            f"/api/workouts/exercises/{we_id}/sets",
+            json={"set_number": 1, "reps": 5, "weight": 100},
+            headers=headers
+        )
+        second = client.post(
+            f"/api/workouts/exercises/{we_id}/sets",
+            json={"set_number": 1, "reps": 5, "weight": 100},
+            headers=headers
+        )
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert second.headers["Idempotent-Replayed"] == "true"
+
+        workout = client.get(f"/api/workouts/{workout_id}").json()
+        assert len(workout["exercises"][0]["sets"]) == 1
+
+    def test_different_keys_execute_separately(self, client, sample_user):
+        """Test distinct keys create distinct sets."""
+        workout_id, we_id = self._workout_with_exercise(client, sample_user["id"])
+        for key in ["a", "b"]:
+            client.post(
+                f"/api/workouts/exercises/{we_id}/sets",
+                json={"set_number": 1, "reps": 5, "weight": 100},
+                headers={"Idempotency-Key": key}
+            )
+
+        workout = client.get(f"/api/workouts/{workout_id}").json()
+        assert len(workout["exercises"][0]["sets"]) == 2
+
+    def test_requests_without_key_are_not_deduplicated(self, client, sample_user):
+        """Test requests without a key behave as before."""
+        for _ in range(2):
+            client.post(
+                f"/api/body-metrics/?user_id={sample_user['id']}",
+                json={"date": date.today().isoformat(), "weight": 80}
+            )
+        metrics = client.get(f"/api/body-metrics/?user_id={sample_user['id']}").json()
+        assert len(metrics) == 1
+
+    def test_retry_create_template(self, client, sample_user):
+        """Test template creation is idempotent with a key."""
+        headers = {"Idempotency-Key": "template-1"}
+        for _ in range(2):
+            response = client.post(
+                f"/api/templates/?user_id={sample_user['id']}",
+                json={"name": "Push", "exercises": []},
+                headers=headers
+            )
+            assert response.status_code == 200
+
+        templates = client.get(f"/api/templates/?user_id={sample_user['id']}").json()
+        assert len(templates) == 1
+
+    def test_failed_request_can_be_retried(self, client, sample_user):
+        """Test a key is released when the first attempt fails."""
+        headers = {"Idempotency-Key": "retry-after-404"}
+        response = client.delete("/api/workouts/99999", headers=headers)
+        assert response.status_code == 404
+
+        workout = client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={"started_at": datetime.now(timezone.utc).isoformat(), "exercises": []}
+        ).json()
+        response = client.delete(f"/api/workouts/{workout['id']}", headers=headers)
+        assert response.status_code == 200
+
+    def test_stale_reservation_is_taken_over(self, client, sample_user, db_session):
+        """Test a reservation left behind by a crashed request does not block retries."""
+        _, we_id = self._workout_with_exercise(client, sample_user["id"])
+        path = f"/api/workouts/exercises/{we_id}/sets"
+        db_session.add(IdempotencyKey(
+            key="crashed", method="POST", path=path, request_hash="0" * 64,
+            created_at=datetime.now(timezone.utc) - timedelta(minutes=5)
+        ))
+        db_session.commit()
+
+        response = client.post(
+            path, json={"set_number": 1, "reps": 5, "weight": 100}, headers={"Idempotency-Key": "crashed"}
+        )
+        assert response.status_code == 200
+        assert "Idempotent-Replayed" not in response.headers
+
+    # Negative test cases
+    def test_fresh_reservation_is_in_progress(self, client, sample_user, db_session):
+        """Test a retry while the first request may still be running gets 409."""
+        _, we_id = self._workout_with_exercise(client, sample_user["id"])
+        path = f"/api/workouts/exercises/{we_id}/sets"
+        body = {"set_number": 1, "reps": 5, "weight": 100}
+        client.post(path, json=body, headers={"Idempotency-Key": "running"})
+        record = db_session.query(IdempotencyKey).filter(IdempotencyKey.key == "running").one()
+        record.status_code = None
+        db_session.commit()
+
+        response = client.post(path, json=body, headers={"Idempotency-Key": "running"})
+        assert response.status_code == 409
+
+    def test_key_reused_with_different_body(self, client, sample_user):
+        """Test reusing a key for a different payload is rejected."""
+        _, we_id = self._workout_with_exercise(client, sample_user["id"])
+        headers = {"Idempotency-Key": "set-2"}
+        client.post(
+            f"/api/workouts/exercises/{we_id}/sets",
+            json={"set_number": 1, "reps": 5, "weight": 100},
+            headers=headers
+        )
+
+        response = client.post(
+            f"/api/workouts/exercises/{we_id}/sets",
+            json={"set_number": 2, "reps": 5, "weight": 100},
+            headers=headers
+        )
+        assert response.status_code == 422
+
+    def test_key_too_long(self, client, sample_user):
+        """Test overly long keys are rejected."""
+        response = client.post(
+            f"/api/templates/?user_id={sample_user['id']}",
+            json={"name": "Push", "exercises": []},
+            headers={"Idempotency-Key": "x" * 300}
+        )
+        assert response.status_code == 400
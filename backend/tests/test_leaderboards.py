@@ -0,0 +1,124 @@
+import pytest
+from datetime import datetime, timezone, timedelta, date
+
+import routers.leaderboards as leaderboards
+from models.database import LeaderboardEntry
+from utils.leaderboards import refresh_leaderboards
+
+
+class TestLeaderboardsAPI:
+    """Test the household leaderboards."""
+
+    def _log(self, client, user_id, exercise_id, weight, reps=1, days_ago=0):
+        return client.post(
+            f"/api/workouts/?user_id={user_id}",
+            json={
+                "started_at": (datetime.now(timezone.utc) - timedelta(days=days_ago)).isoformat(),
+                "exercises": [{"exercise_id": exercise_id, "order": 1, "sets": [
+                    {"set_number": 1, "reps": reps, "weight": weight}
+                ]}]
+            }
+        ).json()
+
+    def _users(self, client, *names):
+        return [client.post("/api/users/", json={"name": name}).json()["id"] for name in names]
+
+    # Positive test cases
+    def test_e1rm_board_ranks_profiles(self, client):
+        """Test best e1RM per profile, highest first, with shared ranks for ties."""
+        ana, ben, cleo = self._users(client, "Ana", "Ben", "Cleo")
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        self._log(client, ana, exercise_id, 100)
+        self._log(client, ana, exercise_id, 90, days_ago=10)
+        self._log(client, ben, exercise_id, 120)
+        self._log(client, cleo, exercise_id, 100)
+
+        response = client.get(f"/api/leaderboards/exercises/{exercise_id}")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["board"] == "e1rm"
+        assert data["period"] is None
+        assert [(e["rank"], e["user_name"], e["value"]) for e in data["entries"]] == [
+            (1, "Ben", 120), (2, "Ana", 100), (2, "Cleo", 100)
+        ]
+
+    def test_e1rm_board_follows_deletes(self, client, db_session):
+        """Test deleting a workout moves the entry back and matches a rebuild."""
+        ana, = self._users(client, "Ana")
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        self._log(client, ana, exercise_id, 100, days_ago=3)
+        best = self._log(client, ana, exercise_id, 140)
+        client.delete(f"/api/workouts/{best['id']}")
+
+        data = client.get(f"/api/leaderboards/exercises/{exercise_id}").json()
+        assert [e["value"] for e in data["entries"]] == [100]
+
+        def entries():
+            db_session.expire_all()
+            return sorted(
+                (e.user_id, e.exercise_id, e.board, e.period, e.value)
+                for e in db_session.query(LeaderboardEntry).all()
+            )
+        incremental = entries()
+        refresh_leaderboards(db_session)
+        db_session.commit()
+        assert entries() == incremental
+
+    def test_weekly_volume_board(self, client):
+        """Test weekly volume only counts the requested week."""
+        ana, ben = self._users(client, "Ana", "Ben")
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        self._log(client, ana, exercise_id, 100, reps=5)
+        self._log(client, ben, exercise_id, 50, reps=5)
+        self._log(client, ben, exercise_id, 100, reps=10, days_ago=7)
+
+        data = client.get(f"/api/leaderboards/exercises/{exercise_id}?board=weekly_volume").json()
+        today = datetime.now(timezone.utc).date()
+        assert data["period"] == (today - timedelta(days=today.weekday())).isoformat()
+        assert [(e["user_name"], e["value"]) for e in data["entries"]] == [("Ana", 500), ("Ben", 250)]
+
+        last_week = client.get(
+            f"/api/leaderboards/exercises/{exercise_id}?board=weekly_volume&week_offset=1"
+        ).json()
+        assert [(e["user_name"], e["value"]) for e in last_week["entries"]] == [("Ben", 1000)]
+
+    def test_weekly_volume_uses_requesters_week(self, client, monkeypatch):
+        """Test the weekly board follows the requesting profile's local calendar."""
+        ana, = self._users(client, "Ana")
+        client.put(f"/api/users/{ana}", json={"timezone": "Pacific/Kiritimati"})
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        # Monday already in Kiritimati, still Sunday in UTC
+        monkeypatch.setattr(
+            leaderboards, "local_today",
+            lambda tz_name="UTC": date(2026, 1, 5) if tz_name == "Pacific/Kiritimati" else date(2026, 1, 4)
+        )
+
+        url = f"/api/leaderboards/exercises/{exercise_id}?board=weekly_volume"
+        assert client.get(f"{url}&user_id={ana}").json()["period"] == "2026-01-05"
+        assert client.get(url).json()["period"] == "2025-12-29"
+
+    def test_streak_board(self, client):
+        """Test current streaks rank profiles and lapsed streaks are left out."""
+        ana, ben, cleo = self._users(client, "Ana", "Ben", "Cleo")
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        for days_ago in range(3):
+            self._log(client, ana, exercise_id, 50, days_ago=days_ago)
+        self._log(client, ben, exercise_id, 50, days_ago=1)
+        self._log(client, cleo, exercise_id, 50, days_ago=5)
+
+        response = client.get("/api/leaderboards/streak")
+        assert response.status_code == 200
+        assert [(e["rank"], e["user_name"], e["value"]) for e in response.json()["entries"]] == [
+            (1, "Ana", 3), (2, "Ben", 1)
+        ]
+
+    # Negative test cases
+    def test_exercise_leaderboard_not_found(self, client):
+        """Test leaderboards for an unknown exercise."""
+        response = client.get("/api/leaderboards/exercises/99999")
+        assert response.status_code == 404
+
+    def test_exercise_leaderboard_invalid_board(self, client):
+        """Test unknown boards are rejected."""
+        response = client.get("/api/leaderboards/exercises/1?board=reps")
+        assert response.status_code == 422
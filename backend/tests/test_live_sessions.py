@@ -0,0 +1,337 @@
+import pytest
+import threading
+from datetime import datetime, timezone
+
+from models.database import WorkoutSet
+from routers.live_sessions import live_store
+from utils.live_sessions import LiveSessionStore
+
+
+@pytest.fixture
+def live_journal(tmp_path):
+    """Point the live session store at a throwaway journal."""
+    original = live_store.journal_path
+    live_store.journal_path = str(tmp_path / "live.journal")
+    yield live_store.journal_path
+    live_store._sessions.clear()
+    live_store._compact()
+    live_store.journal_path = original
+
+
+@pytest.fixture
+def live_workout(client, sample_user, live_journal):
+    """Create a workout with one exercise and start a live session for it."""
+    exercise_id = client.get("/api/exercises/").json()[0]["id"]
+    workout = client.post(
+        f"/api/workouts/?user_id={sample_user['id']}",
+        json={
+            "name": "Live Workout",
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "exercises": [{"exercise_id": exercise_id, "order": 1, "sets": []}]
+        }
+    ).json()
+    response = client.post(f"/api/workouts/{workout['id']}/live")
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestLiveSessionsAPI:
+    """Test live workout session endpoints."""
+
+    # Positive test cases
+    def test_start_live_session(self, live_workout):
+        """Test starting a live session returns the workout."""
+        assert live_workout["name"] == "Live Workout"
+        assert len(live_workout["exercises"]) == 1
+
+    def test_add_live_set_is_served_from_memory(self, client, live_workout):
+        """Test added sets are visible in the live session before checkpoint."""
+        workout_id = live_workout["id"]
+        we_id = live_workout["exercises"][0]["id"]
+
+        response = client.post(
+            f"/api/workouts/{workout_id}/live/exercises/{we_id}/sets",
+            json={"set_number": 1, "reps": 5, "weight": 100}
+        )
+        assert response.status_code == 200
+        assert response.json()["id"] < 0
+
+        live = client.get(f"/api/workouts/{workout_id}/live").json()
+        assert len(live["exercises"][0]["sets"]) == 1
+
+        stored = client.get(f"/api/workouts/{workout_id}").json()
+        assert len(stored["exercises"][0]["sets"]) == 0
+
+    def test_checkpoint_persists_sets_and_prs(self, client, sample_user, live_workout):
+        """Test a checkpoint writes pending sets and updates PRs."""
+        workout_id = live_workout["id"]
+        we_id = live_workout["exercises"][0]["id"]
+        client.post(
+            f"/api/workouts/{workout_id}/live/exercises/{we_id}/sets",
+            json={"set_number": 1, "reps": 5, "weight": 120}
+        )
+
+        response = client.post(f"/api/workouts/{workout_id}/live/checkpoint")
+        assert response.status_code == 200
+
+        stored = client.get(f"/api/workouts/{workout_id}").json()
+        assert stored["exercises"][0]["sets"][0]["weight"] == 120
+        prs = client.get(f"/api/workouts/prs/{sample_user['id']}").json()
+        assert any(pr["value"] == 120 for pr in prs)
+
+    def test_temporary_id_survives_checkpoint(self, client, live_workout):
+        """Test a set can be edited by its temporary id after it was saved."""
+        workout_id = live_workout["id"]
+        we_id = live_workout["exercises"][0]["id"]
+        temp_id = client.post(
+            f"/api/workouts/{workout_id}/live/exercises/{we_id}/sets",
+            json={"set_number": 1, "reps": 5, "weight": 100}
+        ).json()["id"]
+        client.post(f"/api/workouts/{workout_id}/live/checkpoint")
+
+        response = client.put(
+            f"/api/workouts/{workout_id}/live/sets/{temp_id}",
+            json={"reps": 6, "is_completed": True}
+        )
+        assert response.status_code == 200
+        assert response.json()["id"] > 0
+        assert response.json()["reps"] == 6
+
+    def test_delete_live_set(self, client, live_workout):
+        """Test deleting a set that was never saved."""
+        workout_id = live_workout["id"]
+        we_id = live_workout["exercises"][0]["id"]
+        set_id = client.post(
+            f"/api/workouts/{workout_id}/live/exercises/{we_id}/sets",
+            json={"set_number": 1, "reps": 5, "weight": 100}
+        ).json()["id"]
+
+        response = client.delete(f"/api/workouts/{workout_id}/live/sets/{set_id}")
+        assert response.status_code == 200
+        live = client.get(f"/api/workouts/{workout_id}/live").json()
+        assert live["exercises"][0]["sets"] == []
+
+    def test_finish_live_session(self, client, live_workout):
+        """Test finishing persists sets, completes the workout and leaves live mode."""
+        workout_id = live_workout["id"]
+        we_id = live_workout["exercises"][0]["id"]
+        for i in range(3):
+            client.post(
+                f"/api/workouts/{workout_id}/live/exercises/{we_id}/sets",
+                json={"set_number": i + 1, "reps": 5, "weight": 100}
+            )
+
+        response = client.post(
+            f"/api/workouts/{workout_id}/live/finish",
+            json={"duration_seconds": 3600}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["duration_seconds"] == 3600
+        assert len(data["exercises"][0]["sets"]) == 3
+
+        assert client.get(f"/api/workouts/{workout_id}/live").status_code == 404
+
+    def test_finish_invalidates_analytics_cache(self, client, sample_user, live_workout):
+        """Test the final workout details are visible to cached analytics."""
+        url = f"/api/analytics/weekly-summary?user_id={sample_user['id']}"
+        assert client.get(url).json()["total_duration_minutes"] == 0
+
+        client.post(f"/api/workouts/{live_workout['id']}/live/finish", json={"duration_seconds": 3600})
+        assert client.get(url).json()["total_duration_minutes"] == 60
+
+    def test_recover_replays_journal(self, client, live_workout, live_journal, db_session):
+        """Test unsaved edits are recovered from the journal after a restart."""
+        workout_id = live_workout["id"]
+        we_id = live_workout["exercises"][0]["id"]
+        client.post(
+            f"/api/workouts/{workout_id}/live/exercises/{we_id}/sets",
+            json={"set_number": 1, "reps": 8, "weight": 60}
+        )
+
+        restarted = LiveSessionStore(journal_path=live_journal)
+        restarted.recover(db_session)
+        sets = restarted.get(workout_id)["exercises"][0]["sets"]
+        assert len(sets) == 1
+        assert sets[0]["weight"] == 60
+
+    def test_temporary_id_survives_restart(self, client, live_workout, live_journal, db_session):
+        """Test temporary ids stay valid and are not reissued after checkpoint and restart."""
+        workout_id = live_workout["id"]
+        we_id = live_workout["exercises"][0]["id"]
+        temp_id = client.post(
+            f"/api/workouts/{workout_id}/live/exercises/{we_id}/sets",
+            json={"set_number": 1, "reps": 5, "weight": 100}
+        ).json()["id"]
+        client.post(f"/api/workouts/{workout_id}/live/checkpoint")
+
+        restarted = LiveSessionStore(journal_path=live_journal)
+        restarted.recover(db_session)
+        added = restarted.add_set(workout_id, we_id, {"set_number": 2, "reps": 3, "weight": 110})
+        assert added["id"] < temp_id
+
+        updated = restarted.update_set(workout_id, temp_id, {"reps": 6})
+        assert updated["id"] > 0
+        restarted.checkpoint()
+
+        stored = client.get(f"/api/workouts/{workout_id}").json()
+        sets = sorted(stored["exercises"][0]["sets"], key=lambda s: s["set_number"])
+        assert [(s["reps"], s["weight"]) for s in sets] == [(6, 100), (3, 110)]
+
+    def test_exercise_added_mid_session_takes_live_sets(self, client, live_workout):
+        """Test an exercise added through the workout endpoints joins the live session."""
+        workout_id = live_workout["id"]
+        exercise_id = client.get("/api/exercises/").json()[1]["id"]
+        added = client.post(
+            f"/api/workouts/{workout_id}/exercises",
+            json={"exercise_id": exercise_id, "order": 2, "sets": []}
+        ).json()
+        we_id = added["exercises"][-1]["id"]
+
+        response = client.post(
+            f"/api/workouts/{workout_id}/live/exercises/{we_id}/sets",
+            json={"set_number": 1, "reps": 8, "weight": 40}
+        )
+        assert response.status_code == 200
+        live = client.get(f"/api/workouts/{workout_id}/live").json()
+        assert [len(ex["sets"]) for ex in live["exercises"]] == [0, 1]
+
+    def test_workout_update_reaches_live_snapshot(self, client, live_workout):
+        """Test renaming a live workout shows in the live session."""
+        workout_id = live_workout["id"]
+        client.put(f"/api/workouts/{workout_id}", json={"name": "Renamed"})
+        assert client.get(f"/api/workouts/{workout_id}/live").json()["name"] == "Renamed"
+
+    def test_edits_do_not_wait_for_checkpoint(self, client, live_workout, monkeypatch):
+        """Test a slow checkpoint does not block edits to the session."""
+        workout_id = live_workout["id"]
+        we_id = live_workout["exercises"][0]["id"]
+        client.post(
+            f"/api/workouts/{workout_id}/live/exercises/{we_id}/sets",
+            json={"set_number": 1, "reps": 5, "weight": 100}
+        )
+        flushed = live_store.on_exercise_flushed
+        entered, release = threading.Event(), threading.Event()
+
+        def slow(db, user_id, we):
+            entered.set()
+            release.wait(5)
+            flushed(db, user_id, we)
+
+        monkeypatch.setattr(live_store, "on_exercise_flushed", slow)
+        checkpoint = threading.Thread(target=live_store.checkpoint)
+        checkpoint.start()
+        assert entered.wait(5)
+        try:
+            added = live_store.add_set(workout_id, we_id, {"set_number": 2, "reps": 5, "weight": 100})
+            assert added["id"] < 0
+        finally:
+            release.set()
+            checkpoint.join()
+
+        # The edit made during the checkpoint is still pending, the first set was saved
+        assert len(live_store._sessions[workout_id].pending) == 1
+        stored = client.get(f"/api/workouts/{workout_id}").json()
+        assert len(stored["exercises"][0]["sets"]) == 1
+
+    def test_delete_workout_discards_live_session(self, client, live_workout, db_session):
+        """Test deleting a live workout drops its session so no orphan sets are saved."""
+        workout_id = live_workout["id"]
+        we_id = live_workout["exercises"][0]["id"]
+        client.post(
+            f"/api/workouts/{workout_id}/live/exercises/{we_id}/sets",
+            json={"set_number": 1, "reps": 5, "weight": 100}
+        )
+
+        assert client.delete(f"/api/workouts/{workout_id}").status_code == 200
+        assert client.get(f"/api/workouts/{workout_id}/live").status_code == 404
+
+        live_store.checkpoint()
+        assert db_session.query(WorkoutSet).filter(WorkoutSet.workout_exercise_id == we_id).count() == 0
+
+    # Negative test cases
+    def test_failed_flush_does_not_block_other_sessions(
+        self, client, sample_user, live_workout, db_session, monkeypatch
+    ):
+        """Test one session failing to checkpoint leaves the others saved and itself pending."""
+        exercise_id = live_workout["exercises"][0]["exercise_id"]
+        other = client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "name": "Other Live Workout",
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "exercises": [{"exercise_id": exercise_id, "order": 1, "sets": []}]
+            }
+        ).json()
+        client.post(f"/api/workouts/{other['id']}/live")
+        for workout in (live_workout, other):
+            client.post(
+                f"/api/workouts/{workout['id']}/live/exercises/{workout['exercises'][0]['id']}/sets",
+                json={"set_number": 1, "reps": 5, "weight": 100}
+            )
+
+        flushed = live_store.on_exercise_flushed
+        broken_we_id = live_workout["exercises"][0]["id"]
+
+        def fail_for_one(db, user_id, we):
+            if we.id == broken_we_id:
+                raise RuntimeError("boom")
+            flushed(db, user_id, we)
+
+        monkeypatch.setattr(live_store, "on_exercise_flushed", fail_for_one)
+        live_store.checkpoint()
+
+        saved = db_session.query(WorkoutSet.workout_exercise_id).all()
+        assert saved == [(other["exercises"][0]["id"],)]
+        assert len(live_store._sessions[live_workout["id"]].pending) == 1
+
+    def test_regular_set_edits_rejected_while_live(self, client, live_workout):
+        """Test the non-live set endpoints refuse to touch a live workout."""
+        workout_id = live_workout["id"]
+        we_id = live_workout["exercises"][0]["id"]
+        response = client.post(
+            f"/api/workouts/exercises/{we_id}/sets",
+            json={"set_number": 1, "reps": 5, "weight": 100}
+        )
+        assert response.status_code == 409
+
+        temp_id = client.post(
+            f"/api/workouts/{workout_id}/live/exercises/{we_id}/sets",
+            json={"set_number": 1, "reps": 5, "weight": 100}
+        ).json()["id"]
+        client.post(f"/api/workouts/{workout_id}/live/checkpoint")
+        set_id = client.put(
+            f"/api/workouts/{workout_id}/live/sets/{temp_id}", json={"reps": 5}
+        ).json()["id"]
+
+        assert client.put(f"/api/workouts/sets/{set_id}", json={"reps": 8}).status_code == 409
+        assert client.delete(f"/api/workouts/sets/{set_id}").status_code == 409
+
+    def test_start_nonexistent_workout(self, client, live_journal):
+        """Test starting a live session for a missing workout."""
+        response = client.post("/api/workouts/99999/live")
+        assert response.status_code == 404
+
+    def test_add_set_when_not_live(self, client, sample_workout, live_journal):
+        """Test live edits are rejected when no session is open."""
+        response = client.post(
+            f"/api/workouts/{sample_workout['id']}/live/exercises/1/sets",
+            json={"set_number": 1}
+        )
+        assert response.status_code == 404
+
+    def test_add_set_unknown_exercise(self, client, live_workout):
+        """Test adding a set to an exercise outside the workout."""
+        response = client.post(
+            f"/api/workouts/{live_workout['id']}/live/exercises/99999/sets",
+            json={"set_number": 1}
+        )
+        assert response.status_code == 404
+
+    def test_update_unknown_set(self, client, live_workout):
+        """Test updating a set that does not exist."""
+        response = client.put(
+            f"/api/workouts/{live_workout['id']}/live/sets/99999",
+            json={"reps": 5}
+        )
+        assert response.status_code == 404
@@ -0,0 +1,126 @@
+import pytest
+from datetime import datetime, timezone, timedelta
+
+from models.database import DailyExerciseStat, DailyMuscleLoad
+from utils import migrations
+from utils.rollups import backfill_daily_stats, refresh_muscle_loads
+
+
+class TestDailyRollups:
+    """Test the daily exercise rollup table."""
+
+    def _rows(self, db):
+        db.expire_all()
+        return sorted(
+            (r.user_id, r.exercise_id, r.local_date, r.max_weight, r.total_volume,
+             r.max_reps, r.set_count, round(r.best_e1rm, 6))
+            for r in db.query(DailyExerciseStat).all()
+        )
+
+    def test_incremental_rollups_match_backfill(self, client, sample_user, db_session):
+        """Test rollups maintained on writes equal a full rebuild."""
+        exercises = client.get("/api/exercises/").json()
+        for days_ago in [0, 1, 8]:
+            client.post(
+                f"/api/workouts/?user_id={sample_user['id']}",
+                json={
+                    "started_at": (datetime.now(timezone.utc) - timedelta(days=days_ago)).isoformat(),
+                    "exercises": [
+                        {
+                            "exercise_id": exercises[0]["id"],
+                            "order": 1,
+                            "sets": [
+                                {"set_number": 1, "reps": 10, "weight": 40, "is_warmup": True},
+                                {"set_number": 2, "reps": 5, "weight": 100 + days_ago},
+                                {"set_number": 3, "reps": 1, "weight": 120}
+                            ]
+                        },
+                        {
+                            "exercise_id": exercises[1]["id"],
+                            "order": 2,
+                            "sets": [{"set_number": 1, "reps": 8}]
+                        }
+                    ]
+                }
+            )
+
+        incremental = self._rows(db_session)
+        backfill_daily_stats(db_session)
+        db_session.commit()
+        assert self._rows(db_session) == incremental
+        assert len(incremental) == 3
+
+    def test_rollup_values(self, client, sample_user, db_session):
+        """Test warmups are excluded and the estimated 1RM is computed."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "exercises": [
+                    {
+                        "exercise_id": exercise_id,
+                        "order": 1,
+                        "sets": [
+                            {"set_number": 1, "reps": 10, "weight": 200, "is_warmup": True},
+                            {"set_number": 2, "reps": 6, "weight": 100},
+                            {"set_number": 3, "reps": 3, "weight": 110}
+                        ]
+                    }
+                ]
+            }
+        )
+
+        row = db_session.query(DailyExerciseStat).one()
+        assert row.max_weight == 110
+        assert row.total_volume == 930
+        assert row.max_reps == 6
+        assert row.set_count == 2
+        assert row.best_e1rm == pytest.approx(121.0)
+
+    def test_muscle_loads_follow_set_changes(self, client, sample_user, db_session):
+        """Test muscle loads are kept current on set edits and match a rebuild."""
+        exercise = client.get("/api/exercises/").json()[0]  # Bench Press: chest, triceps
+        workout = client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "exercises": [
+                    {
+                        "exercise_id": exercise["id"],
+                        "order": 1,
+                        "sets": [
+                            {"set_number": 1, "reps": 10, "weight": 40, "is_warmup": True},
+                            {"set_number": 2, "reps": 5, "weight": 100},
+                            {"set_number": 3, "reps": 5, "weight": 100}
+                        ]
+                    }
+                ]
+            }
+        ).json()
+        last_set = workout["exercises"][0]["sets"][-1]
+        client.put(f"/api/workouts/sets/{last_set['id']}", json={"set_number": 3, "reps": 8, "weight": 100})
+
+        def loads():
+            db_session.expire_all()
+            return sorted(
+                (r.user_id, r.muscle_group, r.local_date, r.volume, r.hard_sets)
+                for r in db_session.query(DailyMuscleLoad).all()
+            )
+
+        incremental = loads()
+        assert [(r[1], r[3], r[4]) for r in incremental] == [("chest", 1300, 2), ("triceps", 1300, 2)]
+        refresh_muscle_loads(db_session)
+        db_session.commit()
+        assert loads() == incremental
+
+    def test_backfill_migrations_run_once(self, db_session, monkeypatch):
+        """Test rollup backfills are recorded and skipped on the next startup, even when empty."""
+        calls = []
+        monkeypatch.setattr(migrations, "DATA_MIGRATIONS", [
+            (name, lambda db, name=name: calls.append(name)) for name, _ in migrations.DATA_MIGRATIONS
+        ])
+
+        migrations.run_migrations(db_session.get_bind())
+        migrations.run_migrations(db_session.get_bind())
+        assert calls == ["daily_exercise_stats", "daily_muscle_loads", "leaderboard_entries", "user_streaks"]
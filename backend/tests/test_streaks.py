@@ -0,0 +1,107 @@
+import pytest
+from datetime import datetime, timezone, timedelta
+
+from models.database import AppliedMigration, UserStreak
+from utils.migrations import run_migrations
+from utils.streaks import compute_streak
+
+
+class TestIncrementalStreaks:
+    """Test the incrementally maintained user streak."""
+
+    def _log(self, client, user_id, days_ago):
+        started_at = datetime.now(timezone.utc) - timedelta(days=days_ago)
+        return client.post(
+            f"/api/workouts/?user_id={user_id}",
+            json={"started_at": started_at.isoformat(), "exercises": []}
+        ).json()
+
+    def _state(self, streak):
+        return (streak.total_workouts, streak.last_workout_date, streak.current_run, streak.longest_run)
+
+    def _assert_matches_sql(self, db, user_id):
+        db.expire_all()
+        stored = db.get(UserStreak, user_id)
+        assert self._state(stored) == self._state(compute_streak(db, user_id))
+        return stored
+
+    def test_incremental_streak_matches_sql(self, client, sample_user, db_session):
+        """Test creates, backdated workouts and deletes keep the stored streak exact."""
+        user_id = sample_user["id"]
+        logged = {}
+        for days_ago in [9, 8, 3, 2, 2, 1, 0]:
+            logged[days_ago] = self._log(client, user_id, days_ago)
+        streak = self._assert_matches_sql(db_session, user_id)
+        assert (streak.current_run, streak.longest_run, streak.total_workouts) == (4, 4, 7)
+
+        # Backdated workouts bridging the gap join both runs
+        for days_ago in [7, 6, 5, 4]:
+            self._log(client, user_id, days_ago)
+        streak = self._assert_matches_sql(db_session, user_id)
+        assert (streak.current_run, streak.longest_run) == (10, 10)
+
+        # Removing one of two workouts on a day leaves the run intact
+        client.delete(f"/api/workouts/{logged[2]['id']}")
+        streak = self._assert_matches_sql(db_session, user_id)
+        assert (streak.current_run, streak.longest_run, streak.total_workouts) == (10, 10, 10)
+
+        # Removing today's only workout ends the run yesterday
+        client.delete(f"/api/workouts/{logged[0]['id']}")
+        streak = self._assert_matches_sql(db_session, user_id)
+        assert (streak.current_run, streak.longest_run, streak.total_workouts) == (9, 9, 9)
+
+    def test_deleting_a_day_splits_the_run(self, client, sample_user, db_session):
+        """Test deleting the only workout on a day splits the run in two."""
+        user_id = sample_user["id"]
+        workouts = [self._log(client, user_id, days_ago) for days_ago in [4, 3, 2, 1, 0]]
+        client.delete(f"/api/workouts/{workouts[2]['id']}")
+
+        streak = self._assert_matches_sql(db_session, user_id)
+        assert (streak.current_run, streak.longest_run, streak.total_workouts) == (2, 2, 4)
+
+    def test_streak_endpoint_reads_stored_row(self, client, sample_user):
+        """Test the endpoint reports current and longest streaks."""
+        user_id = sample_user["id"]
+        for days_ago in [10, 9, 8, 1, 0]:
+            self._log(client, user_id, days_ago)
+
+        data = client.get(f"/api/analytics/streak?user_id={user_id}").json()
+        assert data["current_streak"] == 2
+        assert data["longest_streak"] == 3
+        assert data["total_workouts"] == 5
+
+    def test_broken_streak_is_not_current(self, client, sample_user):
+        """Test a run ending before yesterday is not the current streak."""
+        user_id = sample_user["id"]
+        for days_ago in [5, 4, 3]:
+            self._log(client, user_id, days_ago)
+
+        data = client.get(f"/api/analytics/streak?user_id={user_id}").json()
+        assert data["current_streak"] == 0
+        assert data["longest_streak"] == 3
+
+    def test_missing_row_is_computed_from_sql(self, client, sample_user, db_session):
+        """Test users without a stored streak get it computed, without a write from the read."""
+        user_id = sample_user["id"]
+        for days_ago in [2, 1]:
+            self._log(client, user_id, days_ago)
+        db_session.query(UserStreak).delete()
+        db_session.commit()
+
+        data = client.get(f"/api/analytics/streak?user_id={user_id}").json()
+        assert data["current_streak"] == 2
+        assert data["total_workouts"] == 2
+        db_session.expire_all()
+        assert db_session.get(UserStreak, user_id) is None
+
+    def test_migration_stores_missing_streaks(self, client, sample_user, db_session):
+        """Test the startup migration fills user_streaks for users who predate it."""
+        user_id = sample_user["id"]
+        self._log(client, user_id, 1)
+        db_session.query(UserStreak).delete()
+        db_session.query(AppliedMigration).delete()
+        db_session.commit()
+
+        run_migrations(db_session.get_bind())
+        db_session.expire_all()
+        assert db_session.get(UserStreak, user_id).total_workouts == 1
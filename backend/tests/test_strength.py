@@ -0,0 +1,32 @@
+import numpy as np
+
+from utils.strength import asof_indices, dots, wilks
+
+
+class TestStrength:
+    """Test cases for relative-strength scoring"""
+
+    # Positive test cases
+    def test_dots_reference_values(self):
+        """Test DOTS against published coefficients."""
+        scores = dots(np.array([100.0, 100.0]), np.array([100.0, 60.0]), "male")
+        assert np.allclose(scores, [61.55, 84.40], atol=0.01)
+        assert np.isclose(dots(np.array([100.0]), np.array([60.0]), "female")[0], 110.85, atol=0.01)
+
+    def test_wilks_reference_values(self):
+        """Test Wilks against published coefficients."""
+        assert np.isclose(wilks(np.array([100.0]), np.array([100.0]), "male")[0], 60.86, atol=0.01)
+        assert np.isclose(wilks(np.array([100.0]), np.array([60.0]), "female")[0], 111.49, atol=0.01)
+
+    def test_body_weight_clamped(self):
+        """Test body weights beyond the formula's range score like its bounds."""
+        assert dots(np.array([100.0]), np.array([300.0]))[0] == dots(np.array([100.0]), np.array([210.0]))[0]
+
+    def test_asof_indices(self):
+        """Test each lookup maps to the latest sample on or before it."""
+        assert asof_indices([10, 20, 30], [5, 10, 25, 40]).tolist() == [-1, 0, 1, 2]
+
+    # Negative test cases
+    def test_asof_indices_no_samples(self):
+        """Test lookups without samples map to -1."""
+        assert asof_indices([], [1, 2]).tolist() == [-1, -1]
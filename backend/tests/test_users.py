@@ -134,6 +134,17 @@ class TestUsersAPI:
         user_response = client.get(f"/api/users/{sample_user['id']}")
         assert user_response.json()["has_profile_picture"] is False
 
+    def test_update_user_timezone(self, client, sample_user):
+        """Test setting a user's timezone."""
+        assert sample_user["timezone"] == "UTC"
+        response = client.put(
+            f"/api/users/{sample_user['id']}",
+            json={"timezone": "Europe/Berlin"}
+        )
+        assert response.status_code == 200
+        assert response.json()["timezone"] == "Europe/Berlin"
+        assert client.get(f"/api/users/{sample_user['id']}").json()["timezone"] == "Europe/Berlin"
+
     # Negative test cases
     def test_create_user_empty_name(self, client):
         """Test creating user with empty name."""
@@ -209,3 +220,11 @@ class TestUsersAPI:
             json={"name": ""}
         )
         assert response.status_code == 422
+
+    def test_update_user_unknown_timezone(self, client, sample_user):
+        """Test an unknown timezone is rejected."""
+        response = client.put(
+            f"/api/users/{sample_user['id']}",
+            json={"timezone": "Mars/Olympus_Mons"}
+        )
+        assert response.status_code == 400
@@ -337,6 +337,109 @@ class TestWorkoutsAPI:
         assert workout["total_sets"] == 2
         assert workout["total_volume"] == 1000  # 10*50 + 10*50
 
+    def test_repeat_workout(self, client, sample_user):
+        """Test repeating a workout copies exercises and set targets."""
+        exercises = client.get("/api/exercises/").json()
+        source = client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "name": "Push Day",
+                "started_at": (datetime.now(timezone.utc) - timedelta(days=7)).isoformat(),
+                "exercises": [
+                    {
+                        "exercise_id": exercises[0]["id"],
+                        "order": 1,
+                        "sets": [
+                            {"set_number": 1, "reps": 5, "weight": 100, "is_completed": True},
+                            {"set_number": 2, "reps": 5, "weight": 105, "is_completed": True}
+                        ]
+                    },
+                    {
+                        "exercise_id": exercises[1]["id"],
+                        "order": 2,
+                        "sets": [{"set_number": 1, "reps": 8, "weight": 60}]
+                    }
+                ]
+            }
+        ).json()
+
+        response = client.post(f"/api/workouts/{source['id']}/repeat")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] != source["id"]
+        assert data["name"] == "Push Day"
+        assert [e["exercise_id"] for e in data["exercises"]] == [exercises[0]["id"], exercises[1]["id"]]
+        first_sets = sorted(data["exercises"][0]["sets"], key=lambda s: s["set_number"])
+        assert [s["weight"] for s in first_sets] == [100, 105]
+        assert all(s["is_completed"] is False for s in first_sets)
+        assert len(data["exercises"][1]["sets"]) == 1
+
+    def test_repeat_workout_without_sets(self, client, sample_user):
+        """Test repeating a workout without copying sets."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        source = client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "exercises": [
+                    {"exercise_id": exercise_id, "order": 1, "sets": [{"set_number": 1, "reps": 5}]}
+                ]
+            }
+        ).json()
+
+        response = client.post(f"/api/workouts/{source['id']}/repeat?include_sets=false")
+        assert response.status_code == 200
+        assert response.json()["exercises"][0]["sets"] == []
+
+    def test_save_workout_as_template(self, client, sample_user):
+        """Test saving a workout as a template derives targets from working sets."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        source = client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={
+                "name": "Heavy Bench",
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "exercises": [
+                    {
+                        "exercise_id": exercise_id,
+                        "order": 1,
+                        "sets": [
+                            {"set_number": 1, "reps": 10, "weight": 40, "is_warmup": True},
+                            {"set_number": 2, "reps": 5, "weight": 100, "rest_seconds": 180},
+                            {"set_number": 3, "reps": 5, "weight": 100, "rest_seconds": 180}
+                        ]
+                    }
+                ]
+            }
+        ).json()
+
+        response = client.post(f"/api/workouts/{source['id']}/to-template")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["name"] == "Heavy Bench"
+        assert data["user_id"] == sample_user["id"]
+        template_ex = data["exercises"][0]
+        assert template_ex["target_sets"] == 2
+        assert template_ex["target_reps"] == "5"
+        assert template_ex["target_weight"] == 100
+        assert template_ex["rest_seconds"] == 180
+
+    def test_save_workout_as_template_without_targets(self, client, sample_user, sample_workout):
+        """Test saving a template with a custom name and no targets."""
+        exercise_id = client.get("/api/exercises/").json()[0]["id"]
+        client.post(
+            f"/api/workouts/{sample_workout['id']}/exercises",
+            json={"exercise_id": exercise_id, "order": 1, "sets": [{"set_number": 1, "reps": 5}]}
+        )
+
+        response = client.post(
+            f"/api/workouts/{sample_workout['id']}/to-template?name=Copy&include_targets=false"
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["name"] == "Copy"
+        assert data["exercises"][0]["target_sets"] is None
+
     # Negative test cases
     def test_get_nonexistent_workout(self, client):
         """Test getting workout that doesn't exist."""
@@ -446,3 +549,24 @@ class TestWorkoutsAPI:
         response = client.get("/api/workouts/prs/99999")
         assert response.status_code == 200
         assert response.json() == []
+
+    def test_repeat_nonexistent_workout(self, client):
+        """Test repeating a workout that doesn't exist."""
+        response = client.post("/api/workouts/99999/repeat")
+        assert response.status_code == 404
+
+    def test_repeat_workout_stays_with_its_owner(self, client, sample_user):
+        """Test a repeat cannot be copied into another profile."""
+        source = client.post(
+            f"/api/workouts/?user_id={sample_user['id']}",
+            json={"started_at": datetime.now(timezone.utc).isoformat(), "exercises": []}
+        ).json()
+
+        response = client.post(f"/api/workouts/{source['id']}/repeat?user_id=99999")
+        assert response.status_code == 200
+        assert response.json()["user_id"] == sample_user["id"]
+
+    def test_save_nonexistent_workout_as_template(self, client):
+        """Test saving a missing workout as a template."""
+        response = client.post("/api/workouts/99999/to-template")
+        assert response.status_code == 404
@@ -0,0 +1,123 @@
+"""Admission control for expensive read endpoints.
+
+Each ``AdmissionGate`` lets a fixed number of requests run and parks a bounded
+number of others in a FIFO queue on the event loop. Queued requests do not hold
+a worker thread, so a burst of heavy analytics cannot take the threads that
+workout logging needs; logging routes are never gated. When the queue is full
+the request is turned away at once with 429, and a request that waits longer
+than the queue timeout gets 503. Both carry ``Retry-After``.
+
+Gates are used as route dependencies: ``dependencies=[Depends(gate)]``.
+"""
+import asyncio
+import os
+import time
+from collections import deque
+
+from fastapi import HTTPException
+
+MAX_CONCURRENT = int(os.environ.get("ANALYTICS_MAX_CONCURRENT", "4"))
+MAX_QUEUE = int(os.environ.get("ANALYTICS_MAX_QUEUE", "16"))
+QUEUE_TIMEOUT = float(os.environ.get("ANALYTICS_QUEUE_TIMEOUT_SECONDS", "10"))
+RETRY_AFTER_SECONDS = 2
+
+GATES = {}
+
+
+class AdmissionGate:
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int = MAX_CONCURRENT,
+        max_queue: int = MAX_QUEUE,
+        queue_timeout: float = QUEUE_TIMEOUT
+    ):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.peak_queue_depth = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        GATES[name] = self
+
+    def _refuse(self, status_code: int, detail: str):
+        raise HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+        )
+
+    async def acquire(self):
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            self._refuse(429, f"Too many {self.name} requests, try again shortly")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.peak_queue_depth = max(self.peak_queue_depth, len(self._waiters))
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except BaseException as e:
+            # Timed out, or the request was cancelled (client gone, shutdown)
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait ended
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+                waiter.cancel()
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                self._refuse(503, f"{self.name} is busy, try again shortly")
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self.admitted += 1
+
+    def release(self):
+        """Hand the slot to the oldest waiter, or free it"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    async def __call__(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        waits = self.admitted + self.timed_out
+        return {
+            "active": self.active,
+            "queue_depth": len(self._waiters),
+            "peak_queue_depth": self.peak_queue_depth,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "avg_wait_ms": round(self.total_wait_seconds * 1000 / waits, 2) if waits else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 2)
+        }
+
+
+def admission_stats() -> dict:
+    return {name: gate.stats() for name, gate in GATES.items()}
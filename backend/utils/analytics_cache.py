@@ -0,0 +1,218 @@
+"""Result cache for the analytics endpoints.
+
+Every write that can change a user's analytics calls ``bump_data_version``
+in the same transaction. Cached results are keyed by endpoint, query
+parameters, the user's data version and the user's local date, so a bump (or
+midnight) makes old entries unreachable instead of having to find and delete
+them.
+
+Results live in an in-process LRU. With ``ANALYTICS_CACHE_SHARED=1`` they are
+also written to the ``analytics_cache`` table so other workers can reuse them.
+Those rows are written through a session of their own, never the request's,
+and rows older than a day (past any local date still in a live key) are pruned.
+
+Identical requests that miss at the same time are coalesced: the first one
+computes the result and the others wait for it instead of repeating the work.
+"""
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from models.database import User, UserDataVersion, AnalyticsCacheEntry
+from utils.timezones import local_today
+
+CACHE_SIZE = int(os.environ.get("ANALYTICS_CACHE_SIZE", "1024"))
+SHARED_TIER = os.environ.get("ANALYTICS_CACHE_SHARED", "0") == "1"
+# A key embeds the local date, so no shared row is reachable for longer than a day
+SHARED_TTL = timedelta(hours=25)
+PRUNE_INTERVAL = 600  # seconds between sweeps of expired shared rows
+
+
+_bump_listeners = []
+
+
+def add_bump_listener(listener):
+    """Call listener(user_id) whenever this process bumps a user's data version"""
+    _bump_listeners.append(listener)
+
+
+def bump_data_version(db: Session, user_id: int):
+    """Invalidate everything cached for a user; commits with the caller's write"""
+    db.execute(
+        insert(UserDataVersion).values(user_id=user_id, version=1).on_conflict_do_update(
+            index_elements=[UserDataVersion.user_id],
+            set_={"version": UserDataVersion.version + 1}
+        )
+    )
+    if SHARED_TIER:
+        db.query(AnalyticsCacheEntry).filter(
+            AnalyticsCacheEntry.user_id == user_id
+        ).delete(synchronize_session=False)
+    for listener in _bump_listeners:
+        listener(user_id)
+
+
+class _Flight:
+    """A computation other requests for the same key can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class AnalyticsCache:
+    def __init__(self, max_entries: int = CACHE_SIZE, shared: bool = SHARED_TIER):
+        self.max_entries = max_entries
+        self.shared = shared
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+        self._pruned_at = None
+
+    def key(self, db: Session, user_id: int, endpoint: str, params: dict) -> str:
+        row = db.query(User.timezone, UserDataVersion.version).outerjoin(
+            UserDataVersion, UserDataVersion.user_id == User.id
+        ).filter(User.id == user_id).first()
+        tz_name, version = row if row else ("UTC", 0)
+        raw = json.dumps(
+            [endpoint, user_id, version or 0, local_today(tz_name).isoformat(), jsonable_encoder(params)],
+            sort_keys=True
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, db: Session, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+
+        if self.shared:
+            entry = db.get(AnalyticsCacheEntry, key)
+            if entry is not None:
+                value = json.loads(zlib.decompress(entry.value))
+                self._remember(key, value)
+                with self._lock:
+                    self.shared_hits += 1
+                return True, value
+
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def put(self, db: Session, key: str, user_id: int, value):
+        self._remember(key, value)
+        if not self.shared:
+            return
+        with Session(bind=db.get_bind()) as writer, writer.begin():
+            if writer.get(User, user_id) is not None:
+                writer.execute(insert(AnalyticsCacheEntry).values(
+                    key=key, user_id=user_id, value=zlib.compress(json.dumps(value).encode())
+                ).on_conflict_do_nothing())
+            if self._prune_due():
+                writer.query(AnalyticsCacheEntry).filter(
+                    AnalyticsCacheEntry.created_at < datetime.now(timezone.utc) - SHARED_TTL
+                ).delete(synchronize_session=False)
+
+    def _prune_due(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self._pruned_at is not None and now - self._pruned_at < PRUNE_INTERVAL:
+                return False
+            self._pruned_at = now
+            return True
+
+    def _remember(self, key: str, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def single_flight(self, key: str, compute):
+        """Run compute once for concurrent callers with the same key"""
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+        return flight.value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.shared_hits = self.misses = self.evictions = self.coalesced = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._inflight),
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "shared": self.shared
+            }
+
+    def cached(self, endpoint: str):
+        """Serve an analytics endpoint from the cache; it must take user_id and db"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(**kwargs):
+                db, user_id = kwargs["db"], kwargs["user_id"]
+                params = {k: v for k, v in kwargs.items() if k != "db"}
+                key = self.key(db, user_id, endpoint, params)
+                found, value = self.get(db, key)
+                if found:
+                    return value
+
+                def compute():
+                    result = jsonable_encoder(func(**kwargs))
+                    self.put(db, key, user_id, result)
+                    return result
+                return self.single_flight(key, compute)
+            return wrapper
+        return decorator
+
+
+analytics_cache = AnalyticsCache()
@@ -0,0 +1,215 @@
+"""Compare the analytics backends on a synthetic multi-year history.
+
+    python utils/benchmark_analytics.py [--years 5] [--repeat 5]
+
+Builds an in-memory database for one user, then times each computation as
+the original ORM loops, as grouped SQL and as NumPy group-bys over the
+columnar store (cold: arrays built for the call, warm: arrays reused).
+"""
+import argparse
+import random
+import sys
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, joinedload
+from sqlalchemy.pool import StaticPool
+
+from database import Base
+from models.database import User, Exercise, Workout, WorkoutExercise, WorkoutSet
+from routers import analytics
+from utils import columnar
+from utils.columnar import ColumnarStore
+from utils.rollups import backfill_daily_stats
+from utils.timezones import local_today
+
+EXERCISES = [
+    ("Bench Press", ["chest", "triceps"]),
+    ("Squat", ["quadriceps", "glutes"]),
+    ("Deadlift", ["back", "hamstrings"]),
+    ("Overhead Press", ["shoulders", "triceps"]),
+    ("Pull-Ups", ["back", "biceps"]),
+    ("Lunges", ["quadriceps", "glutes"]),
+]
+
+
+def seed(db, years: int) -> int:
+    rng = random.Random(42)
+    user = User(name="Benchmark")
+    exercises = [Exercise(name=name, category="strength", muscle_groups=groups) for name, groups in EXERCISES]
+    db.add_all([user, *exercises])
+    db.flush()
+
+    start = datetime.now(timezone.utc) - timedelta(days=365 * years)
+    for day in range(365 * years):
+        if rng.random() > 4 / 7:
+            continue
+        started_at = start + timedelta(days=day, hours=18)
+        workout = Workout(
+            user_id=user.id, started_at=started_at, local_date=started_at.date(),
+            duration_seconds=rng.randint(2400, 5400)
+        )
+        db.add(workout)
+        db.flush()
+        for order, exercise in enumerate(rng.sample(exercises, 4)):
+            we = WorkoutExercise(
+                workout_id=workout.id, exercise_id=exercise.id, user_id=user.id,
+                started_at=started_at, order=order
+            )
+            db.add(we)
+            db.flush()
+            db.add_all([
+                WorkoutSet(
+                    workout_exercise_id=we.id, set_number=n + 1, reps=rng.randint(3, 12),
+                    weight=float(rng.randint(20, 160)), is_warmup=n == 0, completed_at=started_at
+                )
+                for n in range(4)
+            ])
+    backfill_daily_stats(db, user.id)
+    db.commit()
+    return user.id
+
+
+# The per-row loops the analytics endpoints used before they moved to SQL
+
+def orm_progress(db, user_id, exercise_id, since):
+    sets = db.query(WorkoutSet).join(WorkoutExercise).join(Workout).filter(
+        Workout.user_id == user_id,
+        WorkoutExercise.exercise_id == exercise_id,
+        Workout.local_date >= since,
+        WorkoutSet.is_warmup == False
+    ).all()
+    values = {}
+    for s in sets:
+        if s.weight is None or s.reps is None:
+            continue
+        day = s.workout_exercise.workout.local_date
+        values[day] = max(values.get(day, s.weight), s.weight)
+    return values
+
+
+def orm_weekly(db, user_id, first_week, weeks):
+    summaries = []
+    for i in range(weeks):
+        week_start = first_week + timedelta(days=7 * i)
+        workouts = db.query(Workout).options(
+            joinedload(Workout.exercises).joinedload(WorkoutExercise.sets)
+        ).filter(
+            Workout.user_id == user_id,
+            Workout.local_date >= week_start,
+            Workout.local_date < week_start + timedelta(days=7)
+        ).all()
+        total_sets, volume, muscles = 0, 0.0, {}
+        for workout in workouts:
+            for we in workout.exercises:
+                exercise = db.query(Exercise).filter(Exercise.id == we.exercise_id).first()
+                for mg in exercise.muscle_groups:
+                    muscles[mg] = muscles.get(mg, 0) + len(we.sets)
+                for s in we.sets:
+                    total_sets += 1
+                    if s.weight and s.reps:
+                        volume += s.weight * s.reps
+        summaries.append((len(workouts), total_sets, volume, muscles))
+    return summaries
+
+
+def orm_balance(db, user_id, since):
+    muscles = {}
+    for we in db.query(WorkoutExercise).join(Workout).filter(
+        Workout.user_id == user_id, Workout.local_date >= since
+    ).all():
+        exercise = db.query(Exercise).filter(Exercise.id == we.exercise_id).first()
+        for mg in exercise.muscle_groups:
+            muscles[mg] = muscles.get(mg, 0) + len(we.sets)
+    return muscles
+
+
+def orm_frequency(db, user_id, since):
+    counts = {}
+    for w in db.query(Workout).filter(Workout.user_id == user_id, Workout.local_date >= since).all():
+        counts[w.local_date] = counts.get(w.local_date, 0) + 1
+    return counts
+
+
+def timed(fn, repeat: int) -> float:
+    """Best of `repeat` runs, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    user_id = seed(db, args.years)
+    exercise_id = db.query(Exercise.id).first()[0]
+
+    today = local_today()
+    since = today - timedelta(days=365)
+    weeks = 52
+    last_week = today - timedelta(days=today.weekday())
+    first_week = last_week - timedelta(days=7 * (weeks - 1))
+
+    def cold(compute):
+        return lambda: compute(ColumnarStore().columns(db, user_id))
+
+    warm_store = ColumnarStore()
+    warm_store.columns(db, user_id)
+
+    def warm(compute):
+        return lambda: compute(warm_store.columns(db, user_id))
+
+    cases = {
+        "exercise-progress (365d)": (
+            lambda: orm_progress(db, user_id, exercise_id, since),
+            lambda: analytics.get_exercise_progress.__wrapped__(
+                user_id=user_id, exercise_id=exercise_id, metric_type="weight", days=365, db=db
+            ),
+            lambda cols: columnar.exercise_progress(cols, exercise_id, "weight", since),
+        ),
+        "weekly series (52w)": (
+            lambda: orm_weekly(db, user_id, first_week, weeks),
+            lambda: analytics._weekly_totals(db, user_id, first_week, weeks),
+            lambda cols: columnar.weekly_totals(db, cols, first_week, weeks),
+        ),
+        "muscle balance (365d)": (
+            lambda: orm_balance(db, user_id, since),
+            lambda: analytics.get_muscle_group_balance.__wrapped__(user_id=user_id, days=365, db=db),
+            lambda cols: columnar.muscle_group_balance(db, cols, since),
+        ),
+        "frequency (365d)": (
+            lambda: orm_frequency(db, user_id, since),
+            lambda: analytics.get_workout_frequency.__wrapped__(user_id=user_id, days=365, db=db),
+            lambda cols: columnar.workout_frequency(cols, since),
+        ),
+    }
+
+    sets = db.query(WorkoutSet).count()
+    print(f"{args.years} years, {db.query(Workout).count()} workouts, {sets} sets "
+          f"({warm_store.stats()['bytes'] / 1024:.0f} KiB as columns); best of {args.repeat}, ms")
+    print(f"{'computation':<26}{'orm loop':>10}{'sql':>10}{'np cold':>10}{'np warm':>10}")
+    for name, (orm, sql, vectorized) in cases.items():
+        print(
+            f"{name:<26}"
+            f"{timed(orm, args.repeat):>10.2f}"
+            f"{timed(sql, args.repeat):>10.2f}"
+            f"{timed(cold(vectorized), args.repeat):>10.2f}"
+            f"{timed(warm(vectorized), args.repeat):>10.2f}"
+        )
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
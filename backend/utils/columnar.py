@@ -0,0 +1,345 @@
+"""Per-user columnar copy of workout data for vectorized analytics.
+
+Enabled with ``ANALYTICS_BACKEND=columnar``. A user's sets, workout exercises
+and workouts are loaded once into parallel NumPy arrays (days are stored as
+proleptic ordinals) and the analytics endpoints group over those arrays
+instead of querying SQLite on every request.
+
+The copy is kept current incrementally: whenever the daily rollups are
+refreshed for some days, those days are marked dirty and only their rows are
+reloaded on the next read. The user's data version (see
+``utils.analytics_cache``) is checked on every read: unless every bump since
+the load came from a write that marked its days dirty (a workout's duration
+edit marks none, as does a write from another process), the user is fully
+reloaded. Cold users are evicted once the store grows past
+``ANALYTICS_COLUMNAR_MAX_BYTES``.
+"""
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from models.database import (
+    Workout, WorkoutExercise, WorkoutSet, ExerciseMuscleGroup, UserDataVersion
+)
+from utils import analytics_cache, rollups
+
+MAX_BYTES = int(os.environ.get("ANALYTICS_COLUMNAR_MAX_BYTES", str(64 * 1024 * 1024)))
+
+SET_COLUMNS = ("day", "exercise_id", "weight", "reps", "rpe", "is_warmup", "is_dropset", "is_failure")
+EXERCISE_COLUMNS = ("day", "exercise_id")
+WORKOUT_COLUMNS = ("day", "duration")
+
+
+def _ordinals(days: Iterable[Optional[date]]) -> np.ndarray:
+    return np.fromiter((d.toordinal() if d else 0 for d in days), dtype=np.int32)
+
+
+def _floats(values) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def _bools(values) -> np.ndarray:
+    return np.array([bool(v) for v in values], dtype=bool)
+
+
+class UserColumns:
+    """One user's sets, workout exercises and workouts as parallel arrays"""
+
+    def __init__(self, sets: Dict[str, np.ndarray], exercises: Dict[str, np.ndarray], workouts: Dict[str, np.ndarray]):
+        self.sets = sets
+        self.exercises = exercises
+        self.workouts = workouts
+        self.version = None
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for table in (self.sets, self.exercises, self.workouts) for a in table.values())
+
+    @classmethod
+    def load(cls, db: Session, user_id: int, days: Optional[Iterable[date]] = None) -> "UserColumns":
+        """Read a user's rows, optionally only those on the given days"""
+        set_query = db.query(
+            Workout.local_date, WorkoutExercise.exercise_id, WorkoutSet.weight, WorkoutSet.reps,
+            WorkoutSet.rpe, WorkoutSet.is_warmup, WorkoutSet.is_dropset, WorkoutSet.is_failure
+        ).select_from(WorkoutSet).join(
+            WorkoutExercise, WorkoutExercise.id == WorkoutSet.workout_exercise_id
+        ).join(
+            Workout, Workout.id == WorkoutExercise.workout_id
+        ).filter(Workout.user_id == user_id)
+        exercise_query = db.query(Workout.local_date, WorkoutExercise.exercise_id).join(
+            WorkoutExercise, WorkoutExercise.workout_id == Workout.id
+        ).filter(Workout.user_id == user_id)
+        workout_query = db.query(Workout.local_date, Workout.duration_seconds).filter(
+            Workout.user_id == user_id
+        )
+        if days is not None:
+            days = list(days)
+            set_query = set_query.filter(Workout.local_date.in_(days))
+            exercise_query = exercise_query.filter(Workout.local_date.in_(days))
+            workout_query = workout_query.filter(Workout.local_date.in_(days))
+
+        set_rows = list(zip(*set_query.all())) or [()] * len(SET_COLUMNS)
+        exercise_rows = list(zip(*exercise_query.all())) or [()] * len(EXERCISE_COLUMNS)
+        workout_rows = list(zip(*workout_query.all())) or [()] * len(WORKOUT_COLUMNS)
+
+        return cls(
+            sets={
+                "day": _ordinals(set_rows[0]),
+                "exercise_id": np.array(set_rows[1], dtype=np.int32),
+                "weight": _floats(set_rows[2]),
+                "reps": _floats(set_rows[3]),
+                "rpe": _floats(set_rows[4]),
+                "is_warmup": _bools(set_rows[5]),
+                "is_dropset": _bools(set_rows[6]),
+                "is_failure": _bools(set_rows[7]),
+            },
+            exercises={
+                "day": _ordinals(exercise_rows[0]),
+                "exercise_id": np.array(exercise_rows[1], dtype=np.int32),
+            },
+            workouts={
+                "day": _ordinals(workout_rows[0]),
+                "duration": _floats(workout_rows[1]),
+            }
+        )
+
+    def spliced(self, fresh: "UserColumns", days: Iterable[date]) -> "UserColumns":
+        """A copy with every row on the given days replaced by the rows in fresh"""
+        ordinals = np.array([d.toordinal() for d in days], dtype=np.int32)
+        tables = {}
+        for name in ("sets", "exercises", "workouts"):
+            table, update = getattr(self, name), getattr(fresh, name)
+            keep = ~np.isin(table["day"], ordinals)
+            tables[name] = {
+                column: np.concatenate([values[keep], update[column]])
+                for column, values in table.items()
+            }
+        return UserColumns(**tables)
+
+
+class ColumnarStore:
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._users = OrderedDict()
+        self._dirty = {}
+        self._marked = set()
+        self._bumps = {}
+        self._lock = threading.Lock()
+        self.full_loads = 0
+        self.partial_loads = 0
+        self.evictions = 0
+
+    def mark_dirty(self, user_id: Optional[int], days: Optional[Iterable[date]] = None):
+        """Note changed days; days=None (or user_id=None) forces a full reload"""
+        with self._lock:
+            if user_id is None:
+                self._users.clear()
+                self._dirty.clear()
+                self._marked.clear()
+                self._bumps.clear()
+                return
+            if days is None:
+                self._forget(user_id)
+                return
+            self._dirty.setdefault(user_id, set()).update(days)
+            self._marked.add(user_id)
+
+    def version_bumped(self, user_id: int):
+        """Count a write's version bump if it marked its days dirty, else reload the user"""
+        with self._lock:
+            if user_id in self._marked:
+                self._marked.discard(user_id)
+                self._bumps[user_id] = self._bumps.get(user_id, 0) + 1
+            else:
+                self._forget(user_id)
+
+    def _forget(self, user_id: int):
+        self._users.pop(user_id, None)
+        self._dirty.pop(user_id, None)
+        self._bumps.pop(user_id, None)
+
+    def columns(self, db: Session, user_id: int) -> UserColumns:
+        version = db.query(UserDataVersion.version).filter(
+            UserDataVersion.user_id == user_id
+        ).scalar() or 0
+
+        with self._lock:
+            cached = self._users.get(user_id)
+            if cached is not None and cached.version == version and user_id not in self._dirty:
+                self._users.move_to_end(user_id)
+                return cached
+            dirty = self._dirty.pop(user_id, None)
+            bumps = self._bumps.pop(user_id, 0)
+
+        # Splicing is only safe when every write since the load said which days it changed
+        if cached is not None and dirty and cached.version + bumps == version:
+            columns = cached.spliced(UserColumns.load(db, user_id, dirty), dirty)
+            self.partial_loads += 1
+        else:
+            columns = UserColumns.load(db, user_id)
+            self.full_loads += 1
+        columns.version = version
+
+        with self._lock:
+            self._users[user_id] = columns
+            self._users.move_to_end(user_id)
+            self._evict(keep=user_id)
+        return columns
+
+    def _evict(self, keep: int):
+        total = sum(c.nbytes for c in self._users.values())
+        while total > self.max_bytes and len(self._users) > 1:
+            user_id, columns = next(iter(self._users.items()))
+            if user_id == keep:
+                self._users.move_to_end(user_id)
+                continue
+            del self._users[user_id]
+            total -= columns.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+            self._dirty.clear()
+            self._marked.clear()
+            self._bumps.clear()
+            self.full_loads = self.partial_loads = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "users": len(self._users),
+                "bytes": sum(c.nbytes for c in self._users.values()),
+                "max_bytes": self.max_bytes,
+                "full_loads": self.full_loads,
+                "partial_loads": self.partial_loads,
+                "evictions": self.evictions
+            }
+
+
+columnar_store = ColumnarStore()
+rollups.add_refresh_listener(columnar_store.mark_dirty)
+analytics_cache.add_bump_listener(columnar_store.version_bumped)
+
+
+# Vectorized analytics
+
+def _working_sets(sets: Dict[str, np.ndarray]) -> np.ndarray:
+    """Same filter as the daily rollups: non-warmup sets with weight and reps"""
+    return ~sets["is_warmup"] & ~np.isnan(sets["weight"]) & ~np.isnan(sets["reps"])
+
+
+def _group_max(keys: np.ndarray, values: np.ndarray):
+    unique, inverse = np.unique(keys, return_inverse=True)
+    out = np.full(len(unique), -np.inf)
+    np.maximum.at(out, inverse, values)
+    return unique, out
+
+
+def exercise_progress(columns: UserColumns, exercise_id: int, metric_type: str, since: date):
+    """Per-day max weight, total volume or max reps for one exercise"""
+    sets = columns.sets
+    mask = _working_sets(sets) & (sets["exercise_id"] == exercise_id) & (sets["day"] >= since.toordinal())
+    days, weight, reps = sets["day"][mask], sets["weight"][mask], sets["reps"][mask]
+
+    if metric_type == "volume":
+        unique, inverse = np.unique(days, return_inverse=True)
+        values = np.bincount(inverse, weights=weight * reps, minlength=len(unique))
+    elif metric_type == "reps":
+        unique, values = _group_max(days, reps)
+        values = values.astype(np.int64)
+    else:
+        unique, values = _group_max(days, weight)
+
+    return [date.fromordinal(int(d)).isoformat() for d in unique], values.tolist()
+
+
+def _muscle_counts(db: Session, exercise_keys: np.ndarray, exercise_ids: np.ndarray,
+                   set_keys: np.ndarray, set_exercise_ids: np.ndarray) -> Dict[int, Dict[str, int]]:
+    """Set counts per (bucket, muscle group); exercises done without sets count as zero"""
+    present = np.unique(np.stack([exercise_keys, exercise_ids]), axis=1) if len(exercise_ids) else np.empty((2, 0), np.int64)
+    if len(set_exercise_ids):
+        pairs, counts = np.unique(np.stack([set_keys, set_exercise_ids]), axis=1, return_counts=True)
+    else:
+        pairs, counts = np.empty((2, 0), np.int64), np.empty(0, np.int64)
+    set_counts = {(int(k), int(e)): int(c) for k, e, c in zip(pairs[0], pairs[1], counts)}
+
+    groups = defaultdict(list)
+    if present.shape[1]:
+        for exercise_id, muscle_group in db.query(
+            ExerciseMuscleGroup.exercise_id, ExerciseMuscleGroup.muscle_group
+        ).filter(ExerciseMuscleGroup.exercise_id.in_(np.unique(present[1]).tolist())):
+            groups[exercise_id].append(muscle_group)
+
+    result = defaultdict(dict)
+    for key, exercise_id in zip(present[0].tolist(), present[1].tolist()):
+        count = set_counts.get((key, exercise_id), 0)
+        for muscle_group in groups[exercise_id]:
+            result[key][muscle_group] = result[key].get(muscle_group, 0) + count
+    return result
+
+
+def muscle_group_balance(db: Session, columns: UserColumns, since: date) -> Dict[str, int]:
+    """Set counts per muscle group since a day"""
+    cutoff = since.toordinal()
+    exercises, sets = columns.exercises, columns.sets
+    in_range = exercises["day"] >= cutoff
+    sets_in_range = sets["day"] >= cutoff
+    counts = _muscle_counts(
+        db,
+        np.zeros(int(in_range.sum()), dtype=np.int64), exercises["exercise_id"][in_range],
+        np.zeros(int(sets_in_range.sum()), dtype=np.int64), sets["exercise_id"][sets_in_range]
+    )
+    return counts.get(0, {})
+
+
+def workout_frequency(columns: UserColumns, since: date) -> Dict[str, int]:
+    """Workouts per local day since a day"""
+    days = columns.workouts["day"]
+    unique, counts = np.unique(days[days >= since.toordinal()], return_counts=True)
+    return {date.fromordinal(int(d)).isoformat(): int(c) for d, c in zip(unique, counts)}
+
+
+def weekly_totals(db: Session, columns: UserColumns, first_week: date, weeks: int) -> List[dict]:
+    """Workout, duration, set, volume and muscle group totals for consecutive weeks"""
+    start = first_week.toordinal()
+
+    def week_index(days: np.ndarray):
+        index = (days.astype(np.int64) - start) // 7
+        return index, (index >= 0) & (index < weeks)
+
+    workout_week, workout_in = week_index(columns.workouts["day"])
+    workout_counts = np.bincount(workout_week[workout_in], minlength=weeks)
+    durations = np.bincount(
+        workout_week[workout_in], weights=np.nan_to_num(columns.workouts["duration"][workout_in]), minlength=weeks
+    )
+
+    sets = columns.sets
+    set_week, set_in = week_index(sets["day"])
+    set_counts = np.bincount(set_week[set_in], minlength=weeks)
+    volume = np.nan_to_num(sets["weight"] * sets["reps"])
+    volumes = np.bincount(set_week[set_in], weights=volume[set_in], minlength=weeks)
+
+    exercise_week, exercise_in = week_index(columns.exercises["day"])
+    muscles = _muscle_counts(
+        db,
+        exercise_week[exercise_in], columns.exercises["exercise_id"][exercise_in],
+        set_week[set_in], sets["exercise_id"][set_in]
+    )
+
+    return [
+        {
+            "week_start": first_week + timedelta(days=7 * i),
+            "total_workouts": int(workout_counts[i]),
+            "total_duration_seconds": int(durations[i]),
+            "total_volume": float(volumes[i]),
+            "total_sets": int(set_counts[i]),
+            "muscle_groups_worked": muscles.get(i, {})
+        }
+        for i in range(weeks)
+    ]
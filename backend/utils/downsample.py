@@ -0,0 +1,44 @@
+"""Shape-preserving downsampling for chart series."""
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], max_points: int) -> List[int]:
+    """Largest-Triangle-Three-Buckets: indices of the points to keep.
+
+    The first and last points are always kept. Every bucket in between keeps
+    the point forming the largest triangle with the previously kept point and
+    the average of the next bucket, which preserves peaks and troughs.
+    """
+    n = len(xs)
+    if max_points >= n or max_points < 3:
+        return list(range(n))
+
+    x = np.asarray(xs, dtype=np.float64)
+    y = np.asarray(ys, dtype=np.float64)
+    # Bucket boundaries over the points between the first and last
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+
+    kept = [0]
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+
+        a = kept[-1]
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        kept.append(int(start + np.argmax(areas)))
+    kept.append(n - 1)
+    return kept
+
+
+def downsample_series(dates: List[str], values: List[float], max_points: Optional[int]) -> Tuple[List[str], List[float]]:
+    """Reduce an ISO-date series to at most max_points with LTTB"""
+    if max_points is None or len(dates) <= max_points:
+        return dates, values
+    xs = [np.datetime64(d, "D").astype(np.int64) for d in dates]
+    kept = lttb(xs, values, max_points)
+    return [dates[i] for i in kept], [values[i] for i in kept]
@@ -0,0 +1,337 @@
+"""Embedded DuckDB mirror of workout data for wide historical aggregations.
+
+Enabled with ``ANALYTICS_BACKEND=duckdb`` (requires the optional ``duckdb``
+package). Each user's workout exercises, left-joined to their sets and
+denormalised with the workout's local date, are copied into a columnar
+``set_facts`` table; workouts and exercise muscle groups get their own
+tables. Aggregations then run in DuckDB instead of holding SQLite read
+locks while writers wait.
+
+Like the columnar store, the mirror follows rollup refreshes: changed days
+are marked dirty and only their rows are re-ingested on the next read. A
+data version that moved by more than the bumps of those dirty-marking writes
+(a workout-level edit, or a write from another process) re-ingests the whole
+user. Syncs are serialised per user only, and every thread queries through
+its own cursor, so one user's re-ingest does not hold up another user's
+read. The default in-memory database is private to each worker; point
+``ANALYTICS_DUCKDB_PATH`` at a file only when running a single worker.
+
+    python utils/duckdb_mirror.py
+
+checks every user's mirrored results against the SQLite path.
+"""
+import os
+import sys
+import threading
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sqlalchemy.orm import Session
+
+from models.database import Workout, WorkoutExercise, WorkoutSet, ExerciseMuscleGroup, UserDataVersion
+from utils import analytics_cache, rollups
+
+try:
+    import duckdb
+except ImportError:  # optional dependency
+    duckdb = None
+
+DUCKDB_PATH = os.environ.get("ANALYTICS_DUCKDB_PATH", ":memory:")
+
+SCHEMA = [
+    # One row per set, plus one with NULL set columns for each workout exercise without sets
+    "CREATE TABLE IF NOT EXISTS set_facts ("
+    "user_id INTEGER, local_date DATE, workout_exercise_id INTEGER, exercise_id INTEGER, "
+    "set_id INTEGER, weight DOUBLE, reps INTEGER, is_warmup BOOLEAN)",
+    "CREATE TABLE IF NOT EXISTS workout_facts ("
+    "user_id INTEGER, local_date DATE, workout_id INTEGER, duration_seconds INTEGER)",
+    "CREATE TABLE IF NOT EXISTS exercise_muscle_groups (exercise_id INTEGER, muscle_group VARCHAR)",
+    "CREATE TABLE IF NOT EXISTS synced_users (user_id INTEGER PRIMARY KEY, version INTEGER)",
+]
+
+SET_COLUMNS = ("user_id", "local_date", "workout_exercise_id", "exercise_id", "set_id", "weight", "reps", "is_warmup")
+WORKOUT_COLUMNS = ("user_id", "local_date", "workout_id", "duration_seconds")
+
+
+def available() -> bool:
+    return duckdb is not None
+
+
+def _insert(conn, table: str, columns: tuple, rows: list):
+    """Bulk insert by binding each column as one list and unnesting them side by side"""
+    if not rows:
+        return
+    values = [list(column) for column in zip(*rows)]
+    unnested = ", ".join(f"unnest(?) AS {name}" for name in columns)
+    conn.execute(f"INSERT INTO {table} ({', '.join(columns)}) SELECT {unnested}", values)
+
+
+class DuckDBMirror:
+    def __init__(self, path: str = DUCKDB_PATH):
+        self.path = path
+        self._conn = None
+        self._local = threading.local()
+        self._dirty = {}
+        self._marked = set()
+        self._bumps = {}
+        self._stale = set()
+        self._generation = 0
+        self._synced_generation = {}
+        self._user_locks = {}
+        self._lock = threading.Lock()  # guards the bookkeeping above, never held during a sync
+        self._dimension_lock = threading.Lock()
+        self.full_syncs = 0
+        self.partial_syncs = 0
+
+    def _connection(self):
+        if self._conn is None:
+            if duckdb is None:
+                raise RuntimeError("ANALYTICS_BACKEND=duckdb requires the duckdb package")
+            self._conn = duckdb.connect(self.path)
+            for statement in SCHEMA:
+                self._conn.execute(statement)
+        return self._conn
+
+    def _cursor(self):
+        """This thread's cursor; a DuckDB connection must not be used from two threads at once"""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            with self._lock:
+                conn = self._connection()
+            cursor = self._local.cursor = conn.cursor()
+        return cursor
+
+    def _user_lock(self, user_id: int) -> threading.Lock:
+        with self._lock:
+            return self._user_locks.setdefault(user_id, threading.Lock())
+
+    def mark_dirty(self, user_id: Optional[int], days: Optional[Iterable[date]] = None):
+        """Note changed days; days=None (or user_id=None) forces a full re-ingest"""
+        with self._lock:
+            if self._conn is None:
+                return
+            if user_id is None:
+                self._generation += 1
+                self._dirty.clear()
+                self._marked.clear()
+                self._bumps.clear()
+                return
+            if days is None:
+                self._forget(user_id)
+                return
+            self._dirty.setdefault(user_id, set()).update(days)
+            self._marked.add(user_id)
+
+    def version_bumped(self, user_id: int):
+        """Count a write's version bump if it marked its days dirty, else re-ingest the user"""
+        with self._lock:
+            if self._conn is None:
+                return
+            if user_id in self._marked:
+                self._marked.discard(user_id)
+                self._bumps[user_id] = self._bumps.get(user_id, 0) + 1
+            else:
+                self._forget(user_id)
+
+    def _forget(self, user_id: int):
+        self._stale.add(user_id)
+        self._dirty.pop(user_id, None)
+        self._bumps.pop(user_id, None)
+
+    def _ingest(self, cursor, db: Session, user_id: int, days: Optional[List[date]]):
+        set_query = db.query(
+            Workout.user_id, Workout.local_date, WorkoutExercise.id, WorkoutExercise.exercise_id,
+            WorkoutSet.id, WorkoutSet.weight, WorkoutSet.reps, WorkoutSet.is_warmup
+        ).select_from(Workout).join(
+            WorkoutExercise, WorkoutExercise.workout_id == Workout.id
+        ).outerjoin(
+            WorkoutSet, WorkoutSet.workout_exercise_id == WorkoutExercise.id
+        ).filter(Workout.user_id == user_id)
+        workout_query = db.query(
+            Workout.user_id, Workout.local_date, Workout.id, Workout.duration_seconds
+        ).filter(Workout.user_id == user_id)
+
+        scope, params = "user_id = ?", [user_id]
+        if days is not None:
+            set_query = set_query.filter(Workout.local_date.in_(days))
+            workout_query = workout_query.filter(Workout.local_date.in_(days))
+            scope, params = "user_id = ? AND list_contains(?, local_date)", [user_id, days]
+        set_rows, workout_rows = set_query.all(), workout_query.all()
+
+        # One transaction per user: other users' rows are never touched, so syncs don't conflict
+        cursor.begin()
+        try:
+            cursor.execute(f"DELETE FROM set_facts WHERE {scope}", params)
+            cursor.execute(f"DELETE FROM workout_facts WHERE {scope}", params)
+            _insert(cursor, "set_facts", SET_COLUMNS, set_rows)
+            _insert(cursor, "workout_facts", WORKOUT_COLUMNS, workout_rows)
+            cursor.commit()
+        except Exception:
+            cursor.rollback()
+            raise
+
+        # Muscle groups are a small dimension shared by all users; refresh it whole, one sync at a time
+        muscle_groups = db.query(ExerciseMuscleGroup.exercise_id, ExerciseMuscleGroup.muscle_group).all()
+        with self._dimension_lock:
+            cursor.begin()
+            try:
+                cursor.execute("DELETE FROM exercise_muscle_groups")
+                _insert(cursor, "exercise_muscle_groups", ("exercise_id", "muscle_group"), muscle_groups)
+                cursor.commit()
+            except Exception:
+                cursor.rollback()
+                raise
+
+    def query(self, db: Session, user_id: int, sql: str, params: list) -> list:
+        """Bring the user's rows up to date, then run sql against the mirror"""
+        version = db.query(UserDataVersion.version).filter(
+            UserDataVersion.user_id == user_id
+        ).scalar() or 0
+        cursor = self._cursor()
+
+        # Only this user's sync is serialised; other users' syncs and every query run alongside it
+        with self._user_lock(user_id):
+            with self._lock:
+                dirty = self._dirty.pop(user_id, None)
+                bumps = self._bumps.pop(user_id, 0)
+                stale = user_id in self._stale
+                self._stale.discard(user_id)
+                generation = self._generation
+                if self._synced_generation.get(user_id, 0) != generation:
+                    stale = True
+            synced = None if stale else cursor.execute(
+                "SELECT version FROM synced_users WHERE user_id = ?", [user_id]
+            ).fetchone()
+            # Re-ingesting days is only safe when every write since the sync said which days it changed
+            if synced is not None and dirty and synced[0] + bumps == version:
+                self._ingest(cursor, db, user_id, sorted(dirty))
+                with self._lock:
+                    self.partial_syncs += 1
+            elif synced is None or synced[0] != version or dirty:
+                self._ingest(cursor, db, user_id, None)
+                with self._lock:
+                    self.full_syncs += 1
+            cursor.execute("INSERT OR REPLACE INTO synced_users VALUES (?, ?)", [user_id, version])
+            with self._lock:
+                self._synced_generation[user_id] = generation
+
+        return cursor.execute(sql, params).fetchall()
+
+    def clear(self):
+        with self._lock:
+            if self._conn is not None:
+                for table in ("set_facts", "workout_facts", "exercise_muscle_groups", "synced_users"):
+                    self._conn.execute(f"DELETE FROM {table}")
+            self._dirty.clear()
+            self._marked.clear()
+            self._bumps.clear()
+            self._stale.clear()
+            self._synced_generation.clear()
+            self._generation = 0
+            self.full_syncs = self.partial_syncs = 0
+
+    def stats(self) -> dict:
+        rows = {}
+        if self._conn is not None:
+            cursor = self._cursor()
+            for table in ("set_facts", "workout_facts", "synced_users"):
+                rows[table] = cursor.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+        with self._lock:
+            return {
+                "available": available(),
+                "path": self.path,
+                "rows": rows,
+                "full_syncs": self.full_syncs,
+                "partial_syncs": self.partial_syncs
+            }
+
+
+analytics_mirror = DuckDBMirror()
+rollups.add_refresh_listener(analytics_mirror.mark_dirty)
+analytics_cache.add_bump_listener(analytics_mirror.version_bumped)
+
+
+# Aggregations, returning the same shapes as the SQLite path
+
+def weekly_totals(db: Session, user_id: int, first_week: date, weeks: int) -> Dict[date, dict]:
+    """Workout, duration, set, volume and muscle group totals for consecutive weeks"""
+    end = first_week + timedelta(days=7 * weeks)
+    summaries = {
+        first_week + timedelta(days=7 * i): {
+            "total_workouts": 0,
+            "total_duration_seconds": 0,
+            "total_volume": 0.0,
+            "total_sets": 0,
+            "muscle_groups_worked": {}
+        }
+        for i in range(weeks)
+    }
+    in_range = "user_id = ? AND local_date >= ? AND local_date < ?"
+    rows = analytics_mirror.query(db, user_id, f"""
+        SELECT date_trunc('week', local_date)::DATE, 'workouts', NULL,
+               count(*), coalesce(sum(duration_seconds), 0)
+        FROM workout_facts WHERE {in_range} GROUP BY 1
+        UNION ALL
+        SELECT date_trunc('week', local_date)::DATE, 'sets', NULL,
+               count(set_id), coalesce(sum(weight * reps), 0)
+        FROM set_facts WHERE {in_range} GROUP BY 1
+        UNION ALL
+        SELECT date_trunc('week', s.local_date)::DATE, 'muscle_group', m.muscle_group, count(s.set_id), 0
+        FROM set_facts s JOIN exercise_muscle_groups m ON m.exercise_id = s.exercise_id
+        WHERE s.user_id = ? AND s.local_date >= ? AND s.local_date < ? GROUP BY 1, 3
+    """, [user_id, first_week, end] * 3)
+
+    for week, kind, key, count, amount in rows:
+        summary = summaries[week]
+        if kind == "workouts":
+            summary["total_workouts"] = count
+            summary["total_duration_seconds"] = int(amount)
+        elif kind == "sets":
+            summary["total_sets"] = count
+            summary["total_volume"] = float(amount)
+        else:
+            summary["muscle_groups_worked"][key] = count
+    return summaries
+
+
+def muscle_group_balance(db: Session, user_id: int, since: date) -> Dict[str, int]:
+    """Set counts per muscle group since a day"""
+    return dict(analytics_mirror.query(db, user_id, """
+        SELECT m.muscle_group, count(s.set_id)
+        FROM set_facts s JOIN exercise_muscle_groups m ON m.exercise_id = s.exercise_id
+        WHERE s.user_id = ? AND s.local_date >= ?
+        GROUP BY 1
+    """, [user_id, since]))
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+    from models.database import User
+    from routers import analytics
+    from utils.timezones import local_today
+
+    db = SessionLocal()
+    try:
+        mismatches = 0
+        for user_id, tz_name in db.query(User.id, User.timezone):
+            today = local_today(tz_name or "UTC")
+            first_week = today - timedelta(days=today.weekday() + 7 * 51)
+            since = today - timedelta(days=90)
+            checks = {
+                "weekly totals": (
+                    analytics._weekly_totals(db, user_id, first_week, 52),
+                    weekly_totals(db, user_id, first_week, 52)
+                ),
+                "muscle balance": (
+                    analytics._muscle_group_balance(db, user_id, since),
+                    muscle_group_balance(db, user_id, since)
+                ),
+            }
+            for name, (expected, mirrored) in checks.items():
+                if expected != mirrored:
+                    mismatches += 1
+                    print(f"user {user_id}: {name} differs")
+        print(f"{mismatches} mismatches; {analytics_mirror.stats()}")
+    finally:
+        db.close()
@@ -0,0 +1,213 @@
+"""Export training history as Parquet or Arrow IPC for offline analysis.
+
+One row per set, joined with its workout, exercise and user, plus the
+user's body weight and body fat as of the workout's day (latest weigh-in on
+or before it, looked up once per workout day). Rows are read with a
+server-side cursor and written one record batch at a time, and
+``stream_sets`` hands out each batch's bytes as soon as it is encoded, so
+memory stays bounded by ``chunk_rows`` however large the database is.
+Requires the optional ``pyarrow`` package.
+
+    python utils/export.py sets.parquet [--user-id 1] [--format arrow]
+"""
+import argparse
+import os
+import sys
+from typing import BinaryIO, Iterator, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models.database import User, Exercise, Workout, WorkoutExercise, WorkoutSet, BodyMetric
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = pq = None
+
+FORMATS = {"parquet": "application/vnd.apache.parquet", "arrow": "application/vnd.apache.arrow.file"}
+CHUNK_ROWS = 50_000
+
+
+def available() -> bool:
+    return pa is not None
+
+
+def _schema():
+    return pa.schema([
+        ("user_id", pa.int32()),
+        ("user_name", pa.string()),
+        ("weight_unit", pa.string()),
+        ("workout_id", pa.int64()),
+        ("workout_name", pa.string()),
+        ("started_at", pa.timestamp("us", tz="UTC")),
+        ("local_date", pa.date32()),
+        ("duration_seconds", pa.int32()),
+        ("exercise_id", pa.int32()),
+        ("exercise_name", pa.string()),
+        ("category", pa.string()),
+        ("muscle_groups", pa.list_(pa.string())),
+        ("exercise_order", pa.int32()),
+        ("set_id", pa.int64()),
+        ("set_number", pa.int32()),
+        ("reps", pa.int32()),
+        ("weight", pa.float64()),
+        ("set_duration_seconds", pa.int32()),
+        ("distance", pa.float64()),
+        ("rpe", pa.float64()),
+        ("is_warmup", pa.bool_()),
+        ("is_dropset", pa.bool_()),
+        ("is_failure", pa.bool_()),
+        ("body_weight", pa.float64()),
+        ("body_fat_percentage", pa.float64()),
+    ])
+
+
+def _body_metrics_asof(user_id: Optional[int]):
+    """Latest non-null body weight and body fat on or before each (user, workout day)"""
+    days = select(Workout.user_id, Workout.local_date).distinct()
+    if user_id is not None:
+        days = days.where(Workout.user_id == user_id)
+    days = days.subquery()
+
+    def latest(column):
+        return select(column).where(
+            BodyMetric.user_id == days.c.user_id,
+            BodyMetric.date <= days.c.local_date,
+            column.isnot(None)
+        ).order_by(BodyMetric.date.desc(), BodyMetric.id.desc()).limit(1).scalar_subquery()
+
+    return select(
+        days.c.user_id, days.c.local_date,
+        latest(BodyMetric.weight).label("body_weight"),
+        latest(BodyMetric.body_fat_percentage).label("body_fat_percentage")
+    ).subquery()
+
+
+def _rows_query(user_id: Optional[int]):
+    asof = _body_metrics_asof(user_id)
+    query = select(
+        User.id, User.name, User.weight_unit,
+        Workout.id, Workout.name, Workout.started_at, Workout.local_date, Workout.duration_seconds,
+        Exercise.id, Exercise.name, Exercise.category, Exercise.muscle_groups, WorkoutExercise.order,
+        WorkoutSet.id, WorkoutSet.set_number, WorkoutSet.reps, WorkoutSet.weight,
+        WorkoutSet.duration_seconds, WorkoutSet.distance, WorkoutSet.rpe,
+        WorkoutSet.is_warmup, WorkoutSet.is_dropset, WorkoutSet.is_failure,
+        asof.c.body_weight, asof.c.body_fat_percentage
+    ).select_from(WorkoutSet).join(
+        WorkoutExercise, WorkoutExercise.id == WorkoutSet.workout_exercise_id
+    ).join(
+        Workout, Workout.id == WorkoutExercise.workout_id
+    ).join(
+        User, User.id == Workout.user_id
+    ).join(
+        Exercise, Exercise.id == WorkoutExercise.exercise_id
+    ).outerjoin(
+        asof, (asof.c.user_id == Workout.user_id) & (asof.c.local_date == Workout.local_date)
+    ).order_by(Workout.user_id, Workout.started_at, WorkoutExercise.order, WorkoutSet.set_number)
+    if user_id is not None:
+        query = query.where(Workout.user_id == user_id)
+    return query
+
+
+class _Chunks:
+    """Write-only sink that hands out whatever was written since the last take()"""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _write_batches(
+    db: Session, sink, fmt: str, user_id: Optional[int], chunk_rows: int
+) -> Iterator[int]:
+    """Write the export to sink, yielding the row count after each batch"""
+    if not available():
+        raise RuntimeError("Export requires the pyarrow package")
+    schema = _schema()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_file(sink, schema)
+
+    try:
+        result = db.execute(_rows_query(user_id).execution_options(yield_per=chunk_rows))
+        for rows in result.partitions():
+            columns = list(zip(*rows))
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            )
+            if fmt == "parquet":
+                writer.write_table(pa.Table.from_batches([batch]))
+            else:
+                writer.write_batch(batch)
+            yield len(rows)
+    finally:
+        writer.close()
+
+
+def export_sets(
+    db: Session, sink: BinaryIO, fmt: str = "parquet", user_id: Optional[int] = None,
+    chunk_rows: int = CHUNK_ROWS
+) -> int:
+    """Write one user's (or everyone's) sets to sink; returns the number of rows"""
+    return sum(_write_batches(db, sink, fmt, user_id, chunk_rows))
+
+
+def stream_sets(
+    db: Session, fmt: str = "parquet", user_id: Optional[int] = None, chunk_rows: int = CHUNK_ROWS
+) -> Iterator[bytes]:
+    """The export as a sequence of byte chunks, one per batch, for a streaming response"""
+    chunks = _Chunks()
+    sink = pa.PythonFile(chunks, mode="w")
+    for _ in _write_batches(db, sink, fmt, user_id, chunk_rows):
+        yield chunks.take()
+    # Footer, written when the writer closes
+    yield chunks.take()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output")
+    parser.add_argument("--user-id", type=int, default=None)
+    parser.add_argument("--format", choices=sorted(FORMATS), default=None,
+                        help="defaults to the output file's extension")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+    fmt = args.format or ("arrow" if args.output.endswith((".arrow", ".feather")) else "parquet")
+
+    from database import SessionLocal
+    db = SessionLocal()
+    try:
+        with open(args.output, "wb") as sink:
+            rows = export_sets(db, sink, fmt, args.user_id, args.chunk_rows)
+        print(f"Wrote {rows} sets to {args.output} ({fmt})")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
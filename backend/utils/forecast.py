@@ -0,0 +1,61 @@
+"""Robust linear trends of estimated 1RM, fitted for many exercises at once.
+
+Each exercise's daily best e1RM is regressed on time with iteratively
+reweighted least squares using Huber weights, so a single bad day (a
+mis-logged set, a sick day) does not swing the projection. Series are padded
+into one (exercises x days) matrix and every iteration solves all the 2x2
+weighted normal equations in a single batched ``np.linalg.solve`` call.
+"""
+from typing import Sequence, Tuple
+
+import numpy as np
+
+MIN_POINTS = 3
+ITERATIONS = 10
+HUBER_K = 1.345
+
+
+def fit_trends(
+    groups: Sequence[int], xs: Sequence[float], ys: Sequence[float]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Fit y = intercept + slope * x per group.
+
+    Returns (group ids, intercepts, slopes, point counts) for groups with at
+    least MIN_POINTS points at two or more distinct x values.
+    """
+    groups = np.asarray(groups)
+    x = np.asarray(xs, dtype=np.float64)
+    y = np.asarray(ys, dtype=np.float64)
+    ids, inverse, counts = np.unique(groups, return_inverse=True, return_counts=True)
+    if not len(ids):
+        return ids, np.zeros(0), np.zeros(0), counts
+
+    # Pad each group's points into one row of a (groups, max points) matrix
+    order = np.argsort(inverse, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    columns = np.arange(len(order)) - np.repeat(starts, counts)
+    rows = inverse[order]
+    X = np.zeros((len(ids), counts.max()))
+    Y = np.zeros_like(X)
+    mask = np.zeros_like(X, dtype=bool)
+    X[rows, columns], Y[rows, columns], mask[rows, columns] = x[order], y[order], True
+
+    spread = np.where(mask, X, np.inf).min(axis=1) < np.where(mask, X, -np.inf).max(axis=1)
+    keep = (counts >= MIN_POINTS) & spread
+    ids, counts, X, Y, mask = ids[keep], counts[keep], X[keep], Y[keep], mask[keep]
+
+    weights = mask.astype(np.float64)
+    coef = np.zeros((len(ids), 2))
+    for _ in range(ITERATIONS):
+        sw, sx, sxx = weights.sum(1), (weights * X).sum(1), (weights * X * X).sum(1)
+        sy, sxy = (weights * Y).sum(1), (weights * X * Y).sum(1)
+        normal = np.stack([np.stack([sw, sx], -1), np.stack([sx, sxx], -1)], -2)
+        coef = np.linalg.solve(normal, np.stack([sy, sxy], -1)[..., None])[..., 0]
+
+        residuals = np.abs(Y - (coef[:, :1] + coef[:, 1:] * X))
+        # Median absolute deviation, scaled to a standard deviation for normal noise
+        scale = np.nanmedian(np.where(mask, residuals, np.nan), axis=1, keepdims=True) / 0.6745
+        u = residuals / np.maximum(HUBER_K * scale, 1e-9)
+        weights = np.where(mask, np.minimum(1.0, 1.0 / np.maximum(u, 1e-12)), 0.0)
+
+    return ids, coef[:, 0], coef[:, 1], counts
@@ -0,0 +1,163 @@
+"""Idempotency-Key support for mutating endpoints.
+
+Routers opt in with ``APIRouter(route_class=IdempotentRoute)``. When a POST,
+PUT, PATCH or DELETE carries an ``Idempotency-Key`` header, the first request
+reserves the key, runs normally and stores its response. Retries with the same
+key get the stored response back without running the endpoint again. A
+reservation whose response was never stored (the process died mid-request)
+can be taken over by a retry after ``IDEMPOTENCY_RESERVATION_TIMEOUT_SECONDS``.
+"""
+import hashlib
+import os
+import zlib
+from datetime import datetime, timezone, timedelta
+
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+
+from database import get_db
+from models.database import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+KEY_TTL = timedelta(hours=24)
+RESERVATION_TIMEOUT = timedelta(
+    seconds=float(os.environ.get("IDEMPOTENCY_RESERVATION_TIMEOUT_SECONDS", "60"))
+)
+RESERVE_ATTEMPTS = 3
+
+
+def _open_session(request: Request):
+    """Get a session the same way endpoints do, honouring dependency overrides"""
+    factory = request.app.dependency_overrides.get(get_db, get_db)
+    gen = factory()
+    return next(gen), gen
+
+
+def _reserve(request: Request, key: str, request_hash: str):
+    """Claim a key, or return the existing record if it was already used"""
+    db, gen = _open_session(request)
+    try:
+        for _ in range(RESERVE_ATTEMPTS):
+            now = datetime.now(timezone.utc)
+            db.query(IdempotencyKey).filter(or_(
+                IdempotencyKey.created_at < now - KEY_TTL,
+                and_(
+                    IdempotencyKey.status_code.is_(None),
+                    IdempotencyKey.created_at < now - RESERVATION_TIMEOUT
+                )
+            )).delete(synchronize_session=False)
+            db.add(IdempotencyKey(
+                key=key,
+                method=request.method,
+                path=request.url.path,
+                request_hash=request_hash,
+                created_at=now
+            ))
+            try:
+                db.commit()
+                return None
+            except IntegrityError:
+                db.rollback()
+
+            record = db.query(IdempotencyKey).filter(
+                IdempotencyKey.key == key,
+                IdempotencyKey.method == request.method,
+                IdempotencyKey.path == request.url.path
+            ).first()
+            if record is not None:
+                db.expunge(record)
+                return record
+            # Released between our insert and the lookup; try to claim it again
+
+        raise HTTPException(
+            status_code=409,
+            detail="A request with this Idempotency-Key is still in progress"
+        )
+    finally:
+        gen.close()
+
+
+def _store(request: Request, key: str, response: Response):
+    db, gen = _open_session(request)
+    try:
+        record = db.query(IdempotencyKey).filter(
+            IdempotencyKey.key == key,
+            IdempotencyKey.method == request.method,
+            IdempotencyKey.path == request.url.path
+        ).first()
+        if record is not None:
+            record.status_code = response.status_code
+            record.response_body = zlib.compress(response.body)
+            record.media_type = response.media_type
+            db.commit()
+    finally:
+        gen.close()
+
+
+def _release(request: Request, key: str):
+    """Forget a reservation so the request can be retried"""
+    db, gen = _open_session(request)
+    try:
+        db.query(IdempotencyKey).filter(
+            IdempotencyKey.key == key,
+            IdempotencyKey.method == request.method,
+            IdempotencyKey.path == request.url.path
+        ).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        gen.close()
+
+
+class IdempotentRoute(APIRoute):
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def idempotent_handler(request: Request) -> Response:
+            key = request.headers.get(HEADER)
+            if key is None or request.method not in MUTATING_METHODS:
+                return await handler(request)
+            if not key or len(key) > 255:
+                raise HTTPException(status_code=400, detail="Invalid Idempotency-Key")
+
+            body = await request.body()
+            request_hash = hashlib.sha256(
+                request.url.query.encode() + b"\n" + body
+            ).hexdigest()
+
+            record = await run_in_threadpool(_reserve, request, key, request_hash)
+            if record is not None:
+                if record.request_hash != request_hash:
+                    raise HTTPException(
+                        status_code=422,
+                        detail="Idempotency-Key was already used for a different request"
+                    )
+                if record.status_code is None:
+                    raise HTTPException(
+                        status_code=409,
+                        detail="A request with this Idempotency-Key is still in progress"
+                    )
+                return Response(
+                    content=zlib.decompress(record.response_body),
+                    status_code=record.status_code,
+                    media_type=record.media_type,
+                    headers={"Idempotent-Replayed": "true"}
+                )
+
+            try:
+                response = await handler(request)
+            except Exception:
+                await run_in_threadpool(_release, request, key)
+                raise
+
+            if response.status_code < 500 and hasattr(response, "body"):
+                await run_in_threadpool(_store, request, key, response)
+            else:
+                await run_in_threadpool(_release, request, key)
+            return response
+
+        return idempotent_handler
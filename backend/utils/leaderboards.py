@@ -0,0 +1,81 @@
+"""Per-exercise leaderboards across every profile in the household.
+
+Entries are derived from the daily exercise rollups, for the same user,
+exercises and days a rollup refresh touches, so ranking a board is one
+indexed read rather than a scan over everyone's sets:
+
+- ``e1rm``: each user's best estimated 1RM for the exercise, all time
+- ``weekly_volume``: each user's weight x reps for the exercise per week,
+  keyed by the ISO date of the Monday starting the user's local week
+
+The streak board needs no table of its own; it ranks ``user_streaks``.
+"""
+from datetime import date, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from models.database import DailyExerciseStat, LeaderboardEntry
+
+ALL_TIME = "all"
+BOARDS = ("e1rm", "weekly_volume")
+
+WEEK = func.date(DailyExerciseStat.local_date, "weekday 0", "-6 days")
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def refresh_leaderboards(
+    db: Session,
+    user_id: Optional[int] = None,
+    exercise_ids: Optional[Iterable[int]] = None,
+    days: Optional[Iterable[date]] = None
+):
+    """Recompute entries from the rollups; None means every user, exercise or day"""
+    db.flush()
+    weeks = None if days is None else sorted({week_start(d).isoformat() for d in days})
+    exercise_ids = None if exercise_ids is None else list(set(exercise_ids))
+
+    def scoped(query, user_column, exercise_column):
+        if user_id is not None:
+            query = query.filter(user_column == user_id)
+        if exercise_ids is not None:
+            query = query.filter(exercise_column.in_(exercise_ids))
+        return query
+
+    # e1rm is all-time, so any change to an exercise's rollups can move it
+    entries = scoped(db.query(LeaderboardEntry), LeaderboardEntry.user_id, LeaderboardEntry.exercise_id)
+    entries.filter(LeaderboardEntry.board == "e1rm").delete(synchronize_session=False)
+    weekly = entries.filter(LeaderboardEntry.board == "weekly_volume")
+    if weeks is not None:
+        weekly = weekly.filter(LeaderboardEntry.period.in_(weeks))
+    weekly.delete(synchronize_session=False)
+
+    best = scoped(
+        select(
+            DailyExerciseStat.user_id, DailyExerciseStat.exercise_id, literal("e1rm"),
+            literal(ALL_TIME), func.max(DailyExerciseStat.best_e1rm)
+        ),
+        DailyExerciseStat.user_id, DailyExerciseStat.exercise_id
+    ).group_by(DailyExerciseStat.user_id, DailyExerciseStat.exercise_id)
+
+    volume = scoped(
+        select(
+            DailyExerciseStat.user_id, DailyExerciseStat.exercise_id, literal("weekly_volume"),
+            WEEK, func.sum(DailyExerciseStat.total_volume)
+        ),
+        DailyExerciseStat.user_id, DailyExerciseStat.exercise_id
+    ).group_by(DailyExerciseStat.user_id, DailyExerciseStat.exercise_id, WEEK)
+    if weeks is not None:
+        volume = volume.filter(
+            DailyExerciseStat.local_date >= date.fromisoformat(weeks[0]),
+            DailyExerciseStat.local_date < date.fromisoformat(weeks[-1]) + timedelta(days=7),
+            WEEK.in_(weeks)
+        )
+
+    columns = ["user_id", "exercise_id", "board", "period", "value"]
+    db.execute(insert(LeaderboardEntry).from_select(columns, best))
+    db.execute(insert(LeaderboardEntry).from_select(columns, volume))
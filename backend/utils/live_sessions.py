@@ -0,0 +1,395 @@
+"""In-memory store for workouts that are being logged live.
+
+Edits are applied to an in-memory snapshot of the workout and appended to a
+small journal file. A background thread checkpoints pending edits to the
+database every few seconds; the journal is compacted after every checkpoint
+and replayed on startup so edits survive a restart.
+
+New sets get negative temporary ids until they are checkpointed. The temporary
+id keeps working for the rest of the session, across restarts: compaction
+records the id counter and each session's temporary-to-real id aliases, so
+ids are never handed out twice.
+
+Checkpoints only hold the store lock while they take a batch of pending edits
+and while they swap in the saved ids; the database write itself runs outside
+it, so edits to any session are never stuck behind a checkpoint.
+"""
+import copy
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session, joinedload
+
+from models.database import Workout, WorkoutExercise, WorkoutSet
+from schemas import WorkoutResponse
+
+JOURNAL_PATH = os.environ.get("LIVE_SESSION_JOURNAL", "data/live_sessions.journal")
+CHECKPOINT_SECONDS = float(os.environ.get("LIVE_SESSION_CHECKPOINT_SECONDS", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+class LiveSessionError(Exception):
+    """Raised when a live session or one of its sets cannot be found."""
+
+
+class _LiveWorkout:
+    def __init__(self, snapshot: dict, bind):
+        self.snapshot = snapshot
+        self.user_id = snapshot["user_id"]
+        self.bind = bind
+        self.pending = []
+        self.exercises = {ex["id"]: ex for ex in snapshot["exercises"]}
+        self.sets = {}
+        self.aliases = {}
+        self.closing = False
+        # Serializes checkpoints of this session; edits only need the store lock
+        self.flush_lock = threading.Lock()
+        for ex in snapshot["exercises"]:
+            for s in ex["sets"]:
+                self.sets[s["id"]] = s
+
+    def add_exercise(self, exercise: dict):
+        self.snapshot["exercises"].append(exercise)
+        self.exercises[exercise["id"]] = exercise
+        for s in exercise["sets"]:
+            self.sets[s["id"]] = s
+
+    def resolve(self, set_id: int) -> int:
+        return self.aliases.get(set_id, set_id)
+
+
+def _load_snapshot(db: Session, workout_id: int) -> dict:
+    workout = db.query(Workout).options(
+        joinedload(Workout.exercises)
+        .joinedload(WorkoutExercise.exercise),
+        joinedload(Workout.exercises)
+        .joinedload(WorkoutExercise.sets)
+    ).filter(Workout.id == workout_id).first()
+    if not workout:
+        return None
+    return WorkoutResponse.model_validate(workout).model_dump()
+
+
+def _set_from_journal(data: dict) -> dict:
+    data = dict(data)
+    data["completed_at"] = datetime.fromisoformat(data["completed_at"])
+    return data
+
+
+class LiveSessionStore:
+    def __init__(self, journal_path: str = JOURNAL_PATH, on_exercise_flushed=None):
+        self.journal_path = journal_path
+        self.on_exercise_flushed = on_exercise_flushed
+        self._sessions = {}
+        self._lock = threading.RLock()
+        self._next_temp_id = -1
+        self._journal = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    # Journal
+    def _append(self, entry: dict):
+        if self._journal is None:
+            directory = os.path.dirname(self.journal_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal.write(json.dumps(entry, default=str) + "\n")
+        self._journal.flush()
+
+    def _compact(self):
+        """Rewrite the journal so it only holds the id counter, open sessions and unsaved edits."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if not self._sessions:
+            # Temporary ids only need to stay unique while a session refers to them
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            return
+        directory = os.path.dirname(self.journal_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"op": "temp_ids", "next_temp_id": self._next_temp_id}) + "\n")
+            for workout_id, live in self._sessions.items():
+                f.write(json.dumps({
+                    "op": "start",
+                    "workout_id": workout_id,
+                    "aliases": {str(temp_id): real_id for temp_id, real_id in live.aliases.items()}
+                }) + "\n")
+                for entry in live.pending:
+                    f.write(json.dumps(entry, default=str) + "\n")
+        os.replace(tmp_path, self.journal_path)
+
+    def recover(self, db: Session):
+        """Reopen sessions recorded in the journal and replay unsaved edits."""
+        if not os.path.exists(self.journal_path):
+            return
+        with self._lock:
+            with open(self.journal_path, encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+            for entry in entries:
+                if entry["op"] == "temp_ids":
+                    self._next_temp_id = min(self._next_temp_id, entry["next_temp_id"])
+                    continue
+                workout_id = entry["workout_id"]
+                if entry["op"] == "start":
+                    snapshot = _load_snapshot(db, workout_id)
+                    if snapshot is not None:
+                        live = _LiveWorkout(snapshot, db.get_bind())
+                        live.aliases = {int(k): v for k, v in entry.get("aliases", {}).items()}
+                        self._sessions[workout_id] = live
+                    continue
+                live = self._sessions.get(workout_id)
+                if live is None:
+                    continue
+                try:
+                    self._apply(live, entry)
+                except LiveSessionError:
+                    continue
+                live.pending.append(entry)
+                if entry["op"] == "add_set":
+                    self._next_temp_id = min(self._next_temp_id, entry["set_id"] - 1)
+            self._compact()
+
+    # Session lifecycle
+    def start(self, db: Session, workout_id: int) -> dict:
+        with self._lock:
+            live = self._sessions.get(workout_id)
+            if live is not None:
+                return copy.deepcopy(live.snapshot)
+            snapshot = _load_snapshot(db, workout_id)
+            if snapshot is None:
+                raise LiveSessionError("Workout not found")
+            self._sessions[workout_id] = _LiveWorkout(snapshot, db.get_bind())
+            self._append({"op": "start", "workout_id": workout_id})
+            return copy.deepcopy(snapshot)
+
+    def get(self, workout_id: int) -> dict:
+        with self._lock:
+            return copy.deepcopy(self._get(workout_id).snapshot)
+
+    def refresh(self, db: Session, workout_id: int):
+        """Pick up workout details and exercises that were saved outside the live session."""
+        if not self.is_live(workout_id):
+            return
+        snapshot = _load_snapshot(db, workout_id)
+        if snapshot is None:
+            return
+        with self._lock:
+            live = self._sessions.get(workout_id)
+            if live is None:
+                return
+            for field, value in snapshot.items():
+                if field != "exercises":
+                    live.snapshot[field] = value
+            for exercise in snapshot["exercises"]:
+                if exercise["id"] not in live.exercises:
+                    live.add_exercise(exercise)
+
+    def is_live(self, workout_id: int) -> bool:
+        return workout_id in self._sessions
+
+    def _get(self, workout_id: int) -> _LiveWorkout:
+        live = self._sessions.get(workout_id)
+        if live is None or live.closing:
+            raise LiveSessionError("Workout is not live")
+        return live
+
+    def finish(self, workout_id: int):
+        """Checkpoint a session and stop tracking it."""
+        with self._lock:
+            live = self._get(workout_id)
+            # Refuse further edits, but keep the session journaled until it is saved
+            live.closing = True
+        try:
+            self._flush(live)
+        except Exception:
+            live.closing = False
+            raise
+        with self._lock:
+            del self._sessions[workout_id]
+            self._compact()
+
+    def discard(self, workout_id: int):
+        """Stop tracking a session without saving its pending edits (the workout is gone)."""
+        with self._lock:
+            if self._sessions.pop(workout_id, None) is not None:
+                self._compact()
+
+    # Edits
+    def add_set(self, workout_id: int, workout_exercise_id: int, data: dict) -> dict:
+        with self._lock:
+            live = self._get(workout_id)
+            entry = {
+                "op": "add_set",
+                "workout_id": workout_id,
+                "workout_exercise_id": workout_exercise_id,
+                "set_id": self._next_temp_id,
+                "data": dict(data, completed_at=datetime.now(timezone.utc).isoformat()),
+            }
+            new_set = self._apply(live, entry)
+            self._next_temp_id -= 1
+            live.pending.append(entry)
+            self._append(entry)
+            return dict(new_set)
+
+    def update_set(self, workout_id: int, set_id: int, changes: dict) -> dict:
+        with self._lock:
+            live = self._get(workout_id)
+            entry = {
+                "op": "update_set",
+                "workout_id": workout_id,
+                "set_id": live.resolve(set_id),
+                "data": changes,
+            }
+            updated = self._apply(live, entry)
+            live.pending.append(entry)
+            self._append(entry)
+            return dict(updated)
+
+    def delete_set(self, workout_id: int, set_id: int):
+        with self._lock:
+            live = self._get(workout_id)
+            entry = {"op": "delete_set", "workout_id": workout_id, "set_id": live.resolve(set_id)}
+            self._apply(live, entry)
+            live.pending.append(entry)
+            self._append(entry)
+
+    def _apply(self, live: _LiveWorkout, entry: dict):
+        """Apply a journal entry to the in-memory snapshot."""
+        if entry["op"] == "add_set":
+            exercise = live.exercises.get(entry["workout_exercise_id"])
+            if exercise is None:
+                raise LiveSessionError("Workout exercise not found")
+            new_set = _set_from_journal(entry["data"])
+            new_set["id"] = entry["set_id"]
+            new_set["workout_exercise_id"] = exercise["id"]
+            exercise["sets"].append(new_set)
+            live.sets[new_set["id"]] = new_set
+            return new_set
+
+        set_id = live.resolve(entry["set_id"])
+        current = live.sets.get(set_id)
+        if current is None:
+            raise LiveSessionError("Set not found")
+        if entry["op"] == "update_set":
+            current.update(entry["data"])
+            return current
+
+        exercise = live.exercises[current["workout_exercise_id"]]
+        exercise["sets"].remove(current)
+        live.sets = {k: v for k, v in live.sets.items() if v is not current}
+
+    # Persistence
+    def _flush(self, live: _LiveWorkout):
+        """Write a session's pending edits to the database in one transaction."""
+        with live.flush_lock:
+            with self._lock:
+                batch = list(live.pending)
+            if not batch:
+                return
+            new_ids = self._write(live, batch)
+            with self._lock:
+                # Edits made while the batch was being written stay pending
+                del live.pending[:len(batch)]
+                for temp_id, real_id in new_ids.items():
+                    live.aliases[temp_id] = real_id
+                    current = live.sets.get(temp_id)
+                    if current is not None:
+                        current["id"] = real_id
+                        live.sets[real_id] = current
+
+    def _write(self, live: _LiveWorkout, batch: list) -> dict:
+        """Replay a batch of edits; returns the real ids of the sets it added"""
+        db = Session(bind=live.bind)
+        try:
+            touched = set()
+            new_ids = {}
+            for entry in batch:
+                if entry["op"] == "add_set":
+                    data = _set_from_journal(entry["data"])
+                    db_set = WorkoutSet(workout_exercise_id=entry["workout_exercise_id"], **data)
+                    db.add(db_set)
+                    db.flush()
+                    new_ids[entry["set_id"]] = db_set.id
+                    touched.add(entry["workout_exercise_id"])
+                    continue
+
+                set_id = new_ids.get(entry["set_id"], live.resolve(entry["set_id"]))
+                db_set = db.get(WorkoutSet, set_id)
+                if db_set is None:
+                    continue
+                touched.add(db_set.workout_exercise_id)
+                if entry["op"] == "update_set":
+                    for field, value in entry["data"].items():
+                        setattr(db_set, field, value)
+                else:
+                    db.delete(db_set)
+            db.flush()
+
+            if self.on_exercise_flushed is not None:
+                for workout_exercise_id in touched:
+                    we = db.query(WorkoutExercise).options(
+                        joinedload(WorkoutExercise.sets)
+                    ).filter(WorkoutExercise.id == workout_exercise_id).first()
+                    if we is not None:
+                        self.on_exercise_flushed(db, live.user_id, we)
+            db.commit()
+            return new_ids
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def checkpoint(self, workout_id: int = None):
+        """Persist pending edits for one session, or for all of them."""
+        with self._lock:
+            if workout_id is not None:
+                sessions = [self._get(workout_id)]
+            else:
+                sessions = list(self._sessions.values())
+        if workout_id is not None:
+            self._flush(sessions[0])
+        else:
+            for live in sessions:
+                try:
+                    self._flush(live)
+                except Exception:
+                    # The edits stay pending and are retried on the next checkpoint
+                    logger.exception("Checkpoint failed for live workout %s", live.snapshot["id"])
+        with self._lock:
+            self._compact()
+
+    def _run(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.checkpoint()
+            except Exception:
+                # Keep the edits in memory and in the journal; retry next tick
+                logger.exception("Live session checkpoint failed")
+
+    def start_checkpointer(self, interval: float = CHECKPOINT_SECONDS):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), daemon=True)
+        self._thread.start()
+
+    def stop_checkpointer(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.checkpoint()
+
+
+live_store = LiveSessionStore()
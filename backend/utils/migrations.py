@@ -0,0 +1,88 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateColumn
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database import Base, engine as default_engine
+from models.database import AppliedMigration
+from utils.leaderboards import refresh_leaderboards
+from utils.rollups import backfill_daily_stats, refresh_muscle_loads
+from utils.streaks import rebuild_all_streaks
+
+
+# Statements that fill a column the first time it is added to an existing table
+BACKFILLS = {
+    # Existing users default to UTC
+    ("workouts", "local_date"): "UPDATE workouts SET local_date = date(started_at)",
+    ("workout_exercises", "user_id"): (
+        "UPDATE workout_exercises SET user_id = "
+        "(SELECT user_id FROM workouts WHERE workouts.id = workout_exercises.workout_id)"
+    ),
+    ("workout_exercises", "started_at"): (
+        "UPDATE workout_exercises SET started_at = "
+        "(SELECT started_at FROM workouts WHERE workouts.id = workout_exercises.workout_id)"
+    ),
+}
+
+# Statements run on every startup to derive rows for tables added later
+SYNC_STATEMENTS = [
+    # exercise_muscle_groups mirrors Exercise.muscle_groups
+    (
+        "INSERT OR IGNORE INTO exercise_muscle_groups (exercise_id, muscle_group) "
+        "SELECT exercises.id, json_each.value FROM exercises, json_each(exercises.muscle_groups) "
+        "WHERE NOT EXISTS (SELECT 1 FROM exercise_muscle_groups emg WHERE emg.exercise_id = exercises.id)"
+    ),
+]
+
+# Derived tables built once for databases that predate them; recorded in
+# applied_migrations so they never run twice, even when they produce no rows
+DATA_MIGRATIONS = [
+    ("daily_exercise_stats", backfill_daily_stats),
+    ("daily_muscle_loads", refresh_muscle_loads),
+    ("leaderboard_entries", refresh_leaderboards),
+    ("user_streaks", rebuild_all_streaks),
+]
+
+
+def run_migrations(engine=default_engine):
+    """Add columns, indexes and derived rows introduced after a database was created"""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+                backfill = BACKFILLS.get((table.name, column.name))
+                if backfill:
+                    conn.execute(text(backfill))
+
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+        for statement in SYNC_STATEMENTS:
+            conn.execute(text(statement))
+
+    db = Session(bind=engine)
+    try:
+        applied = {name for (name,) in db.query(AppliedMigration.name)}
+        for name, migrate in DATA_MIGRATIONS:
+            if name in applied:
+                continue
+            migrate(db)
+            db.add(AppliedMigration(name=name))
+            db.commit()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    Base.metadata.create_all(bind=default_engine)
+    run_migrations()
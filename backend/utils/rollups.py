@@ -0,0 +1,159 @@
+from sqlalchemy import func, case, insert, select, false
+from sqlalchemy.orm import Session
+from typing import Iterable, Optional
+from datetime import date
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database import SessionLocal
+from utils.leaderboards import refresh_leaderboards
+from models.database import (
+    Workout, WorkoutExercise, WorkoutSet, DailyExerciseStat, DailyMuscleLoad, ExerciseMuscleGroup
+)
+
+# Calendar day (in the user's timezone) a workout's sets are counted on
+WORKOUT_DAY = Workout.local_date
+
+# Called as listener(user_id, days) whenever rollups are refreshed; days=None means all days
+_refresh_listeners = []
+
+
+def add_refresh_listener(listener):
+    _refresh_listeners.append(listener)
+
+
+def _notify(user_id: Optional[int], days: Optional[list]):
+    for listener in _refresh_listeners:
+        listener(user_id, days)
+
+
+def workout_day(workout: Workout) -> date:
+    return workout.local_date
+
+
+def _estimated_1rm():
+    """Epley formula; a single rep is the lift itself"""
+    return case(
+        (WorkoutSet.reps == 1, WorkoutSet.weight),
+        else_=WorkoutSet.weight * (1 + WorkoutSet.reps / 30.0)
+    )
+
+
+def _stats_select():
+    """Working sets grouped into one row per (user, exercise, day)"""
+    return select(
+        Workout.user_id,
+        WorkoutExercise.exercise_id,
+        WORKOUT_DAY,
+        func.max(WorkoutSet.weight),
+        func.sum(WorkoutSet.weight * WorkoutSet.reps),
+        func.max(WorkoutSet.reps),
+        func.count(WorkoutSet.id),
+        func.max(_estimated_1rm())
+    ).select_from(WorkoutSet).join(
+        WorkoutExercise, WorkoutExercise.id == WorkoutSet.workout_exercise_id
+    ).join(
+        Workout, Workout.id == WorkoutExercise.workout_id
+    ).where(
+        WorkoutSet.is_warmup == false(),
+        WorkoutSet.weight.isnot(None),
+        WorkoutSet.reps.isnot(None)
+    ).group_by(Workout.user_id, WorkoutExercise.exercise_id, WORKOUT_DAY)
+
+
+def _insert_stats(db: Session, stats):
+    db.execute(insert(DailyExerciseStat).from_select(
+        [
+            "user_id", "exercise_id", "local_date", "max_weight",
+            "total_volume", "max_reps", "set_count", "best_e1rm"
+        ],
+        stats
+    ))
+
+
+def _muscle_load_select():
+    """Exercise rollups summed into one row per (user, muscle group, day)"""
+    return select(
+        DailyExerciseStat.user_id,
+        ExerciseMuscleGroup.muscle_group,
+        DailyExerciseStat.local_date,
+        func.sum(DailyExerciseStat.total_volume),
+        func.sum(DailyExerciseStat.set_count)
+    ).join(
+        ExerciseMuscleGroup, ExerciseMuscleGroup.exercise_id == DailyExerciseStat.exercise_id
+    ).group_by(DailyExerciseStat.user_id, ExerciseMuscleGroup.muscle_group, DailyExerciseStat.local_date)
+
+
+def refresh_muscle_loads(db: Session, user_id: Optional[int] = None, days: Optional[Iterable[date]] = None):
+    """Recompute muscle loads from the exercise rollups; all days when days is None"""
+    db.flush()
+    delete = db.query(DailyMuscleLoad)
+    loads = _muscle_load_select()
+    if user_id is not None:
+        delete = delete.filter(DailyMuscleLoad.user_id == user_id)
+        loads = loads.where(DailyExerciseStat.user_id == user_id)
+    if days is not None:
+        days = list(set(days))
+        delete = delete.filter(DailyMuscleLoad.local_date.in_(days))
+        loads = loads.where(DailyExerciseStat.local_date.in_(days))
+    delete.delete(synchronize_session=False)
+    db.execute(insert(DailyMuscleLoad).from_select(
+        ["user_id", "muscle_group", "local_date", "volume", "hard_sets"], loads
+    ))
+
+
+def refresh_daily_stats(db: Session, user_id: int, exercise_ids: Iterable[int], days: Iterable[date]):
+    """Recompute the rollup rows for these exercises on these days"""
+    exercise_ids = list(set(exercise_ids))
+    days = list(set(days))
+    if days:
+        _notify(user_id, days)
+    if not exercise_ids or not days:
+        return
+
+    db.flush()
+    db.query(DailyExerciseStat).filter(
+        DailyExerciseStat.user_id == user_id,
+        DailyExerciseStat.exercise_id.in_(exercise_ids),
+        DailyExerciseStat.local_date.in_(days)
+    ).delete(synchronize_session=False)
+
+    _insert_stats(db, _stats_select().where(
+        Workout.user_id == user_id,
+        WorkoutExercise.exercise_id.in_(exercise_ids),
+        WORKOUT_DAY.in_(days)
+    ))
+    refresh_muscle_loads(db, user_id, days)
+    refresh_leaderboards(db, user_id, exercise_ids, days)
+
+
+def refresh_workout_stats(db: Session, workout: Workout, exercise_ids: Optional[Iterable[int]] = None):
+    """Recompute the rollups a workout contributes to"""
+    if exercise_ids is None:
+        exercise_ids = [we.exercise_id for we in workout.exercises]
+    refresh_daily_stats(db, workout.user_id, exercise_ids, [workout_day(workout)])
+
+
+def backfill_daily_stats(db: Session, user_id: Optional[int] = None):
+    """Rebuild rollups from scratch for one user or the whole database"""
+    db.flush()
+    delete = db.query(DailyExerciseStat)
+    stats = _stats_select()
+    if user_id is not None:
+        delete = delete.filter(DailyExerciseStat.user_id == user_id)
+        stats = stats.where(Workout.user_id == user_id)
+    delete.delete(synchronize_session=False)
+    _insert_stats(db, stats)
+    refresh_muscle_loads(db, user_id)
+    refresh_leaderboards(db, user_id)
+    _notify(user_id, None)
+
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        backfill_daily_stats(db)
+        db.commit()
+        print(f"Rebuilt {db.query(DailyExerciseStat).count()} daily exercise rollups")
+    finally:
+        db.close()
@@ -0,0 +1,107 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from datetime import date, timedelta
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database import SessionLocal
+from models.database import User, Workout, UserStreak
+
+
+def _as_date(value) -> date:
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def compute_streak(db: Session, user_id: int) -> UserStreak:
+    """Derive streak state in SQL, grouping consecutive workout days into islands"""
+    days = select(Workout.local_date.label("day")).where(
+        Workout.user_id == user_id,
+        Workout.local_date.isnot(None)
+    ).distinct().subquery()
+
+    # Consecutive days share the same (day - row number) value
+    islands = select(
+        days.c.day,
+        (func.julianday(days.c.day) - func.row_number().over(order_by=days.c.day)).label("island")
+    ).subquery()
+
+    runs = select(
+        func.max(islands.c.day).label("last_day"),
+        func.count().label("length")
+    ).group_by(islands.c.island).subquery()
+
+    latest = db.query(runs.c.last_day, runs.c.length).order_by(runs.c.last_day.desc()).first()
+    longest = db.query(func.max(runs.c.length)).scalar()
+    total = db.query(func.count(Workout.id)).filter(Workout.user_id == user_id).scalar()
+
+    return UserStreak(
+        user_id=user_id,
+        total_workouts=total,
+        last_workout_date=_as_date(latest.last_day) if latest else None,
+        current_run=latest.length if latest else 0,
+        longest_run=longest or 0
+    )
+
+
+def rebuild_streak(db: Session, user_id: int) -> UserStreak:
+    """Replace the stored streak with one computed from the workouts table"""
+    db.flush()
+    computed = compute_streak(db, user_id)
+    streak = db.get(UserStreak, user_id)
+    if streak is None:
+        db.add(computed)
+        return computed
+    streak.total_workouts = computed.total_workouts
+    streak.last_workout_date = computed.last_workout_date
+    streak.current_run = computed.current_run
+    streak.longest_run = computed.longest_run
+    return streak
+
+
+def record_workout_day(db: Session, user_id: int, day: date):
+    """Update the streak for a workout just added on this day"""
+    streak = db.get(UserStreak, user_id)
+    if streak is None or day is None:
+        rebuild_streak(db, user_id)
+        return
+
+    streak.total_workouts += 1
+    last = streak.last_workout_date
+    if last is None or day > last:
+        streak.current_run = streak.current_run + 1 if last == day - timedelta(days=1) else 1
+        streak.last_workout_date = day
+        streak.longest_run = max(streak.longest_run, streak.current_run)
+    elif day < last:
+        # A backdated workout can join or bridge earlier runs
+        rebuild_streak(db, user_id)
+
+
+def forget_workout_day(db: Session, user_id: int, day: date):
+    """Update the streak for a workout just removed from this day"""
+    db.flush()
+    streak = db.get(UserStreak, user_id)
+    still_trained = db.query(Workout.id).filter(
+        Workout.user_id == user_id,
+        Workout.local_date == day
+    ).first() is not None
+
+    if streak is not None and still_trained:
+        streak.total_workouts -= 1
+    else:
+        rebuild_streak(db, user_id)
+
+
+def rebuild_all_streaks(db: Session):
+    """Rebuild every user's stored streak from the workouts table"""
+    for (user_id,) in db.query(User.id).all():
+        rebuild_streak(db, user_id)
+
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        rebuild_all_streaks(db)
+        db.commit()
+        print(f"Rebuilt {db.query(UserStreak).count()} user streaks")
+    finally:
+        db.close()
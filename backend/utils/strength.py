@@ -0,0 +1,48 @@
+"""Relative-strength scores: lifts expressed against body weight.
+
+DOTS (IPF, 2019) and Wilks (original 1995 coefficients) both scale a lift by
+a fifth/fourth degree polynomial of body weight in kilograms. Everything here
+works on whole NumPy arrays so a multi-year series is scored in one pass.
+"""
+from typing import Sequence
+
+import numpy as np
+
+LB_PER_KG = 2.20462262
+
+# Highest power first, for np.polyval; (coefficients, body weight clamp)
+DOTS = {
+    "male": ([-1.0930e-06, 7.391293e-04, -0.1918759221, 24.0900756, -307.75076], (40.0, 210.0)),
+    "female": ([-1.0706e-06, 5.158568e-04, -0.1126655495, 13.6175032, -57.96288], (40.0, 150.0)),
+}
+WILKS = {
+    "male": (
+        [-1.291e-08, 7.01863e-06, -0.00113732, -0.002388645, 16.2606339, -216.0475144],
+        (40.0, 201.9),
+    ),
+    "female": (
+        [-9.054e-08, 4.731582e-05, -0.00930733913, 0.82112226871, -27.23842536447, 594.31747775582],
+        (26.51, 154.53),
+    ),
+}
+
+
+def asof_indices(sample_days: Sequence[int], lookup_days: Sequence[int]) -> np.ndarray:
+    """For each lookup day, the index of the latest sample on or before it, or -1.
+
+    Both inputs must be sorted ascending.
+    """
+    return np.searchsorted(np.asarray(sample_days), np.asarray(lookup_days), side="right") - 1
+
+
+def _score(table: dict, lifts: np.ndarray, body_weights: np.ndarray, sex: str) -> np.ndarray:
+    coefficients, (low, high) = table[sex]
+    return lifts * 500.0 / np.polyval(coefficients, np.clip(body_weights, low, high))
+
+
+def dots(lifts_kg: np.ndarray, body_weights_kg: np.ndarray, sex: str = "male") -> np.ndarray:
+    return _score(DOTS, lifts_kg, body_weights_kg, sex)
+
+
+def wilks(lifts_kg: np.ndarray, body_weights_kg: np.ndarray, sex: str = "male") -> np.ndarray:
+    return _score(WILKS, lifts_kg, body_weights_kg, sex)
@@ -0,0 +1,31 @@
+from datetime import datetime, date, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from sqlalchemy.orm import Session
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.database import User
+
+
+def is_valid_timezone(name: str) -> bool:
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+def local_date_for(moment: datetime, tz_name: str = "UTC") -> date:
+    """Calendar day of a moment in the user's timezone; naive values are UTC"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(ZoneInfo(tz_name or "UTC")).date()
+
+
+def local_today(tz_name: str = "UTC") -> date:
+    return local_date_for(datetime.now(timezone.utc), tz_name)
+
+
+def user_timezone(db: Session, user_id: int) -> str:
+    tz_name = db.query(User.timezone).filter(User.id == user_id).scalar()
+    return tz_name or "UTC"
@@ -0,0 +1,59 @@
+"""Acute:chronic workload ratio (ACWR) over the daily muscle-load rollups.
+
+Acute load is the total of the last 7 days and chronic load the weekly average
+of the last 28, both ending on the day in question, so a ratio of 1.0 means
+this week matched the recent norm. Reads only touch the 28 days behind each
+point, however long the user's history is.
+"""
+from datetime import date, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+
+# Upper bounds of each zone; above the last one is "high"
+ZONES = [(0.8, "low"), (1.3, "optimal"), (1.5, "elevated")]
+
+
+def zone(acwr: Optional[float]) -> Optional[str]:
+    if acwr is None:
+        return None
+    for upper, name in ZONES:
+        if acwr < upper:
+            return name
+    return "high"
+
+
+def acwr(acute: float, chronic: float) -> Optional[float]:
+    """Ratio of this week to the 4-week weekly average; None without a chronic base"""
+    if chronic <= 0:
+        return None
+    return round(acute / chronic, 2)
+
+
+def rolling_loads(
+    days: Sequence[date], values: Sequence[float], start: date, end: date
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Acute totals and chronic weekly averages for every day from start to end.
+
+    days/values may cover any dates; only those in the 28 days before start
+    onwards contribute.
+    """
+    first = start - timedelta(days=CHRONIC_DAYS - 1)
+    daily = np.zeros((end - first).days + 1)
+    for day, value in zip(days, values):
+        if first <= day <= end:
+            daily[(day - first).days] += value
+
+    # Window sums as differences of a zero-padded running total
+    totals = np.concatenate([[0.0], np.cumsum(daily)])
+    ends = np.arange(CHRONIC_DAYS, len(totals))
+    acute = totals[ends] - totals[ends - ACUTE_DAYS]
+    chronic = (totals[ends] - totals[ends - CHRONIC_DAYS]) * ACUTE_DAYS / CHRONIC_DAYS
+    return acute, chronic
+
+
+def ratios(acute: np.ndarray, chronic: np.ndarray) -> List[Optional[float]]:
+    return [acwr(float(a), float(c)) for a, c in zip(acute, chronic)]
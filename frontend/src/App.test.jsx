@@ -46,20 +46,22 @@ describe('App Component', () => {
     })
 
     // Mock dashboard data
-    api.getWeeklySummary.mockResolvedValueOnce({
-      total_workouts: 0,
-      total_volume: 0,
-      total_sets: 0,
-      muscle_groups_worked: {},
-      new_prs: 0
+    api.getDashboard.mockResolvedValueOnce({
+      weekly_summary: {
+        total_workouts: 0,
+        total_volume: 0,
+        total_sets: 0,
+        muscle_groups_worked: {},
+        new_prs: 0
+      },
+      streak: {
+        current_streak: 0,
+        longest_streak: 0,
+        total_workouts: 0
+      },
+      recent_workouts: [],
+      templates: []
     })
-    api.getStreakInfo.mockResolvedValueOnce({
-      current_streak: 0,
-      longest_streak: 0,
-      total_workouts: 0
-    })
-    api.getWorkouts.mockResolvedValueOnce([])
-    api.getTemplates.mockResolvedValueOnce([])
 
     render(<App />)
 
@@ -2,13 +2,7 @@ import { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Play, Flame, Target, Trophy, Calendar } from 'lucide-react';
 import { useUser } from '../context/UserContext';
-import {
-  getWeeklySummary,
-  getStreakInfo,
-  getWorkouts,
-  getTemplates,
-  startWorkoutFromTemplate
-} from '../utils/api';
+import { getDashboard, startWorkoutFromTemplate } from '../utils/api';
 
 export default function Dashboard() {
   const { currentUser } = useUser();
@@ -27,16 +21,11 @@ export default function Dashboard() {
 
   const loadDashboardData = async () => {
     try {
-      const [summary, streak, workouts, temps] = await Promise.all([
-        getWeeklySummary(currentUser.id),
-        getStreakInfo(currentUser.id),
-        getWorkouts(currentUser.id, 5),
-        getTemplates(currentUser.id)
-      ]);
-      setWeekSummary(summary);
-      setStreakInfo(streak);
-      setRecentWorkouts(workouts);
-      setTemplates(temps);
+      const dashboard = await getDashboard(currentUser.id);
+      setWeekSummary(dashboard.weekly_summary);
+      setStreakInfo(dashboard.streak);
+      setRecentWorkouts(dashboard.recent_workouts);
+      setTemplates(dashboard.templates);
     } catch (error) {
       console.error('Failed to load dashboard data:', error);
     } finally {
@@ -1,14 +1,15 @@
 const API_BASE = '/api';
 
-async function request(endpoint, options = {}) {
+async function request(endpoint, { idempotencyKey, ...options } = {}) {
   const url = `${API_BASE}${endpoint}`;
 
   const config = {
+    ...options,
     headers: {
       'Content-Type': 'application/json',
+      ...(idempotencyKey && { 'Idempotency-Key': idempotencyKey }),
       ...options.headers,
     },
-    ...options,
   };
 
   // Don't set Content-Type for FormData
@@ -59,6 +60,22 @@ export const getExercises = (params = {}) => {
 };
 export const getCategories = () => request('/exercises/categories');
 export const getMuscleGroups = () => request('/exercises/muscle-groups');
+export const getLastPerformance = (exerciseId, userId, excludeWorkoutId = null) => {
+  const exclude = excludeWorkoutId ? `&exclude_workout_id=${excludeWorkoutId}` : '';
+  return request(`/exercises/${exerciseId}/last-performance?user_id=${userId}${exclude}`);
+};
+export const getLastPerformances = (exerciseIds, userId) => {
+  const ids = exerciseIds.map((id) => `exercise_ids=${id}`).join('&');
+  return request(`/exercises/last-performance?user_id=${userId}&${ids}`);
+};
+export const getExerciseHistory = (exerciseId, userId, cursor = null, limit = 20) => {
+  const params = new URLSearchParams({
+    user_id: userId,
+    limit,
+    ...(cursor && { cursor }),
+  });
+  return request(`/exercises/${exerciseId}/history?${params}`);
+};
 export const createExercise = (userId, data) => request(`/exercises/?user_id=${userId}`, {
   method: 'POST',
   body: JSON.stringify(data),
@@ -79,17 +96,33 @@ export const updateWorkout = (workoutId, data) => request(`/workouts/${workoutId
 export const deleteWorkout = (workoutId) => request(`/workouts/${workoutId}`, {
   method: 'DELETE',
 });
+export const repeatWorkout = (workoutId, includeSets = true) =>
+  request(`/workouts/${workoutId}/repeat?include_sets=${includeSets}`, {
+    method: 'POST',
+  });
+export const saveWorkoutAsTemplate = (workoutId, name, includeTargets = true) => {
+  const params = new URLSearchParams({
+    include_targets: includeTargets,
+    ...(name && { name }),
+  });
+  return request(`/workouts/${workoutId}/to-template?${params}`, {
+    method: 'POST',
+  });
+};
 export const addExerciseToWorkout = (workoutId, data) => request(`/workouts/${workoutId}/exercises`, {
   method: 'POST',
   body: JSON.stringify(data),
 });
-export const addSet = (workoutExerciseId, data) => request(`/workouts/exercises/${workoutExerciseId}/sets`, {
+// Pass the same idempotencyKey when retrying so the set is only written once
+export const addSet = (workoutExerciseId, data, idempotencyKey) => request(`/workouts/exercises/${workoutExerciseId}/sets`, {
   method: 'POST',
   body: JSON.stringify(data),
+  idempotencyKey,
 });
-export const updateSet = (setId, data) => request(`/workouts/sets/${setId}`, {
+export const updateSet = (setId, data, idempotencyKey) => request(`/workouts/sets/${setId}`, {
   method: 'PUT',
   body: JSON.stringify(data),
+  idempotencyKey,
 });
 export const deleteSet = (setId) => request(`/workouts/sets/${setId}`, {
   method: 'DELETE',
@@ -149,15 +182,59 @@ export const startWorkoutFromTemplate = (templateId, userId) =>
 // Analytics
 export const getWeeklySummary = (userId, weekOffset = 0) =>
   request(`/analytics/weekly-summary?user_id=${userId}&week_offset=${weekOffset}`);
-export const getExerciseProgress = (userId, exerciseId, metricType = 'weight', days = 90) =>
-  request(`/analytics/exercise-progress?user_id=${userId}&exercise_id=${exerciseId}&metric_type=${metricType}&days=${days}`);
-export const getBodyWeightProgress = (userId, days = 90) =>
-  request(`/analytics/body-weight-progress?user_id=${userId}&days=${days}`);
+export const getWeeklySummarySeries = (userId, weeks = 12, weekOffset = 0) =>
+  request(`/analytics/weekly-summary/series?user_id=${userId}&weeks=${weeks}&week_offset=${weekOffset}`);
+export const getExerciseProgress = (userId, exerciseId, metricType = 'weight', days = 90, maxPoints = null) =>
+  request(`/analytics/exercise-progress?user_id=${userId}&exercise_id=${exerciseId}&metric_type=${metricType}&days=${days}${maxPoints ? `&max_points=${maxPoints}` : ''}`);
+export const getExerciseProgressBatch = (userId, exerciseIds, metricTypes = ['weight'], days = 90, maxPoints = null) =>
+  request(`/analytics/exercise-progress/batch?user_id=${userId}`, {
+    method: 'POST',
+    body: JSON.stringify({ exercise_ids: exerciseIds, metric_types: metricTypes, days, max_points: maxPoints }),
+  });
+export const getBodyWeightProgress = (userId, days = 90, maxPoints = null) =>
+  request(`/analytics/body-weight-progress?user_id=${userId}&days=${days}${maxPoints ? `&max_points=${maxPoints}` : ''}`);
+export const getMeasurementProgress = (userId, key, days = 90, maxPoints = null) =>
+  request(`/analytics/measurement-progress?user_id=${userId}&key=${encodeURIComponent(key)}&days=${days}${maxPoints ? `&max_points=${maxPoints}` : ''}`);
+export const getMeasurementProgressBatch = (userId, keys, days = 90, maxPoints = null) => {
+  const params = new URLSearchParams({ user_id: userId, days });
+  keys.forEach((key) => params.append('keys', key));
+  if (maxPoints) params.set('max_points', maxPoints);
+  return request(`/analytics/measurement-progress/batch?${params}`);
+};
+export const getRelativeStrength = (userId, exerciseId, basis = 'weight', sex = 'male', days = 365) =>
+  request(`/analytics/relative-strength?user_id=${userId}&exercise_id=${exerciseId}&basis=${basis}&sex=${sex}&days=${days}`);
+export const getTrainingLoad = (userId, metric = 'volume') =>
+  request(`/analytics/training-load?user_id=${userId}&metric=${metric}`);
+export const getTrainingLoadSeries = (userId, muscleGroup, metric = 'volume', days = 90) =>
+  request(`/analytics/training-load/series?user_id=${userId}&muscle_group=${encodeURIComponent(muscleGroup)}&metric=${metric}&days=${days}`);
+export const getStrengthForecast = (userId, days = 180, horizonWeeks = 12) =>
+  request(`/analytics/strength-forecast?user_id=${userId}&days=${days}&horizon_weeks=${horizonWeeks}`);
 export const getStreakInfo = (userId) => request(`/analytics/streak?user_id=${userId}`);
 export const getMuscleGroupBalance = (userId, days = 30) =>
   request(`/analytics/muscle-group-balance?user_id=${userId}&days=${days}`);
 export const getWorkoutFrequency = (userId, days = 30) =>
   request(`/analytics/workout-frequency?user_id=${userId}&days=${days}`);
+export const getActivityHeatmap = (userId, start = null, end = null) => {
+  const params = new URLSearchParams({ user_id: userId });
+  if (start) params.set('start', start);
+  if (end) params.set('end', end);
+  return request(`/analytics/heatmap?${params}`);
+};
+
+// Dashboard
+export const getDashboard = (userId) => request(`/dashboard?user_id=${userId}`);
+
+// Leaderboards
+export const getExerciseLeaderboard = (exerciseId, board = 'e1rm', weekOffset = 0, userId = null) => {
+  const params = new URLSearchParams({ board, week_offset: weekOffset });
+  if (userId) params.set('user_id', userId);
+  return request(`/leaderboards/exercises/${exerciseId}?${params}`);
+};
+export const getStreakLeaderboard = () => request('/leaderboards/streak');
+
+// Export
+export const getSetsExportUrl = (userId = null, format = 'parquet') =>
+  `${API_BASE}/export/sets?format=${format}${userId ? `&user_id=${userId}` : ''}`;
 
 // Health check
 export const healthCheck = () => request('/health');
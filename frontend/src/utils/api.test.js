@@ -183,6 +183,26 @@ describe('API Utilities', () => {
     })
   })
 
+  describe('addSet', () => {
+    it('should send the idempotency key header', async () => {
+      const mockSet = { id: 1, set_number: 1 }
+      global.fetch.mockResolvedValueOnce({
+        ok: true,
+        text: () => Promise.resolve(JSON.stringify(mockSet))
+      })
+
+      const result = await api.addSet(3, { set_number: 1 }, 'key-1')
+      expect(result).toEqual(mockSet)
+      expect(global.fetch).toHaveBeenCalledWith(
+        '/api/workouts/exercises/3/sets',
+        expect.objectContaining({
+          method: 'POST',
+          headers: expect.objectContaining({ 'Idempotency-Key': 'key-1' })
+        })
+      )
+    })
+  })
+
   describe('getPersonalRecords', () => {
     it('should fetch PRs for user', async () => {
       const mockPRs = [{ id: 1, value: 100 }]
@@ -237,6 +257,21 @@ describe('API Utilities', () => {
     })
   })
 
+  describe('getDashboard', () => {
+    it('should fetch all dashboard sections in one request', async () => {
+      const mockDashboard = { weekly_summary: {}, streak: {}, recent_workouts: [], templates: [] }
+      global.fetch.mockResolvedValueOnce({
+        ok: true,
+        text: () => Promise.resolve(JSON.stringify(mockDashboard))
+      })
+
+      const result = await api.getDashboard(1)
+      expect(result).toEqual(mockDashboard)
+      expect(global.fetch).toHaveBeenCalledTimes(1)
+      expect(global.fetch).toHaveBeenCalledWith('/api/dashboard?user_id=1', expect.any(Object))
+    })
+  })
+
   describe('healthCheck', () => {
     it('should check API health', async () => {
       const mockHealth = { status: 'healthy', version: '1.0.0' }